@@ -16,13 +16,20 @@
 """
 
 import binascii
+import heapq
+import itertools
 import random
+import time
+from bisect import insort
+from collections.abc import Mapping
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import maya
 
 from bytestring_splitter import BytestringSplitter
 from constant_sorrow.constants import NO_KNOWN_NODES
-from collections import namedtuple, defaultdict
+from collections import deque, namedtuple, defaultdict
 from collections import OrderedDict
 
 from .nicknames import Nickname
@@ -30,6 +37,283 @@ from nucypher.crypto.api import keccak_digest
 from nucypher.utilities.logging import Logger
 
 
+def index_addresses_by_character(addresses: Iterable[str], character: str) -> List[Tuple[int, str]]:
+    """
+    Indexes the checksum `addresses` that contain `character` (after the '0x' prefix)
+    as (position of its first occurrence, address) pairs, sorted by position.
+    """
+    index = []
+    for address in addresses:
+        position = address.find(character, 2)
+        if position != -1:
+            index.append((position - 2, address))
+    index.sort()
+    return index
+
+
+class NodeHealth:
+    """
+    The health of a known node, as one of a few buckets:
+
+    * VERIFIED - The node was verified, and answered the last time we tried it.
+    * UNVERIFIED - We know of the node, but haven't verified it yet.
+    * UNREACHABLE - The node didn't answer the last time we tried it.
+    * SUSPICIOUS - The node misbehaved, for instance by sending incorrect CFrags.
+    * INVALID - The node is invalid, and won't be tried again.
+
+    Unreachable and suspicious nodes are backed off from: they aren't tried again until `retry_at`,
+    a delay that doubles with each consecutive failure, up to a maximum, with some jitter so that
+    many learners don't all come back to a node at once.
+    """
+
+    VERIFIED = 'verified'
+    UNVERIFIED = 'unverified'
+    UNREACHABLE = 'unreachable'
+    SUSPICIOUS = 'suspicious'
+    INVALID = 'invalid'
+
+    BACKOFF = {UNREACHABLE: (30, 60 * 60),       # (First delay, maximum delay) in seconds
+               SUSPICIOUS: (5 * 60, 6 * 60 * 60)}
+
+    __slots__ = ('bucket', 'failures', 'retry_at')
+
+    def __init__(self, bucket: str = UNVERIFIED):
+        self.bucket = bucket
+        self.failures = 0
+        self.retry_at = None
+
+    def back_off(self, bucket: str, now: float) -> None:
+        self.bucket = bucket
+        self.failures += 1
+        first_delay, maximum_delay = self.BACKOFF[bucket]
+        delay = min(first_delay * 2 ** (self.failures - 1), maximum_delay)
+        self.retry_at = now + random.uniform(delay / 2, delay)
+
+    def is_available(self, now: float) -> bool:
+        if self.bucket == self.INVALID:
+            return False
+        return self.retry_at is None or self.retry_at <= now
+
+
+class TeacherScores:
+    """
+    How well each teacher has served us while learning, as exponentially weighted averages of
+    the round-trip time of its responses, how often it failed to respond, and how many new nodes
+    it taught us about per round.
+
+    Teachers are sampled at random with a weight favoring fast, reliable and productive ones.
+    Teachers we haven't scored yet get a generous weight, so that they are tried early on, and
+    no weight falls below MINIMUM_WEIGHT, so that every teacher still gets asked from time to time.
+    """
+
+    SMOOTHING = 0.3  # Weight of the latest observation
+    UNSCORED_WEIGHT = 2.0
+    MINIMUM_WEIGHT = 0.05
+
+    class _Score:
+        __slots__ = ('rtt', 'error_rate', 'new_nodes')
+
+        def __init__(self):
+            self.rtt = 0.0
+            self.error_rate = 0.0
+            self.new_nodes = 0.0
+
+    def __init__(self):
+        self._scores = dict()  # checksum address -> _Score
+        self._lock = Lock()
+
+    def __contains__(self, checksum_address: str) -> bool:
+        return checksum_address in self._scores
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _smoothed(self, average: float, observation: float) -> float:
+        return average + self.SMOOTHING * (observation - average)
+
+    def _score(self, checksum_address: str) -> '_Score':
+        try:
+            return self._scores[checksum_address]
+        except KeyError:
+            return self._scores.setdefault(checksum_address, self._Score())
+
+    def record_response(self, checksum_address: str, rtt: float) -> None:
+        with self._lock:
+            score = self._score(checksum_address)
+            score.rtt = self._smoothed(score.rtt, rtt) if score.rtt else rtt
+            score.error_rate = self._smoothed(score.error_rate, 0)
+
+    def record_error(self, checksum_address: str) -> None:
+        with self._lock:
+            score = self._score(checksum_address)
+            score.error_rate = self._smoothed(score.error_rate, 1)
+
+    def record_new_nodes(self, checksum_address: str, quantity: int) -> None:
+        with self._lock:
+            score = self._score(checksum_address)
+            score.new_nodes = self._smoothed(score.new_nodes, quantity)
+
+    def forget(self, checksum_address: str) -> None:
+        with self._lock:
+            self._scores.pop(checksum_address, None)
+
+    def weight(self, checksum_address: str) -> float:
+        score = self._scores.get(checksum_address)
+        if score is None:
+            return self.UNSCORED_WEIGHT
+        weight = (1 - score.error_rate) * (1 + score.new_nodes) / (1 + score.rtt)
+        return max(weight, self.MINIMUM_WEIGHT)
+
+    def sample(self, nodes: Iterable, quantity: int) -> list:
+        """
+        A weighted random sample of `quantity` of `nodes`, without replacement, in the order they were drawn.
+        """
+        # Each node is keyed by u ** (1 / weight) for a uniform u; the largest keys make a weighted sample.
+        def key(node) -> float:
+            return random.random() ** (1 / self.weight(node.checksum_address))
+        return heapq.nlargest(quantity, nodes, key=key)
+
+
+class FleetStateHistory(Mapping):
+    """
+    The fleet states recorded by a FleetSensor, by checksum, in the order they were recorded.
+
+    Rather than the full list of nodes of every state, only every `keyframe_interval`-th state
+    keeps all of its nodes; the others keep the nodes that changed since the state before them.
+    The nodes of any retained state are rebuilt from the nearest keyframe before it.
+
+    At most `max_states` states are retained, none of them older than `max_age` seconds
+    (if given); the oldest are forgotten first as new states are recorded.
+    """
+
+    DEFAULT_MAX_STATES = 256
+    DEFAULT_KEYFRAME_INTERVAL = 32
+
+    _Record = namedtuple("_Record", ("nickname", "icon", "updated", "checksum", "keyframe", "changed", "removed"))
+
+    def __init__(self,
+                 max_states: int = DEFAULT_MAX_STATES,
+                 max_age: Optional[int] = None,
+                 keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if max_states < 1:
+            raise ValueError(f"max_states must be positive, got {max_states}")
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval must be positive, got {keyframe_interval}")
+        self.max_states = max_states
+        self.max_age = max_age
+        self.keyframe_interval = keyframe_interval
+
+        self._records = deque()
+        self._positions = dict()  # checksum -> sequence number of its record
+        self._first = 0           # Sequence number of the oldest retained record
+        self._since_keyframe = 0
+        self._latest_nodes = dict()
+
+    def __getitem__(self, checksum: str) -> 'FleetSensor.FleetState':
+        index = self._positions[checksum] - self._first
+        keyframe_index = index
+        while self._records[keyframe_index].keyframe is None:
+            keyframe_index -= 1
+        nodes = {}
+        for record in itertools.islice(self._records, keyframe_index, index + 1):
+            self._apply(nodes, record)
+        return self._state(record, nodes)
+
+    def __contains__(self, checksum) -> bool:
+        return checksum in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return (record.checksum for record in self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def values(self) -> List['FleetSensor.FleetState']:
+        # Rebuilt in a single pass, rather than from a keyframe for each state.
+        states, nodes = [], {}
+        for record in self._records:
+            self._apply(nodes, record)
+            states.append(self._state(record, nodes))
+        return states
+
+    def latest(self, n: int) -> List['FleetSensor.FleetState']:
+        """The `n` newest states, newest first; only replayed from the keyframe they're based on."""
+        start = max(len(self._records) - n, 0)
+        keyframe_index = start
+        while keyframe_index < len(self._records) and self._records[keyframe_index].keyframe is None:
+            keyframe_index -= 1
+        states, nodes = [], {}
+        for index, record in enumerate(itertools.islice(self._records, keyframe_index, None), keyframe_index):
+            self._apply(nodes, record)
+            if index >= start:
+                states.append(self._state(record, nodes))
+        return states[::-1]
+
+    def items(self) -> List[Tuple[str, 'FleetSensor.FleetState']]:
+        return [(state.checksum, state) for state in self.values()]
+
+    @staticmethod
+    def _apply(nodes: Dict[str, 'Teacher'], record: _Record) -> None:
+        if record.keyframe is not None:
+            nodes.clear()
+            nodes.update((node.checksum_address, node) for node in record.keyframe)
+        else:
+            for checksum_address in record.removed:
+                del nodes[checksum_address]
+            nodes.update((node.checksum_address, node) for node in record.changed)
+
+    @staticmethod
+    def _state(record: _Record, nodes: Dict[str, 'Teacher']) -> 'FleetSensor.FleetState':
+        return FleetSensor.FleetState(nickname=record.nickname,
+                                      icon=record.icon,
+                                      nodes=[nodes[checksum_address] for checksum_address in sorted(nodes)],
+                                      updated=record.updated,
+                                      checksum=record.checksum)
+
+    def record(self, state: 'FleetSensor.FleetState') -> None:
+        nodes = {node.checksum_address: node for node in state.nodes}
+        changed = tuple(node for checksum_address, node in nodes.items()
+                        if self._latest_nodes.get(checksum_address) is not node)
+        removed = tuple(checksum_address for checksum_address in self._latest_nodes if checksum_address not in nodes)
+
+        keyframe = None
+        if not self._records or self._since_keyframe + 1 >= self.keyframe_interval \
+                or len(changed) + len(removed) >= len(nodes):
+            keyframe, changed, removed = tuple(state.nodes), None, None
+            self._since_keyframe = 0
+        else:
+            self._since_keyframe += 1
+
+        self._positions[state.checksum] = self._first + len(self._records)
+        self._records.append(self._Record(nickname=state.nickname,
+                                          icon=state.icon,
+                                          updated=state.updated,
+                                          checksum=state.checksum,
+                                          keyframe=keyframe,
+                                          changed=changed,
+                                          removed=removed))
+        self._latest_nodes = nodes
+        self._prune(now=state.updated)
+
+    def _prune(self, now: maya.MayaDT) -> None:
+        while len(self._records) > self.max_states or \
+                (self.max_age is not None and len(self._records) > 1
+                 and (now - self._records[0].updated).total_seconds() > self.max_age):
+            self._forget_oldest()
+
+    def _forget_oldest(self) -> None:
+        oldest = self._records.popleft()
+        del self._positions[oldest.checksum]
+        self._first += 1
+        if self._records and self._records[0].keyframe is None:
+            # The next state becomes a keyframe in the place of the one it was based on.
+            nodes = {}
+            self._apply(nodes, oldest)
+            self._apply(nodes, self._records[0])
+            keyframe = tuple(nodes[checksum_address] for checksum_address in sorted(nodes))
+            self._records[0] = self._records[0]._replace(keyframe=keyframe, changed=None, removed=None)
+
+
 class FleetSensor:
     """
     A representation of a fleet of NuCypher nodes.
@@ -42,16 +326,30 @@ class FleetSensor:
     log = Logger("Learning")
     FleetState = namedtuple("FleetState", ("nickname", "icon", "nodes", "updated", "checksum"))
 
-    def __init__(self, domain: str):
+    def __init__(self,
+                 domain: str,
+                 max_states: int = FleetStateHistory.DEFAULT_MAX_STATES,
+                 max_state_age: Optional[int] = None):
         self.domain = domain
         self.additional_nodes_to_track = []
         self.updated = maya.now()
         self._nodes = OrderedDict()
         self._marked = defaultdict(list)  # Beginning of bucketing.
-        self.states = OrderedDict()
+        self.states = FleetStateHistory(max_states=max_states, max_age=max_state_age)
+        self._health = dict()  # checksum address -> NodeHealth, for the nodes that aren't just unverified
+        self.teacher_scores = TeacherScores()  # Only kept for the nodes we know of
+
+        # Sorted address indices by character, maintained for the characters that have been asked for.
+        self._address_indices = dict()
+        self._indexed_nodes = None
 
     def __setitem__(self, checksum_address, node_or_sprout):
         if node_or_sprout.domain == self.domain:
+            known_node = self._nodes.get(checksum_address)
+            if known_node is None:
+                self._index_address(checksum_address)
+            elif known_node is not node_or_sprout:
+                self.teacher_scores.forget(checksum_address)  # A newer version of the node starts afresh.
             self._nodes[checksum_address] = node_or_sprout
 
             if self._tracking:
@@ -107,6 +405,37 @@ class FleetSensor:
     def addresses(self):
         return self._nodes.keys()
 
+    def _address_indices_are_current(self) -> bool:
+        # The nodes may also be replaced or added to directly (as tests do), which a change in size gives away.
+        return self._indexed_nodes == (id(self._nodes), len(self._nodes))
+
+    def _index_address(self, checksum_address: str) -> None:
+        if not self._address_indices_are_current():
+            self._indexed_nodes = None
+            return
+        for character, index in self._address_indices.items():
+            position = checksum_address.find(character, 2)
+            if position != -1:
+                insort(index, (position - 2, checksum_address))
+        self._indexed_nodes = (id(self._nodes), len(self._nodes) + 1)
+
+    def addresses_by_position_of(self, character: str) -> List[Tuple[int, str]]:
+        """
+        The addresses of known nodes that contain `character` (after the '0x' prefix), as
+        (position of its first occurrence, address) pairs sorted by position,
+        so that the nodes with `character` within the first few places are found with a bisect.
+
+        The index is kept up to date as nodes are added; do not modify it.
+        """
+        if not self._address_indices_are_current():
+            self._address_indices.clear()
+            self._indexed_nodes = (id(self._nodes), len(self._nodes))
+        try:
+            index = self._address_indices[character]
+        except KeyError:
+            index = self._address_indices[character] = index_addresses_by_character(self._nodes, character)
+        return index
+
     def snapshot(self):
         fleet_state_checksum_bytes = binascii.unhexlify(self.checksum)
         fleet_state_updated_bytes = self.updated.epoch.to_bytes(4, byteorder="big")
@@ -126,14 +455,12 @@ class FleetSensor:
         if checksum not in self.states:
             self.checksum = keccak_digest(b"".join(bytes(n) for n in self.sorted())).hex()
             self.updated = maya.now()
-            # For now we store the sorted node list.  Someday we probably spin this out into
-            # its own class, FleetState, and use it as the basis for partial updates.
             new_state = self.FleetState(nickname=self.nickname,
                                         nodes=sorted_nodes,
                                         icon=self.icon,
                                         updated=self.updated,
                                         checksum=self.checksum)
-            self.states[checksum] = new_state
+            self.states.record(new_state)
             return checksum, new_state
 
     def start_tracking_state(self, additional_nodes_to_track=None):
@@ -170,6 +497,71 @@ class FleetSensor:
 
     def mark_as(self, label: Exception, node: "Teacher"):
         self._marked[label].append(node)
+        self._health_of(node.checksum_address).bucket = NodeHealth.INVALID
+        self.teacher_scores.forget(node.checksum_address)
 
         if self._nodes.get(node):
             del self._nodes[node]
+            self._indexed_nodes = None
+
+    #
+    # Node Health
+    #
+
+    def _health_of(self, checksum_address: str) -> NodeHealth:
+        try:
+            return self._health[checksum_address]
+        except KeyError:
+            return self._health.setdefault(checksum_address, NodeHealth())
+
+    def health(self, checksum_address: str) -> str:
+        """The bucket of the node with this checksum address; see NodeHealth."""
+        try:
+            return self._health[checksum_address].bucket
+        except KeyError:
+            return NodeHealth.UNVERIFIED
+
+    def record_verified(self, checksum_address: str) -> None:
+        """The node was verified; suspicious and invalid nodes stay where they are."""
+        health = self._health_of(checksum_address)
+        if health.bucket in (NodeHealth.UNVERIFIED, NodeHealth.UNREACHABLE):
+            self._health[checksum_address] = NodeHealth(bucket=NodeHealth.VERIFIED)
+
+    def record_reachable(self, checksum_address: str) -> None:
+        """The node answered; it is no longer backed off from, unless it is suspicious or invalid."""
+        health = self._health.get(checksum_address)
+        if health is not None and health.bucket == NodeHealth.UNREACHABLE:
+            node = self._nodes.get(checksum_address)
+            verified = getattr(node, 'verified_node', False)
+            self._health[checksum_address] = NodeHealth(bucket=NodeHealth.VERIFIED if verified else NodeHealth.UNVERIFIED)
+
+    def record_unreachable(self, checksum_address: str, now: float = None) -> None:
+        health = self._health_of(checksum_address)
+        if health.bucket not in (NodeHealth.SUSPICIOUS, NodeHealth.INVALID):
+            health.back_off(NodeHealth.UNREACHABLE, now=time.time() if now is None else now)
+
+    def record_suspicious(self, checksum_address: str, now: float = None) -> None:
+        health = self._health_of(checksum_address)
+        if health.bucket != NodeHealth.INVALID:
+            if health.bucket != NodeHealth.SUSPICIOUS:
+                health.failures = 0  # Suspicious nodes are backed off from on their own schedule.
+            health.back_off(NodeHealth.SUSPICIOUS, now=time.time() if now is None else now)
+
+    def is_available(self, checksum_address: str, now: float = None) -> bool:
+        """Whether the node is worth trying now: it is neither invalid nor being backed off from."""
+        health = self._health.get(checksum_address)
+        return health is None or health.is_available(now=time.time() if now is None else now)
+
+    def available(self, now: float = None) -> Iterator:
+        """The known nodes that are worth trying now."""
+        now = time.time() if now is None else now
+        for checksum_address, node in tuple(self._nodes.items()):
+            health = self._health.get(checksum_address)
+            if health is None or health.is_available(now=now):
+                yield node
+
+    def in_buckets(self, *buckets: str) -> Iterator:
+        """The known nodes in any of these NodeHealth buckets."""
+        for checksum_address, node in tuple(self._nodes.items()):
+            if self.health(checksum_address) in buckets:
+                yield node
@@ -130,6 +130,45 @@ class AliceInterface(CharacterPublicInterface):
 
         return response_data
 
+    @attach_schema(alice.BulkGrantPolicy)
+    def bulk_grant(self,
+                   grants: list,
+                   m: int,
+                   n: int,
+                   expiration: maya.MayaDT,
+                   value: int = None,
+                   rate: int = None,
+                   ) -> dict:
+
+        from nucypher.characters.lawful import Bob
+        bobs_and_labels = list()
+        for grantee in grants:
+            bob = Bob.from_public_keys(encrypting_key=grantee['bob_encrypting_key'],
+                                       verifying_key=grantee['bob_verifying_key'])
+            bobs_and_labels.append((bob, grantee['label']))
+
+        results = self.character.bulk_grant(grants=bobs_and_labels,
+                                            m=m,
+                                            n=n,
+                                            value=value,
+                                            rate=rate,
+                                            expiration=expiration)
+
+        granted = list()
+        for bob, label, result in results:
+            grantee = {'bob_verifying_key': bob.public_keys(SigningPower), 'label': label}
+            if isinstance(result, Exception):
+                grantee['error'] = str(result)
+            else:
+                grantee['treasure_map'] = result.treasure_map
+                grantee['policy_encrypting_key'] = result.public_key
+            granted.append(grantee)
+
+        response_data = {'grants': granted,
+                         'alice_verifying_key': self.character.public_keys(SigningPower)}
+
+        return response_data
+
     @attach_schema(alice.Revoke)
     def revoke(self, label: bytes, bob_verifying_key: bytes) -> dict:
 
@@ -138,11 +177,10 @@ class AliceInterface(CharacterPublicInterface):
         policy = self.character.active_policies[policy_id]
 
         failed_revocations = self.character.revoke(policy)
-        if len(failed_revocations) > 0:
-            for node_id, attempt in failed_revocations.items():
-                revocation, fail_reason = attempt
-                if fail_reason == RestMiddleware.NotFound:
-                    del (failed_revocations[node_id])
+        # Nodes that no longer have the arrangement have nothing left to revoke.
+        failed_revocations = {node_id: (revocation, fail_reason)
+                              for node_id, (revocation, fail_reason) in failed_revocations.items()
+                              if not isinstance(fail_reason, RestMiddleware.NotFound)}
         if len(failed_revocations) <= (policy.n - policy.treasure_map.m + 1):
             del (self.character.active_policies[policy_id])
 
@@ -25,22 +25,8 @@ from nucypher.characters.control.specifications.exceptions import InvalidArgumen
 from nucypher.cli import options, types
 
 
-class PolicyBaseSchema(BaseSchema):
+class PolicyParametersSchema(BaseSchema):
 
-    bob_encrypting_key = fields.Key(
-        required=True, load_only=True,
-        click=click.option(
-            '--bob-encrypting-key',
-            '-bek',
-            help="Bob's encrypting key as a hexadecimal string",
-            type=click.STRING, required=False))
-    bob_verifying_key = fields.Key(
-        required=True, load_only=True,
-        click=click.option(
-            '--bob-verifying-key',
-            '-bvk',
-            help="Bob's verifying key as a hexadecimal string",
-            type=click.STRING, required=False))
     m = fields.M(
         required=True, load_only=True,
         click=options.option_m)
@@ -66,9 +52,6 @@ class PolicyBaseSchema(BaseSchema):
         click=options.option_rate
     )
 
-    # output
-    policy_encrypting_key = fields.Key(dump_only=True)
-
     @validates_schema
     def check_valid_n_and_m(self, data, **kwargs):
         # ensure that n is greater than or equal to m
@@ -86,6 +69,27 @@ class PolicyBaseSchema(BaseSchema):
             # raise InvalidArgumentCombo("Either rate or value must be greater than zero.")
 
 
+class PolicyBaseSchema(PolicyParametersSchema):
+
+    bob_encrypting_key = fields.Key(
+        required=True, load_only=True,
+        click=click.option(
+            '--bob-encrypting-key',
+            '-bek',
+            help="Bob's encrypting key as a hexadecimal string",
+            type=click.STRING, required=False))
+    bob_verifying_key = fields.Key(
+        required=True, load_only=True,
+        click=click.option(
+            '--bob-verifying-key',
+            '-bvk',
+            help="Bob's verifying key as a hexadecimal string",
+            type=click.STRING, required=False))
+
+    # output
+    policy_encrypting_key = fields.Key(dump_only=True)
+
+
 class CreatePolicy(PolicyBaseSchema):
 
     label = fields.Label(
@@ -104,6 +108,28 @@ class GrantPolicy(PolicyBaseSchema):
     alice_verifying_key = fields.Key(dump_only=True)
 
 
+class BulkGrantee(BaseSchema):
+
+    bob_encrypting_key = fields.Key(required=True, load_only=True)
+    bob_verifying_key = fields.Key(required=True)
+    label = fields.Label(required=True)
+
+    # output fields, for a successful grant...
+    treasure_map = fields.TreasureMap(dump_only=True)
+    policy_encrypting_key = fields.Key(dump_only=True)
+
+    # ...or a failed one
+    error = fields.String(dump_only=True)
+
+
+class BulkGrantPolicy(PolicyParametersSchema):
+
+    grants = fields.List(fields.Nested(BulkGrantee), required=True)
+
+    # output fields
+    alice_verifying_key = fields.Key(dump_only=True)
+
+
 class DerivePolicyEncryptionKey(BaseSchema):
 
     label = fields.Label(
@@ -31,6 +31,10 @@ class List(BaseField, fields.List):
     pass
 
 
+class Nested(BaseField, fields.Nested):
+    pass
+
+
 class Integer(BaseField, fields.Integer):
     click_type = click.INT
 
@@ -18,12 +18,14 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import json
 from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
 import contextlib
 import maya
 import random
 import time
 from base64 import b64decode, b64encode
+from bisect import bisect_left
 from bytestring_splitter import (
     BytestringKwargifier,
     BytestringSplitter,
@@ -51,18 +53,20 @@ from functools import partial
 from json.decoder import JSONDecodeError
 from queue import Queue
 from random import shuffle
+from threading import Lock
 from twisted.internet import reactor, stdio, threads
 from twisted.internet.task import LoopingCall
 from twisted.logger import Logger
-from typing import Dict, Iterable, List, Tuple, Union, Optional, Sequence, Set
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union, Optional, Sequence, Set
 from umbral import pre
 from umbral.keys import UmbralPublicKey
 from umbral.kfrags import KFrag
+from umbral.pre import UmbralCorrectnessError
 from umbral.signing import Signature
 
 import nucypher
 from nucypher.acumen.nicknames import Nickname
-from nucypher.acumen.perception import FleetSensor
+from nucypher.acumen.perception import FleetSensor, index_addresses_by_character
 from nucypher.blockchain.eth.actors import BlockchainPolicyAuthor, Worker
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent
 from nucypher.blockchain.eth.constants import ETH_ADDRESS_BYTE_LENGTH
@@ -76,10 +80,17 @@ from nucypher.characters.control.controllers import WebController
 from nucypher.characters.control.emitters import StdoutEmitter
 from nucypher.characters.control.interfaces import AliceInterface, BobInterface, EnricoInterface
 from nucypher.cli.processes import UrsulaCommandProtocol
-from nucypher.config.constants import END_OF_POLICIES_PROBATIONARY_PERIOD
+from nucypher.config.constants import END_OF_POLICIES_PROBATIONARY_PERIOD, ORIENTED_TREASURE_MAP_CACHE_SIZE
 from nucypher.config.storages import ForgetfulNodeStorage, NodeStorage
-from nucypher.crypto.api import encrypt_and_sign, keccak_digest
-from nucypher.crypto.constants import HRAC_LENGTH, PUBLIC_KEY_LENGTH
+from nucypher.crypto.api import (
+    IncorrectCFrags,
+    UndecryptableMessageKit,
+    decrypt_and_verify_batch,
+    encrypt_and_sign,
+    encrypt_and_sign_batch,
+    keccak_digest
+)
+from nucypher.crypto.constants import DEFAULT_STREAM_CHUNK_SIZE, HRAC_LENGTH, PUBLIC_KEY_LENGTH
 from nucypher.crypto.keypairs import HostingKeypair
 from nucypher.crypto.kits import UmbralMessageKit
 from nucypher.crypto.powers import (
@@ -89,15 +100,24 @@ from nucypher.crypto.powers import (
     SigningPower,
     TransactingPower
 )
-from nucypher.crypto.signing import InvalidSignature
-from nucypher.datastore.datastore import DatastoreTransactionError, RecordNotFound
-from nucypher.datastore.models import PolicyArrangement, TreasureMap as DatastoreTreasureMap
+from nucypher.crypto.streams import (
+    decrypt_chunks,
+    encrypt_chunks,
+    generate_stream_key,
+    read_stream_header,
+    write_message_kit,
+    write_stream_header
+)
+from nucypher.datastore.cfrags import CFragCache
+from nucypher.datastore.datastore import Datastore, DatastoreTransactionError, RecordNotFound
+from nucypher.datastore.models import PolicyArrangement, TreasureMap as DatastoreTreasureMap, Workorder
 from nucypher.network.exceptions import NodeSeemsToBeDown
-from nucypher.network.middleware import RestMiddleware
+from nucypher.network.middleware import RestMiddleware, treasure_map_etag
 from nucypher.network.nodes import NodeSprout, Teacher
 from nucypher.network.protocols import InterfaceInfo, parse_node_uri
 from nucypher.network.server import ProxyRESTServer, TLSHostingPower, make_rest_app
 from nucypher.network.trackers import AvailabilityTracker
+from nucypher.utilities.cache import LRUCache
 from nucypher.utilities.logging import Logger
 from nucypher.utilities.networking import validate_worker_ip
 
@@ -131,6 +151,9 @@ class Alice(Character, BlockchainPolicyAuthor):
                  store_policy_credentials: bool = None,
                  store_character_cards: bool = None,
 
+                 # Label keys
+                 label_key_cache_size: int = None,
+
                  # Middleware
                  timeout: int = 10,  # seconds  # TODO: configure  NRN
                  network_middleware: RestMiddleware = None,
@@ -144,6 +167,9 @@ class Alice(Character, BlockchainPolicyAuthor):
 
         self.timeout = timeout
 
+        # Policies are published on chain one at a time, since each transaction takes the account's next nonce.
+        self._policy_publication_lock = Lock()
+
         if is_me:
             self.m = m
             self.n = n
@@ -162,6 +188,10 @@ class Alice(Character, BlockchainPolicyAuthor):
                            network_middleware=network_middleware,
                            *args, **kwargs)
 
+        if is_me and label_key_cache_size is not None:
+            delegating_power = self._crypto_power.power_ups(DelegatingPower)
+            delegating_power.set_label_key_cache_size(label_key_cache_size)
+
         if is_me and not federated_only:  # TODO: #289
             blockchain = BlockchainInterfaceFactory.get_interface(provider_uri=self.provider_uri)
             transacting_power = TransactingPower(account=self.checksum_address,
@@ -232,8 +262,16 @@ class Alice(Character, BlockchainPolicyAuthor):
         Create a Policy so that Bob has access to all resources under label.
         Generates KFrags and attaches them.
         """
-
         policy_params = self.generate_policy_parameters(**policy_params)
+        return self._create_policy(bob=bob, label=label, policy_params=policy_params)
+
+    def _create_policy(self, bob: "Bob", label: bytes, policy_params: dict, stakers_map: Dict = None):
+        """
+        Creates a Policy from parameters already processed by `generate_policy_parameters`.
+        A blockchain policy samples Ursulas from `stakers_map`, if given, instead of fetching active stakers.
+        """
+
+        policy_params = dict(policy_params)
         N = policy_params.pop('n')
 
         # Generate KFrags
@@ -258,7 +296,7 @@ class Alice(Character, BlockchainPolicyAuthor):
             # Sample from blockchain PolicyManager
             from nucypher.policy.policies import BlockchainPolicy
             payload.update(**policy_params)
-            policy = BlockchainPolicy(alice=self, **payload)
+            policy = BlockchainPolicy(alice=self, stakers_map=stakers_map, **payload)
 
         return policy
 
@@ -313,6 +351,79 @@ class Alice(Character, BlockchainPolicyAuthor):
                 self.remember_node(node=handpicked_ursula)
 
         policy = self.create_policy(bob=bob, label=label, **policy_params)
+        return self._enact_policy(policy=policy,
+                                  handpicked_ursulas=handpicked_ursulas,
+                                  timeout=timeout,
+                                  publish_treasure_map=publish_treasure_map,
+                                  block_until_success_is_reasonably_likely=block_until_success_is_reasonably_likely)
+
+    def bulk_grant(self,
+                   grants: Iterable[Tuple["Bob", bytes]],
+                   handpicked_ursulas: set = None,
+                   timeout: int = None,
+                   max_concurrent_grants: int = 8,
+                   publish_treasure_map: bool = True,
+                   block_until_success_is_reasonably_likely: bool = True,
+                   **policy_params
+                   ) -> Iterator[Tuple["Bob", bytes, Union['EnactedPolicy', Exception]]]:
+        """
+        Grants a policy for each (bob, label) pair in `grants`, all of them with the same `policy_params`.
+
+        What all the grants have in common (the policy parameters, the sample of active stakers,
+        and learning about enough Ursulas) is worked out once for the whole batch,
+        and up to `max_concurrent_grants` policies are enacted and published at a time.
+
+        Yields (bob, label, enacted policy) as each grant completes,
+        or (bob, label, exception) for the grants that failed.
+        """
+
+        timeout = timeout or self.timeout
+
+        if handpicked_ursulas:
+            for handpicked_ursula in handpicked_ursulas:
+                self.remember_node(node=handpicked_ursula)
+
+        policy_params = self.generate_policy_parameters(**policy_params)
+
+        # Learn about enough Ursulas once, rather than on each grant's thread.
+        if self.federated_only and len(self.known_nodes) < policy_params['n']:
+            self.block_until_number_of_known_nodes_is(number_of_nodes_to_know=policy_params['n'],
+                                                      learn_on_this_thread=True,
+                                                      timeout=timeout)
+
+        stakers_map = None
+        if not self.federated_only:
+            _total_tokens, stakers_map = self.staking_agent.get_all_active_stakers(
+                periods=policy_params['duration_periods'])
+
+        def grant(bob_and_label):
+            bob, label = bob_and_label
+            policy = self._create_policy(bob=bob, label=label, policy_params=policy_params, stakers_map=stakers_map)
+            return self._enact_policy(policy=policy,
+                                      handpicked_ursulas=handpicked_ursulas,
+                                      timeout=timeout,
+                                      publish_treasure_map=publish_treasure_map,
+                                      block_until_success_is_reasonably_likely=block_until_success_is_reasonably_likely)
+
+        with ThreadPoolExecutor(max_workers=max_concurrent_grants, thread_name_prefix='bulk-grant') as executor:
+            pending_grants = {executor.submit(grant, bob_and_label): bob_and_label for bob_and_label in grants}
+            for future in as_completed(pending_grants):
+                bob, label = pending_grants[future]
+                try:
+                    enacted_policy = future.result()
+                except Exception as e:
+                    self.log.warn(f"Failed to grant policy {label} to {bob}: {e}")
+                    yield bob, label, e
+                else:
+                    yield bob, label, enacted_policy
+
+    def _enact_policy(self,
+                      policy: 'Policy',
+                      handpicked_ursulas: set,
+                      timeout: int,
+                      publish_treasure_map: bool,
+                      block_until_success_is_reasonably_likely: bool,
+                      ) -> 'EnactedPolicy':
 
         # TODO: Remove when the time is right.
         if policy.expiration > END_OF_POLICIES_PROBATIONARY_PERIOD:
@@ -356,39 +467,67 @@ class Alice(Character, BlockchainPolicyAuthor):
         policy_pubkey = alice_delegating_power.get_pubkey_from_label(label)
         return policy_pubkey
 
-    def revoke(self, policy) -> Dict:
+    def revoke(self, policy, timeout: float = None) -> Dict:
         """
         Parses the treasure map and revokes arrangements in it.
         If any arrangements can't be revoked, then the node_id is added to a
-        dict as a key, and the revocation and Ursula's response is added as
+        dict as a key, and the revocation and the error it failed with is added as
         a value.
         """
-        try:
-            # Wait for a revocation threshold of nodes to be known ((n - m) + 1)
-            revocation_threshold = ((policy.n - policy.treasure_map.m) + 1)
-            self.block_until_specific_nodes_are_known(
-                policy.revocation_kit.revokable_addresses,
-                allow_missing=(policy.n - revocation_threshold))
+        report = self.revoke_policies(policies=[policy], timeout=timeout)[policy.id]
+        return report.failed
+
+    def revoke_policies(self,
+                        policies: Iterable['Policy'],
+                        timeout: float = None,
+                        max_concurrent_revocations: int = 16
+                        ) -> Dict[bytes, 'RevocationReport']:
+        """
+        Revokes the arrangements of several policies at once, sending up to `max_concurrent_revocations`
+        revocations at a time across all of them, and waiting at most `timeout` seconds for each node.
 
-        except self.NotEnoughTeachers:
-            raise  # TODO  NRN
+        Returns a RevocationReport of the confirmed and failed nodes for each policy, by policy ID.
+        """
+        from nucypher.policy.collections import RevocationReport
 
-        else:
-            failed_revocations = dict()
+        reports = dict()
+        revocations = list()
+        for policy in policies:
+            try:
+                # Wait for a revocation threshold of nodes to be known ((n - m) + 1)
+                revocation_threshold = ((policy.n - policy.treasure_map.m) + 1)
+                self.block_until_specific_nodes_are_known(
+                    policy.revocation_kit.revokable_addresses,
+                    allow_missing=(policy.n - revocation_threshold))
+
+            except self.NotEnoughTeachers:
+                raise  # TODO  NRN
+
+            report = reports[policy.id] = RevocationReport(policy_id=policy.id)
             for node_id in policy.revocation_kit.revokable_addresses:
-                ursula = self.known_nodes[node_id]
-                revocation = policy.revocation_kit[node_id]
+                revocations.append((policy, report, node_id))
+
+        def revoke_arrangement(policy, node_id):
+            ursula = self.known_nodes[node_id]
+            revocation = policy.revocation_kit[node_id]
+            response = self.network_middleware.revoke_arrangement(ursula, revocation, timeout=timeout)
+            if response.status_code != 200:
+                raise self.ActorError(f"Failed to revoke {policy.id} with status code {response.status_code}")
+
+        with ThreadPoolExecutor(max_workers=max_concurrent_revocations, thread_name_prefix='revocation') as executor:
+            pending_revocations = {executor.submit(revoke_arrangement, policy, node_id): (policy, report, node_id)
+                                   for policy, report, node_id in revocations}
+            for future in as_completed(pending_revocations):
+                policy, report, node_id = pending_revocations[future]
                 try:
-                    response = self.network_middleware.revoke_arrangement(ursula, revocation)
-                except self.network_middleware.NotFound:
-                    failed_revocations[node_id] = (revocation, self.network_middleware.NotFound)
-                except self.network_middleware.UnexpectedResponse:
-                    failed_revocations[node_id] = (revocation, self.network_middleware.UnexpectedResponse)
+                    future.result()
+                except Exception as e:
+                    self.log.debug(f"Failed to revoke {policy.id.hex()} at {node_id}: {e}")
+                    report.fail(node_id=node_id, revocation=policy.revocation_kit[node_id], error=e)
                 else:
-                    if response.status_code != 200:
-                        raise self.ActorError(f"Failed to revoke {policy.id} with status code {response.status_code}")
+                    report.confirm(node_id)
 
-        return failed_revocations
+        return reports
 
     def decrypt_message_kit(self,
                             message_kit: UmbralMessageKit,
@@ -465,6 +604,14 @@ class Alice(Character, BlockchainPolicyAuthor):
             response = controller(method_name='grant', control_request=request)
             return response
 
+        @alice_flask_control.route("/bulk_grant", methods=['PUT'])
+        def bulk_grant() -> Response:
+            """
+            Character control endpoint for granting many policies with the same parameters.
+            """
+            response = controller(method_name='bulk_grant', control_request=request)
+            return response
+
         @alice_flask_control.route("/revoke", methods=['DELETE'])
         def revoke():
             """
@@ -482,6 +629,15 @@ class Bob(Character):
 
     _default_crypto_powerups = [SigningPower, DecryptingPower]
 
+    # Treasure map lookups ask this many nodes at once, and more of them each time the stagger timeout passes.
+    _treasure_map_hedge_size = 3
+    _treasure_map_stagger_timeout = 0.5  # seconds
+
+    # The treasure map requests of all Bobs in the process run on a single, bounded executor.
+    MAX_CONCURRENT_TREASURE_MAP_REQUESTS = 32
+    __treasure_map_executor = None
+    __treasure_map_executor_lock = Lock()
+
     class IncorrectCFragsReceived(Exception):
         """
         Raised when Bob detects incorrect CFrags returned by some Ursulas
@@ -490,7 +646,12 @@ class Bob(Character):
         def __init__(self, evidence: List):
             self.evidence = evidence
 
-    def __init__(self, treasure_maps: Optional[Dict] = None, controller: bool = True, *args, **kwargs) -> None:
+    def __init__(self,
+                 treasure_maps: Optional[Dict] = None,
+                 controller: bool = True,
+                 cfrag_cache_filepath: str = None,
+                 cfrag_cache_size: int = 0,
+                 *args, **kwargs) -> None:
         Character.__init__(self, known_node_class=Ursula, *args, **kwargs)
 
         if controller:
@@ -503,6 +664,14 @@ class Bob(Character):
         from nucypher.policy.collections import WorkOrderHistory  # Need a bigger strategy to avoid circulars.
         self._completed_work_orders = WorkOrderHistory()
 
+        # The decrypted contents of treasure maps, so that a map received again isn't decrypted and verified again.
+        self._oriented_treasure_maps = LRUCache(maxsize=ORIENTED_TREASURE_MAP_CACHE_SIZE)
+
+        # CFrags kept on disk, so that retrievals after a restart can skip the network (off by default).
+        self._cfrag_cache = None
+        if cfrag_cache_filepath and cfrag_cache_size > 0:
+            self._cfrag_cache = CFragCache(Datastore(cfrag_cache_filepath), max_entries=cfrag_cache_size)
+
         self.log = Logger(self.__class__.__name__)
         self.log.info(self.banner)
 
@@ -573,7 +742,16 @@ class Bob(Character):
 
     def _try_orient(self, treasure_map, alice_verifying_key):
         alice = Alice.from_public_keys(verifying_key=alice_verifying_key)
-        compass = self.make_compass_for_alice(alice)
+        verify_and_decrypt = self.make_compass_for_alice(alice)
+        digest = keccak_digest(bytes(alice_verifying_key), treasure_map.message_kit.to_bytes())
+
+        def compass(message_kit):
+            map_in_the_clear = self._oriented_treasure_maps.get(digest)
+            if map_in_the_clear is None:
+                map_in_the_clear = verify_and_decrypt(message_kit=message_kit)
+                self._oriented_treasure_maps[digest] = map_in_the_clear
+            return map_in_the_clear
+
         try:
             treasure_map.orient(compass)
         except treasure_map.InvalidSignature:
@@ -592,10 +770,11 @@ class Bob(Character):
             if not self.known_nodes:
                 raise self.NotEnoughTeachers("Can't retrieve without knowing about any nodes at all.  Pass a teacher or seed node.")
 
+        known_treasure_map = self.treasure_maps.get(map_identifier)
         treasure_map = self.get_treasure_map_from_known_ursulas(self.network_middleware,
-                                                                map_identifier)
-
-        self._try_orient(treasure_map, alice_verifying_key)
+                                                                map_identifier,
+                                                                known_treasure_map=known_treasure_map,
+                                                                alice_verifying_key=alice_verifying_key)
         self.treasure_maps[map_identifier] = treasure_map # TODO: make a part of _try_orient()?
         return treasure_map
 
@@ -617,47 +796,96 @@ class Bob(Character):
 
         return map_id
 
-    def get_treasure_map_from_known_ursulas(self, network_middleware, map_identifier, timeout=3):
+    @classmethod
+    def _get_treasure_map_executor(cls) -> ThreadPoolExecutor:
+        with cls.__treasure_map_executor_lock:
+            if cls.__treasure_map_executor is None:
+                cls.__treasure_map_executor = ThreadPoolExecutor(max_workers=cls.MAX_CONCURRENT_TREASURE_MAP_REQUESTS,
+                                                                 thread_name_prefix='TreasureMapLookup')
+            return cls.__treasure_map_executor
+
+    def get_treasure_map_from_known_ursulas(self,
+                                            network_middleware,
+                                            map_identifier,
+                                            timeout=3,
+                                            known_treasure_map=None,
+                                            alice_verifying_key=None):
         """
-        Iterate through the nodes we know, asking for the TreasureMap.
-        Return the first one who has it.
+        Ask the nodes we know for the TreasureMap, and return the first valid one.
+
+        The first few nodes are asked at once, and more of them each time
+        `_treasure_map_stagger_timeout` passes without an answer, so that slow or dead nodes
+        don't hold up the lookup.  Once the nodes we know run out, we learn about more of them between batches.
+        Once a node provides the map, the remaining requests are cancelled.
+        If `alice_verifying_key` is given, only maps Bob can orient with it are accepted.
+
+        If we already have a copy of the map, nodes holding the same one answer without
+        sending it again, in which case `known_treasure_map` itself is returned.
         """
         if self.federated_only:
             from nucypher.policy.collections import TreasureMap as _MapClass
         else:
             from nucypher.policy.collections import SignedTreasureMap as _MapClass
 
-        start = maya.now()
+        etag = treasure_map_etag(bytes(known_treasure_map)) if known_treasure_map else None
 
         # Spend no more than half the timeout finding the nodes.  8 nodes is arbitrary.  Come at me.
         self.block_until_number_of_known_nodes_is(8, timeout=timeout/2, learn_on_this_thread=True)
-        while True:
-            nodes_with_map = self.matching_nodes_among(self.known_nodes)
-            random.shuffle(nodes_with_map)
 
-            for node in nodes_with_map:
-                try:
-                    response = network_middleware.get_treasure_map_from_node(node, map_identifier)
-                except (*NodeSeemsToBeDown, self.NotEnoughNodes):
-                    continue
-                except network_middleware.NotFound:
-                    self.log.info(f"Node {node} claimed not to have TreasureMap {map_identifier}")
-                    continue
+        asked_nodes = set()
 
-                if response.status_code == 200 and response.content:
-                    try:
-                        treasure_map = _MapClass.from_bytes(response.content)
-                        return treasure_map
-                    except InvalidSignature:
-                        # TODO: What if a node gives a bunk TreasureMap?  NRN
-                        raise
-                else:
-                    continue  # TODO: Actually, handle error case here.  NRN
-            else:
-                self.learn_from_teacher_node()
+        def nodes_with_map():
+            nodes = [node for node in self.matching_nodes_among(self.known_nodes) if node not in asked_nodes]
+            random.shuffle(nodes)
+            asked_nodes.update(nodes)
+            return nodes
 
-            if (start - maya.now()).seconds > timeout:
-                raise _MapClass.NowhereToBeFound(f"Asked {len(self.known_nodes)} nodes, but none had map {map_identifier} ")
+        def get_treasure_map_from_node(node):
+            try:
+                response = network_middleware.get_treasure_map_from_node(node, map_identifier, etag=etag)
+            except network_middleware.NotFound:
+                self.log.info(f"Node {node} claimed not to have TreasureMap {map_identifier}")
+                raise
+
+            if response.status_code == 304 and known_treasure_map:
+                return known_treasure_map  # Unchanged, and already oriented.
+            if response.status_code != 200 or not response.content:
+                raise RuntimeError(f"Node {node} responded with status {response.status_code}")  # TODO: Actually, handle error case here.  NRN
+
+            treasure_map = _MapClass.from_bytes(response.content)  # Also verifies the map is publicly signed.
+            if alice_verifying_key:
+                self._try_orient(treasure_map, alice_verifying_key)
+            return treasure_map
+
+        executor = self._get_treasure_map_executor()
+        deadline = time.monotonic() + timeout
+        unasked_nodes = nodes_with_map()
+        can_learn = True
+        pending_requests = set()
+        try:
+            while True:
+                if not unasked_nodes and can_learn:
+                    # Learning happens here, on the caller's thread, while the outstanding requests run.
+                    self.learn_from_teacher_node()
+                    unasked_nodes = nodes_with_map()
+                    can_learn = bool(unasked_nodes)
+                batch, unasked_nodes = unasked_nodes[:self._treasure_map_hedge_size], \
+                                       unasked_nodes[self._treasure_map_hedge_size:]
+                pending_requests.update(executor.submit(get_treasure_map_from_node, node) for node in batch)
+
+                time_left = deadline - time.monotonic()
+                if not pending_requests or time_left <= 0:
+                    raise _MapClass.NowhereToBeFound(f"Asked {len(asked_nodes)} nodes, but none had map {map_identifier} ")
+                done, pending_requests = wait(pending_requests,
+                                              timeout=min(self._treasure_map_stagger_timeout, time_left),
+                                              return_when=FIRST_COMPLETED)
+                for request in done:
+                    if request.exception() is None:
+                        return request.result()
+        finally:
+            # Don't wait for the outstanding requests; those that haven't started yet are cancelled.
+            for request in pending_requests:
+                request.cancel()
 
     def work_orders_for_capsules(self,
                                  *capsules,
@@ -684,6 +912,8 @@ class Bob(Character):
 
         random_walk = list(treasure_map_to_use)
         shuffle(random_walk)  # Mutates list in-place
+        # Ursulas that recently failed us go last, so that they're only asked if the others aren't enough.
+        random_walk.sort(key=lambda destination: not self.known_nodes.is_available(destination[0]))
         for node_id, arrangement_id in random_walk:
 
             capsules_to_include = []
@@ -755,7 +985,8 @@ class Bob(Character):
 
     def _reencrypt(self,
                    work_order: 'WorkOrder',
-                   retain_cfrags: bool = False
+                   retain_cfrags: bool = False,
+                   verify_cfrags: bool = True
                    ) -> Tuple[bool, Union[List['IndisputableEvidence'], List['CapsuleFrag']]]:
 
         if work_order.completed:
@@ -767,6 +998,7 @@ class Bob(Character):
             cfrags_and_signatures = self.network_middleware.reencrypt(work_order)
         except NodeSeemsToBeDown as e:
             # TODO: What to do here?  Ursula isn't supposed to be down.  NRN
+            self.known_nodes.record_unreachable(work_order.ursula.checksum_address)
             self.log.info(f"Ursula ({work_order.ursula}) seems to be down while trying to complete WorkOrder: {work_order}")
             return False, [] # TODO: return a grievance?
         except self.network_middleware.NotFound:
@@ -777,6 +1009,7 @@ class Bob(Character):
         except self.network_middleware.UnexpectedResponse:
             raise # TODO: Handle this
 
+        self.known_nodes.record_reachable(work_order.ursula.checksum_address)
         cfrags = work_order.complete(cfrags_and_signatures)
 
         # TODO: hopefully GIL will allow this to execute concurrently...
@@ -785,7 +1018,7 @@ class Bob(Character):
 
         the_airing_of_grievances = []
         for capsule, pre_task in work_order.tasks.items():
-            if not pre_task.cfrag.verify_correctness(capsule):
+            if verify_cfrags and not pre_task.cfrag.verify_correctness(capsule):
                 # TODO: WARNING - This block is untested.
                 from nucypher.policy.collections import IndisputableEvidence
                 evidence = IndisputableEvidence(task=pre_task, work_order=work_order)
@@ -793,24 +1026,40 @@ class Bob(Character):
                 the_airing_of_grievances.append(evidence)
 
         if the_airing_of_grievances:
+            self.known_nodes.record_suspicious(work_order.ursula.checksum_address)
             return False, the_airing_of_grievances
         else:
             return True, cfrags
 
-    def retrieve(self,
-                 *message_kits: UmbralMessageKit,
-                 alice_verifying_key: UmbralPublicKey,
-                 label: bytes,
-                 enrico: "Enrico" = None,
-                 retain_cfrags: bool = False,
-                 use_attached_cfrags: bool = False,
-                 use_precedent_work_orders: bool = False,
-                 policy_encrypting_key: UmbralPublicKey = None,
-                 treasure_map: Union['TreasureMap', bytes] = None):
-
-        # Try our best to get an UmbralPublicKey from input
-        alice_verifying_key = UmbralPublicKey.from_bytes(bytes(alice_verifying_key))
-
+    def _attach_cached_cfrags(self, capsules: Set['Capsule'], treasure_map: 'TreasureMap') -> Set['Capsule']:
+        """
+        Attaches cached CFrags to the capsules that have at least m of them, and returns the remaining capsules.
+        Capsules with fewer cached CFrags, or with CFrags already attached, are left untouched,
+        so that no Ursula's CFrag is attached twice.
+        """
+        destinations = list(treasure_map)
+        remaining_capsules = set()
+        for capsule in capsules:
+            cfrags = self._cfrag_cache.cfrags(capsule, destinations) if len(capsule) == 0 else []
+            if len(cfrags) < treasure_map.m:
+                remaining_capsules.add(capsule)
+                continue
+            try:
+                for cfrag in cfrags[:treasure_map.m]:
+                    capsule.attach_cfrag(cfrag)
+            except UmbralCorrectnessError:
+                self.log.warn(f"Found incorrect cached CFrags for {capsule}; retrieving it from Ursulas instead.")
+                capsule.clear_cfrags()
+                remaining_capsules.add(capsule)
+            else:
+                self.log.debug(f"Attached {treasure_map.m} cached CFrags to {capsule}.")
+        return remaining_capsules
+
+    def _treasure_map_for_retrieval(self,
+                                    treasure_map: Union['TreasureMap', bytes, str, None],
+                                    alice_verifying_key: UmbralPublicKey,
+                                    label: bytes
+                                    ) -> 'TreasureMap':
         if treasure_map is not None:
 
             if self.federated_only:
@@ -832,7 +1081,23 @@ class Bob(Character):
             map_id = self.construct_map_id(alice_verifying_key, label)
             treasure_map = self.treasure_maps[map_id]
 
-        _unknown_ursulas, _known_ursulas, m = self.follow_treasure_map(treasure_map=treasure_map, block=True)
+        return treasure_map
+
+    def retrieve(self,
+                 *message_kits: UmbralMessageKit,
+                 alice_verifying_key: UmbralPublicKey,
+                 label: bytes,
+                 enrico: "Enrico" = None,
+                 retain_cfrags: bool = False,
+                 use_attached_cfrags: bool = False,
+                 use_precedent_work_orders: bool = False,
+                 policy_encrypting_key: UmbralPublicKey = None,
+                 treasure_map: Union['TreasureMap', bytes] = None,
+                 policy_expiration: maya.MayaDT = None):
+
+        # Try our best to get an UmbralPublicKey from input
+        alice_verifying_key = UmbralPublicKey.from_bytes(bytes(alice_verifying_key))
+        treasure_map = self._treasure_map_for_retrieval(treasure_map, alice_verifying_key, label)
 
         # Part I: Assembling the WorkOrders.
         capsules_to_activate = set(mk.capsule for mk in message_kits)
@@ -859,10 +1124,19 @@ class Bob(Character):
             capsule.set_correctness_keys(receiving=self.public_keys(DecryptingPower))
             capsule.set_correctness_keys(verifying=alice_verifying_key)
 
-        new_work_orders, complete_work_orders = self.work_orders_for_capsules(
-            treasure_map=treasure_map,
-            alice_verifying_key=alice_verifying_key,
-            *capsules_to_activate)
+        # Capsules with enough CFrags in the on-disk cache don't need the network at all.
+        if self._cfrag_cache is not None:
+            capsules_to_activate = self._attach_cached_cfrags(capsules_to_activate, treasure_map)
+
+        if capsules_to_activate:
+            _unknown_ursulas, _known_ursulas, m = self.follow_treasure_map(treasure_map=treasure_map, block=True)
+            new_work_orders, complete_work_orders = self.work_orders_for_capsules(
+                treasure_map=treasure_map,
+                alice_verifying_key=alice_verifying_key,
+                *capsules_to_activate)
+        else:
+            m = treasure_map.m
+            new_work_orders, complete_work_orders = OrderedDict(), dict()
 
         self.log.info(f"Found {len(complete_work_orders)} complete work orders "
                       f"for Capsules ({capsules_to_activate}).")
@@ -901,6 +1175,9 @@ class Bob(Character):
                         the_airing_of_grievances.extend(result)
                         continue
 
+                    if self._cfrag_cache is not None:
+                        self._cfrag_cache.save_work_order(work_order, expiration=policy_expiration)
+
                     for capsule, pre_task in work_order.tasks.items():
                         capsule.attach_cfrag(pre_task.cfrag) # already verified, will not fail
                         if len(capsule) >= m:
@@ -929,9 +1206,176 @@ class Bob(Character):
                     message.capsule.clear_cfrags()
                 for work_order in new_work_orders.values():
                     work_order.sanitize()
+                    self._completed_work_orders.discard_work_order(work_order)
 
         return cleartexts
 
+    def retrieve_batch(self,
+                       *message_kits: UmbralMessageKit,
+                       alice_verifying_key: UmbralPublicKey,
+                       label: bytes,
+                       enrico: "Enrico" = None,
+                       policy_encrypting_key: UmbralPublicKey = None,
+                       treasure_map: Union['TreasureMap', bytes] = None,
+                       processes: int = None,
+                       batch_size: int = 64
+                       ) -> List[Union[bytes, UndecryptableMessageKit]]:
+        """
+        Retrieves many message kits at once, like `retrieve`, but leaves the checking of the CFrags' correctness
+        proofs, the decryption, and the verification of the kits' signatures to a pool of `processes`
+        (by default, one per core).
+
+        An Ursula whose CFrag fails its correctness proof is marked as suspicious, and replacement CFrags are
+        requested from the Ursulas of the map that weren't asked yet.
+
+        Returns the cleartexts in the order of `message_kits`, with an `UndecryptableMessageKit` in place of
+        each kit that couldn't be opened, instead of failing the whole batch.  For kits left without enough
+        correct CFrags, it's an `IncorrectCFrags`, whose `evidence` holds the `IndisputableEvidence` against
+        the Ursulas that sent the incorrect ones.
+        CFrags are neither taken from, nor attached to, the kits' capsules.
+        """
+        from nucypher.policy.collections import IndisputableEvidence  # Prevent circular import
+
+        alice_verifying_key = UmbralPublicKey.from_bytes(bytes(alice_verifying_key))
+        treasure_map = self._treasure_map_for_retrieval(treasure_map, alice_verifying_key, label)
+        _unknown_ursulas, _known_ursulas, m = self.follow_treasure_map(treasure_map=treasure_map, block=True)
+
+        for message in message_kits:
+            message.ensure_correct_sender(enrico=enrico, policy_encrypting_key=policy_encrypting_key)
+
+        if not self.done_seeding:
+            self.learn_from_teacher_node()
+
+        # Kits sharing a capsule share its CFrags, each kept along with the WorkOrder it came from.
+        cfrags = OrderedDict((message.capsule, []) for message in message_kits)
+        evidence = defaultdict(list)
+        asked_ursulas = set()
+        completed_work_orders = []
+        decrypting_key = self._crypto_power.power_ups(DecryptingPower).keypair._privkey
+        results = [None] * len(message_kits)
+        kits_to_open = list(range(len(message_kits)))
+        try:
+            while kits_to_open:
+                capsules_to_activate = set(message_kits[index].capsule for index in kits_to_open
+                                           if len(cfrags[message_kits[index].capsule]) < m)
+                if capsules_to_activate:
+                    completed_work_orders.extend(self.__gather_cfrags(capsules_to_activate, cfrags, m,
+                                                                      asked_ursulas=asked_ursulas,
+                                                                      treasure_map=treasure_map,
+                                                                      alice_verifying_key=alice_verifying_key))
+                if capsules_to_activate and not evidence:
+                    raise Ursula.NotEnoughUrsulas(
+                        "Unable to reach m Ursulas.  See the logs for which Ursulas are down or noncompliant.")
+
+                sent_cfrags = OrderedDict()  # The CFrags sent to the pool, by kit
+                for index in kits_to_open:
+                    capsule = message_kits[index].capsule
+                    if len(cfrags[capsule]) < m:
+                        results[index] = IncorrectCFrags(f"Not enough correct CFrags for {capsule}", indices=[])
+                        results[index].evidence = evidence[capsule]
+                    else:
+                        sent_cfrags[index] = cfrags[capsule][:m]
+                if not sent_cfrags:
+                    break
+
+                opened_kits = decrypt_and_verify_batch(
+                    decrypting_key=decrypting_key,
+                    alice_verifying_key=alice_verifying_key,
+                    message_kits=((bytes(message_kits[index].capsule),
+                                   message_kits[index].ciphertext,
+                                   bytes(message_kits[index].sender.stamp.as_umbral_pubkey()),
+                                   bytes(message_kits[index].sender.policy_pubkey),
+                                   [cfrag for cfrag, _work_order in sent_cfrags[index]])
+                                  for index in sent_cfrags),
+                    processes=processes,
+                    batch_size=batch_size)
+
+                kits_to_open = []
+                for index, result in zip(sent_cfrags, opened_kits):
+                    if not isinstance(result, IncorrectCFrags):
+                        results[index] = result
+                        continue
+                    # Discard the incorrect CFrags (once, for kits sharing a capsule), and try again with others.
+                    message = message_kits[index]
+                    for cfrag_index in result.indices:
+                        cfrag_and_work_order = sent_cfrags[index][cfrag_index]
+                        if cfrag_and_work_order not in cfrags[message.capsule]:
+                            continue
+                        cfrags[message.capsule].remove(cfrag_and_work_order)
+                        _cfrag, work_order = cfrag_and_work_order
+                        grievance = IndisputableEvidence(task=work_order.tasks[message.capsule],
+                                                         work_order=work_order,
+                                                         delegating_pubkey=message.sender.policy_pubkey,
+                                                         receiving_pubkey=self.public_keys(DecryptingPower),
+                                                         verifying_pubkey=alice_verifying_key)
+                        evidence[message.capsule].append(grievance)
+                        self.known_nodes.record_suspicious(work_order.ursula.checksum_address)
+                        self.log.warn(f"Ursula ({work_order.ursula}) sent an incorrect CFrag for {message.capsule}.")
+                    kits_to_open.append(index)
+        finally:
+            for work_order in completed_work_orders:
+                work_order.sanitize()
+                self._completed_work_orders.discard_work_order(work_order)
+
+        return results
+
+    def __gather_cfrags(self,
+                        capsules: Set['Capsule'],
+                        cfrags: Dict['Capsule', List[Tuple[bytes, 'WorkOrder']]],
+                        m: int,
+                        asked_ursulas: Set[ChecksumAddress],
+                        treasure_map: 'TreasureMap',
+                        alice_verifying_key: UmbralPublicKey
+                        ) -> List['WorkOrder']:
+        """
+        Gets unverified CFrags for `capsules` from the Ursulas of `treasure_map` that weren't asked yet,
+        until each of them has `m`; removes the ones that got enough from `capsules`.
+        Returns the completed WorkOrders.
+        """
+        new_work_orders, _complete_work_orders = self.work_orders_for_capsules(
+            treasure_map=treasure_map,
+            alice_verifying_key=alice_verifying_key,
+            *capsules)
+
+        completed_work_orders = []
+        for node_id, work_order in new_work_orders.items():
+            if not capsules:
+                break
+            if node_id in asked_ursulas:
+                continue
+            asked_ursulas.add(node_id)
+            success, _cfrags = self._reencrypt(work_order, verify_cfrags=False)
+            if not success:
+                continue
+            completed_work_orders.append(work_order)
+            for capsule, pre_task in work_order.tasks.items():
+                cfrags[capsule].append((pre_task.cfrag.to_bytes(), work_order))
+                if len(cfrags[capsule]) >= m:
+                    capsules.discard(capsule)
+        return completed_work_orders
+
+    def retrieve_stream(self,
+                        ciphertext: BinaryIO,
+                        plaintext: BinaryIO,
+                        alice_verifying_key: UmbralPublicKey,
+                        label: bytes,
+                        enrico: "Enrico" = None,
+                        policy_encrypting_key: UmbralPublicKey = None,
+                        **retrieve_kwargs) -> int:
+        """
+        Decrypts a stream made by `Enrico.encrypt_stream` from the file-like `ciphertext` into `plaintext`,
+        one chunk at a time.  The stream key at its head is retrieved like any other message;
+        the rest of the stream is then decrypted locally.  Returns the number of bytes decrypted.
+        """
+        message_kit = read_stream_header(ciphertext)
+        stream_key, = self.retrieve(message_kit,
+                                    alice_verifying_key=alice_verifying_key,
+                                    label=label,
+                                    enrico=enrico,
+                                    policy_encrypting_key=policy_encrypting_key,
+                                    **retrieve_kwargs)
+        return decrypt_chunks(stream_key, ciphertext=ciphertext, plaintext=plaintext)
+
     def matching_nodes_among(self,
                              nodes: FleetSensor,
                              no_less_than=7):  # Somewhat arbitrary floor here.
@@ -947,25 +1391,32 @@ class Bob(Character):
         if len(nodes) < no_less_than:
             raise ValueError(f"Can't select {no_less_than} from {len(nodes)} (Fleet state: {nodes.FleetState})")
 
-        search_boundary = 2
-        target_nodes = []
         target_hex_match = self.public_keys(DecryptingPower).hex()[1]
-        while len(target_nodes) < no_less_than:
-            target_nodes = []
-            search_boundary += 2
 
-            if search_boundary > 42:  # We've searched the entire string and can't match any.  TODO: Portable learning is a nice idea here.
-                # Not enough matching nodes.  Fine, we'll just publish to the first few.
-                try:
-                    # TODO: This is almost certainly happening in a test.  If it does happen in production, it's a bit of a problem.  Need to fix #2124 to mitigate.
-                    target_nodes = list(nodes._nodes.values())[0:6]
-                    return target_nodes
-                except IndexError:
-                    raise self.NotEnoughNodes("There aren't enough nodes on the network to enact this policy.  Unless this is day one of the network and nodes are still getting spun up, something is bonkers.")
-
-            # TODO: 1995 all throughout here (we might not (need to) know the checksum address yet; canonical will do.)
-            # This might be a performance issue above a few thousand nodes.
-            target_nodes = [node for node in nodes if target_hex_match in node.checksum_address[2:search_boundary]]
+        # TODO: 1995 all throughout here (we might not (need to) know the checksum address yet; canonical will do.)
+        # Nodes are indexed by where the character first appears in their checksum address,
+        # so that the nodes having it within the first few characters are a bisect away.
+        if isinstance(nodes, FleetSensor):
+            index = nodes.addresses_by_position_of(target_hex_match)
+            nodes_by_address = nodes
+        else:
+            nodes_by_address = {node.checksum_address: node for node in nodes}
+            index = index_addresses_by_character(nodes_by_address, target_hex_match)
+
+        if len(index) < no_less_than:  # We've searched the entire string and can't match any.  TODO: Portable learning is a nice idea here.
+            # Not enough matching nodes.  Fine, we'll just publish to the first few.
+            try:
+                # TODO: This is almost certainly happening in a test.  If it does happen in production, it's a bit of a problem.  Need to fix #2124 to mitigate.
+                target_nodes = list(nodes._nodes.values())[0:6]
+                return target_nodes
+            except IndexError:
+                raise self.NotEnoughNodes("There aren't enough nodes on the network to enact this policy.  Unless this is day one of the network and nodes are still getting spun up, something is bonkers.")
+
+        # Widen the search two characters at a time, until it covers enough nodes.
+        furthest_position = index[no_less_than - 1][0]
+        search_width = 2 * (furthest_position // 2 + 1)
+        end = bisect_left(index, (search_width,))
+        target_nodes = [nodes_by_address[address] for _position, address in index[:end]]
         return target_nodes
 
     def make_web_controller(drone_bob, crash_on_error: bool = False):
@@ -1020,6 +1471,7 @@ class Ursula(Teacher, Character, Worker):
     _default_crypto_powerups = [SigningPower, DecryptingPower]
 
     _pruning_interval = 60  # seconds
+    _migration_batch_size = 1000  # records per record type, per pruning round
 
     class NotEnoughUrsulas(Learner.NotEnoughTeachers, StakingEscrowAgent.NotEnoughStakers):
         """
@@ -1104,6 +1556,7 @@ class Ursula(Teacher, Character, Worker):
             self.__pruning_task = None
             self._prune_datastore = prune_datastore
             self._datastore_pruning_task = LoopingCall(f=self.__prune_datastore)
+            self.__unmigrated_record_types = [PolicyArrangement, Workorder, DatastoreTreasureMap]
 
         #
         # Ursula the Decentralized Worker (Self)
@@ -1198,6 +1651,7 @@ class Ursula(Teacher, Character, Worker):
         # Teacher (Verifiable Node)
         #
 
+        self.__serialized = None  # The identity this node was last serialized with, and its bytes.
         certificate_filepath = self._crypto_power.power_ups(TLSHostingPower).keypair.certificate_filepath
         certificate = self._crypto_power.power_ups(TLSHostingPower).keypair.certificate
         Teacher.__init__(self,
@@ -1218,8 +1672,27 @@ class Ursula(Teacher, Character, Worker):
             message = "Initialized Stranger {} | {}".format(self.__class__.__name__, self)
             self.log.debug(message)
 
+    def __migrate_datastore(self) -> None:
+        """
+        Converts some of the records still stored field by field into the packed record layout.
+        Records are only ever written in the packed layout, so once a record type is fully migrated,
+        it isn't looked at again.
+        """
+        for record_type in list(self.__unmigrated_record_types):
+            try:
+                result = self.datastore.migrate_records(record_type, max_records=self._migration_batch_size)
+            except DatastoreTransactionError:
+                self.log.warn(f"Failed to migrate {record_type.__name__} records; DB session rolled back.")
+            else:
+                if result > 0:
+                    self.log.debug(f"Migrated {result} {record_type.__name__} records to the packed layout.")
+                if result < self._migration_batch_size:
+                    self.__unmigrated_record_types.remove(record_type)
+                    self.log.debug(f"All {record_type.__name__} records are in the packed layout.")
+
     def __prune_datastore(self) -> None:
         """Deletes all expired arrangements, kfrags, and treasure maps in the datastore."""
+        self.__migrate_datastore()
         now = maya.MayaDT.from_datetime(datetime.fromtimestamp(self._datastore_pruning_task.clock.seconds()))
         try:
             with self.datastore.query_by(PolicyArrangement,
@@ -1396,6 +1869,15 @@ class Ursula(Teacher, Character, Worker):
         return self._crypto_power.power_ups(TLSHostingPower).keypair.certificate
 
     def __bytes__(self):
+        # A node's keys and certificate never change, but its timestamp, interface and identity
+        # evidence can: the serialization is only rebuilt when one of those does.
+        identity = (self.timestamp_bytes(),
+                    bytes(self._interface_signature),
+                    bytes(self.rest_interface),
+                    bytes(self.decentralized_identity_evidence),
+                    self.domain)
+        if self.__serialized is not None and self.__serialized[0] == identity:
+            return self.__serialized[1]
 
         version = self.TEACHER_VERSION.to_bytes(2, "big")
         interface_info = VariableLengthBytestring(bytes(self.rest_interface))
@@ -1414,6 +1896,7 @@ class Ursula(Teacher, Character, Worker):
                                  bytes(cert_vbytes),
                                  bytes(interface_info))
                                 )
+        self.__serialized = (identity, as_bytes)
         return as_bytes
 
     #
@@ -1755,6 +2238,64 @@ class Enrico(Character):
         message_kit.policy_pubkey = self.policy_pubkey  # TODO: We can probably do better here.  NRN
         return message_kit, signature
 
+    def encrypt_messages(self,
+                         plaintexts: Iterable[bytes],
+                         processes: int = None,
+                         batch_size: int = 64
+                         ) -> Iterator[UmbralMessageKit]:
+        """
+        Encrypts each of `plaintexts` as `encrypt_message` would, across a pool of `processes` (by default,
+        one per core), yielding their message kits in the same order.
+        """
+        for message_kit_bytes in self._encrypt_batch(plaintexts, processes=processes, batch_size=batch_size):
+            message_kit = UmbralMessageKit.from_bytes(message_kit_bytes)
+            message_kit.policy_pubkey = self.policy_pubkey
+            yield message_kit
+
+    def encrypt_messages_to_stream(self,
+                                   plaintexts: Iterable[bytes],
+                                   stream: BinaryIO,
+                                   processes: int = None,
+                                   batch_size: int = 64
+                                   ) -> int:
+        """
+        Like `encrypt_messages`, but writes the message kits to the file-like `stream`, each prefixed
+        with its length (see `nucypher.crypto.streams.read_message_kits`).  Returns the number of messages.
+        """
+        messages = 0
+        for message_kit_bytes in self._encrypt_batch(plaintexts, processes=processes, batch_size=batch_size):
+            write_message_kit(stream, message_kit_bytes)
+            messages += 1
+        return messages
+
+    def _encrypt_batch(self, plaintexts: Iterable[bytes], processes: int, batch_size: int) -> Iterator[bytes]:
+        signing_keypair = self._crypto_power.power_ups(SigningPower).keypair
+        if signing_keypair._privkey == PUBLIC_ONLY:
+            raise TypeError("This Enrico only knows his public signing key, so he can't sign messages.")
+        return encrypt_and_sign_batch(self.policy_pubkey,
+                                      plaintexts=plaintexts,
+                                      signing_key=signing_keypair._privkey,
+                                      processes=processes,
+                                      batch_size=batch_size)
+
+    def encrypt_stream(self,
+                       plaintext: BinaryIO,
+                       ciphertext: BinaryIO,
+                       chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+                       ) -> UmbralMessageKit:
+        """
+        Encrypts everything read from the file-like `plaintext` into `ciphertext`, `chunk_size` bytes at a time.
+
+        Only the stream's symmetric key is encrypted for the policy, so the whole stream takes a single capsule
+        (and a single re-encryption) however large it is.  Returns the message kit carrying the stream key,
+        which is also written at the head of `ciphertext` for Bob's `retrieve_stream`.
+        """
+        stream_key = generate_stream_key(chunk_size=chunk_size)
+        message_kit, _signature = self.encrypt_message(plaintext=stream_key)
+        write_stream_header(ciphertext, message_kit)
+        encrypt_chunks(stream_key, plaintext=plaintext, ciphertext=ciphertext)
+        return message_kit
+
     @classmethod
     def from_alice(cls, alice: Alice, label: bytes):
         """
@@ -18,7 +18,6 @@ import maya
 from constant_sorrow.constants import NO_KNOWN_NODES
 
 from nucypher.config.constants import SEEDNODES
-from nucypher.datastore.datastore import RecordNotFound
 from nucypher.datastore.models import Workorder
 
 
@@ -55,11 +54,8 @@ def paint_node_status(emitter, ursula, start_time):
     # Build FleetState status line
     fleet_state = build_fleet_state_status(ursula=ursula)
 
-    try:
-        with ursula.datastore.query_by(Workorder) as work_orders:
-            num_work_orders = len(work_orders)
-    except RecordNotFound:
-        num_work_orders = 0
+    with ursula.datastore.stream_by(Workorder) as work_orders:
+        num_work_orders = sum(1 for _ in work_orders)
 
     stats = ['⇀URSULA {}↽'.format(ursula.nickname_icon),
              '{}'.format(ursula),
@@ -31,6 +31,7 @@ from nucypher.blockchain.eth.signers import Signer
 from nucypher.config.constants import DEFAULT_CONFIG_ROOT
 from nucypher.config.keyring import NucypherKeyring
 from nucypher.config.node import CharacterConfiguration
+from nucypher.crypto.powers import DelegatingPower
 
 
 class UrsulaConfiguration(CharacterConfiguration):
@@ -159,6 +160,7 @@ class AliceConfiguration(CharacterConfiguration):
 
     DEFAULT_STORE_POLICIES = True
     DEFAULT_STORE_CARDS = True
+    DEFAULT_LABEL_KEY_CACHE_SIZE = DelegatingPower.DEFAULT_LABEL_KEY_CACHE_SIZE
 
     _CONFIG_FIELDS = (
         *CharacterConfiguration._CONFIG_FIELDS,
@@ -173,6 +175,7 @@ class AliceConfiguration(CharacterConfiguration):
                  duration_periods: int = None,
                  store_policies: bool = DEFAULT_STORE_POLICIES,
                  store_cards: bool = DEFAULT_STORE_CARDS,
+                 label_key_cache_size: int = DEFAULT_LABEL_KEY_CACHE_SIZE,
                  *args, **kwargs):
 
         super().__init__(*args, **kwargs)
@@ -185,13 +188,15 @@ class AliceConfiguration(CharacterConfiguration):
 
         self.store_policies = store_policies
         self.store_cards = store_cards
+        self.label_key_cache_size = label_key_cache_size
 
     def static_payload(self) -> dict:
         payload = dict(
             m=self.m,
             n=self.n,
             store_policies=self.store_policies,
-            store_cards=self.store_cards
+            store_cards=self.store_cards,
+            label_key_cache_size=self.label_key_cache_size
         )
         if not self.federated_only:
             if self.rate:
@@ -215,6 +220,8 @@ class BobConfiguration(CharacterConfiguration):
     DEFAULT_CONTROLLER_PORT = 7151
     DEFFAULT_STORE_POLICIES = True
     DEFAULT_STORE_CARDS = True
+    DEFAULT_CFRAG_CACHE_NAME = f'{NAME}.cfrags.db'
+    DEFAULT_CFRAG_CACHE_SIZE = 0  # CFrags aren't cached on disk by default
 
     _CONFIG_FIELDS = (
         *CharacterConfiguration._CONFIG_FIELDS,
@@ -225,11 +232,21 @@ class BobConfiguration(CharacterConfiguration):
     def __init__(self,
                  store_policies: bool = DEFFAULT_STORE_POLICIES,
                  store_cards: bool = DEFAULT_STORE_CARDS,
+                 cfrag_cache_filepath: str = None,
+                 cfrag_cache_size: int = DEFAULT_CFRAG_CACHE_SIZE,
                  *args, **kwargs):
+        self.cfrag_cache_filepath = cfrag_cache_filepath or UNINITIALIZED_CONFIGURATION
+        self.cfrag_cache_size = cfrag_cache_size
         super().__init__(*args, **kwargs)
         self.store_policies = store_policies
         self.store_cards = store_cards
 
+    def generate_runtime_filepaths(self, config_root: str) -> dict:
+        base_filepaths = super().generate_runtime_filepaths(config_root=config_root)
+        filepaths = dict(cfrag_cache_filepath=os.path.join(config_root, self.DEFAULT_CFRAG_CACHE_NAME))
+        base_filepaths.update(filepaths)
+        return base_filepaths
+
     def write_keyring(self, password: str, **generation_kwargs) -> NucypherKeyring:
         return super().write_keyring(password=password,
                                      encrypting=True,
@@ -239,7 +256,9 @@ class BobConfiguration(CharacterConfiguration):
     def static_payload(self) -> dict:
         payload = dict(
             store_policies=self.store_policies,
-            store_cards=self.store_cards
+            store_cards=self.store_cards,
+            cfrag_cache_filepath=self.cfrag_cache_filepath,
+            cfrag_cache_size=self.cfrag_cache_size
         )
         return {**super().static_payload(), **payload}
 
@@ -63,6 +63,10 @@ NUCYPHER_SENTRY_ENDPOINT = f"https://{NUCYPHER_SENTRY_PUBLIC_KEY}@sentry.io/{NUC
 CLI_ROOT = NUCYPHER_PACKAGE / 'network' / 'templates'
 TEMPLATES_DIR = CLI_ROOT / 'templates'
 MAX_UPLOAD_CONTENT_LENGTH = 1024 * 50
+TREASURE_MAP_CACHE_SIZE = 1000  # serialized treasure maps kept in memory by each Ursula
+POLICY_CACHE_SIZE = 1000  # on-chain policy lookups kept in memory by each Ursula
+VERIFIED_TREASURE_MAP_CACHE_SIZE = 1000  # treasure map signature checks remembered by each process
+ORIENTED_TREASURE_MAP_CACHE_SIZE = 100  # decrypted treasure maps remembered by each Bob
 
 
 # Dev Mode
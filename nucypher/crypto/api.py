@@ -17,8 +17,9 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 from random import SystemRandom
 
 import datetime
+import os
 import sha3
-from constant_sorrow import constants
+from constant_sorrow import constants, default_constant_splitter
 from cryptography import x509
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
@@ -28,15 +29,20 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurve
 from cryptography.x509 import Certificate
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from cryptography.x509.oid import NameOID
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from eth_utils import is_checksum_address, to_checksum_address
 from ipaddress import IPv4Address
-from typing import Tuple
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
 from umbral import pre
+from umbral.cfrags import CapsuleFrag
+from umbral.config import default_params
 from umbral.keys import UmbralPrivateKey, UmbralPublicKey
-from umbral.signing import Signature
+from umbral.signing import Signature, Signer
 
 from nucypher.crypto.constants import SHA256
 from nucypher.crypto.kits import UmbralMessageKit
@@ -48,6 +54,25 @@ class InvalidNodeCertificate(RuntimeError):
     """Raised when an Ursula's certificate is not valid because it is missing the checksum address."""
 
 
+class UndecryptableMessageKit(ValueError):
+    """Reported by `decrypt_and_verify_batch` for a message kit that can't be opened, or isn't properly signed."""
+
+
+class IncorrectCFrags(UndecryptableMessageKit):
+    """
+    Reported by `decrypt_and_verify_batch` for a message kit with CFrags that fail their correctness proofs;
+    `indices` are the positions of those CFrags among the ones given for the kit.
+    """
+
+    def __init__(self, message: str, indices: List[int]):
+        super().__init__(message)
+        self.indices = indices
+
+    def __reduce__(self):
+        # So that it survives the trip back from the pool.
+        return self.__class__, (self.args[0], self.indices)
+
+
 def secure_random(num_bytes: int) -> bytes:
     """
     Returns an amount `num_bytes` of data from the OS's random device.
@@ -261,3 +286,154 @@ def encrypt_and_sign(recipient_pubkey_enc: UmbralPublicKey,
         message_kit = UmbralMessageKit(ciphertext=ciphertext, capsule=capsule)
 
     return message_kit, signature
+
+
+# The keys of the batch job a pool process last worked on, by their bytes (see `_batch_keys`)
+_cached_batch_keys = None
+
+
+def _batch_keys(key_bytes: Tuple[bytes, ...], load_keys: Callable) -> tuple:
+    """
+    Returns the keys loaded by `load_keys` from `key_bytes`, loading them only on the first batch
+    of a job that each pool process works on.
+    """
+    global _cached_batch_keys
+    if _cached_batch_keys is None or _cached_batch_keys[0] != key_bytes:
+        _cached_batch_keys = key_bytes, load_keys(*key_bytes)
+    return _cached_batch_keys[1]
+
+
+def _load_batch_encryption_keys(recipient_pubkey_bytes: bytes, signing_key_bytes: bytes) -> tuple:
+    from nucypher.crypto.signing import SignatureStamp  # Avoid circular import
+    signing_key = UmbralPrivateKey.from_bytes(signing_key_bytes)
+    stamp = SignatureStamp(verifying_key=signing_key.get_pubkey(), signer=Signer(signing_key))
+    return UmbralPublicKey.from_bytes(recipient_pubkey_bytes), stamp
+
+
+def _encrypt_and_sign_batch(key_bytes: Tuple[bytes, bytes], plaintexts: List[bytes]) -> List[bytes]:
+    recipient_pubkey_enc, stamp = _batch_keys(key_bytes, _load_batch_encryption_keys)
+    return [encrypt_and_sign(recipient_pubkey_enc, plaintext=plaintext, signer=stamp)[0].to_bytes()
+            for plaintext in plaintexts]
+
+
+def encrypt_and_sign_batch(recipient_pubkey_enc: UmbralPublicKey,
+                           plaintexts: Iterable[bytes],
+                           signing_key: UmbralPrivateKey,
+                           processes: int = None,
+                           batch_size: int = 64
+                           ) -> Iterator[bytes]:
+    """
+    Encrypts and signs each of `plaintexts` as `encrypt_and_sign` would, across a pool of `processes`
+    (by default, one per core), and yields the serialized message kits in the order of `plaintexts`.
+
+    Plaintexts are sent to the pool `batch_size` at a time, and only a couple of batches per process
+    are in flight at once, so that arbitrarily long iterables are encrypted in bounded memory.
+    """
+    processes = processes or os.cpu_count() or 1
+    key_bytes = bytes(recipient_pubkey_enc), signing_key.to_bytes()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from _map_batches(executor, _encrypt_and_sign_batch, plaintexts, processes, batch_size,
+                                key_bytes=key_bytes)
+
+
+def _map_batches(executor: ProcessPoolExecutor,
+                 function: Callable[[list], list],
+                 items: Iterable,
+                 processes: int,
+                 batch_size: int,
+                 key_bytes: Tuple[bytes, ...] = None
+                 ) -> Iterator:
+    """
+    Applies `function` to `items` in the pool of `executor`, `batch_size` items at a time, and yields
+    the results in order.  Only a couple of batches per process are in flight at once.
+
+    If given, `key_bytes` are sent along with each batch, as the first argument of `function`.
+    """
+    in_flight = deque()
+    items = iter(items)
+    while True:
+        while len(in_flight) < 2 * processes:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                break
+            args = (batch,) if key_bytes is None else (key_bytes, batch)
+            in_flight.append(executor.submit(function, *args))
+        if not in_flight:
+            return
+        yield from in_flight.popleft().result()
+
+
+def _load_batch_decryption_keys(decrypting_key_bytes: bytes, alice_verifying_key_bytes: bytes) -> tuple:
+    return UmbralPrivateKey.from_bytes(decrypting_key_bytes), UmbralPublicKey.from_bytes(alice_verifying_key_bytes)
+
+
+def _decrypt_and_verify(decrypting_key: UmbralPrivateKey,
+                        alice_verifying_key: UmbralPublicKey,
+                        capsule_bytes: bytes,
+                        ciphertext: bytes,
+                        sender_verifying_key_bytes: bytes,
+                        policy_encrypting_key_bytes: bytes,
+                        cfrags: List[bytes]
+                        ) -> bytes:
+    from nucypher.crypto.signing import signature_splitter  # Avoid circular import
+
+    capsule = pre.Capsule.from_bytes(capsule_bytes, params=default_params())
+    capsule.set_correctness_keys(delegating=UmbralPublicKey.from_bytes(policy_encrypting_key_bytes),
+                                 receiving=decrypting_key.get_pubkey(),
+                                 verifying=alice_verifying_key)
+    incorrect_cfrags = []
+    for index, cfrag in enumerate(cfrags):
+        try:
+            capsule.attach_cfrag(CapsuleFrag.from_bytes(cfrag))  # Verifies the CFrag's correctness proof
+        except pre.UmbralCorrectnessError:
+            incorrect_cfrags.append(index)
+    if incorrect_cfrags:
+        raise IncorrectCFrags(f"CFrags {incorrect_cfrags} failed their correctness proofs", indices=incorrect_cfrags)
+    cleartext = pre.decrypt(ciphertext=ciphertext, capsule=capsule, decrypting_key=decrypting_key)
+
+    sig_header, cleartext = default_constant_splitter(cleartext, return_remainder=True)
+    if sig_header != constants.SIGNATURE_TO_FOLLOW:
+        raise UndecryptableMessageKit(f"Expected the signature to follow in the cleartext, got {sig_header}")
+    signature, cleartext = signature_splitter(cleartext, return_remainder=True)
+    if not signature.verify(cleartext, UmbralPublicKey.from_bytes(sender_verifying_key_bytes)):
+        raise UndecryptableMessageKit(f"Signature for message isn't valid: {signature}")
+    return cleartext
+
+
+def _decrypt_and_verify_batch(key_bytes: Tuple[bytes, bytes],
+                              message_kits: List[tuple]
+                              ) -> List[Union[bytes, UndecryptableMessageKit]]:
+    decrypting_key, alice_verifying_key = _batch_keys(key_bytes, _load_batch_decryption_keys)
+    results = []
+    for message_kit in message_kits:
+        try:
+            results.append(_decrypt_and_verify(decrypting_key, alice_verifying_key, *message_kit))
+        except UndecryptableMessageKit as e:
+            results.append(e)
+        except Exception as e:
+            # Umbral's exceptions can hold CFrags, which don't survive the trip back from the pool.
+            results.append(UndecryptableMessageKit(f"{e.__class__.__name__}: {e}"))
+    return results
+
+
+def decrypt_and_verify_batch(decrypting_key: UmbralPrivateKey,
+                             alice_verifying_key: UmbralPublicKey,
+                             message_kits: Iterable[Tuple[bytes, bytes, bytes, bytes, List[bytes]]],
+                             processes: int = None,
+                             batch_size: int = 64
+                             ) -> Iterator[Union[bytes, UndecryptableMessageKit]]:
+    """
+    Opens re-encrypted message kits across a pool of `processes` (by default, one per core):
+    each one's CFrags are checked against their correctness proofs and attached to its capsule,
+    then its ciphertext is decrypted, and its signature checked against its sender's verifying key.
+
+    Each of `message_kits` is given as the bytes of its capsule, its ciphertext, its sender's verifying key,
+    its policy encrypting key, and its CFrags.  The cleartexts are yielded in the order of `message_kits`,
+    along with an `UndecryptableMessageKit` in place of each kit that couldn't be opened or verified;
+    for kits with incorrect CFrags, it's an `IncorrectCFrags` that tells which of them.
+    """
+    processes = processes or os.cpu_count() or 1
+    key_bytes = decrypting_key.to_bytes(), bytes(alice_verifying_key)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from _map_batches(executor, _decrypt_and_verify_batch, message_kits, processes, batch_size,
+                                key_bytes=key_bytes)
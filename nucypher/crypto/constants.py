@@ -31,3 +31,8 @@ BLAKE2B = hashes.BLAKE2b(64)
 # SECP256K1
 CAPSULE_LENGTH = 98
 PUBLIC_KEY_LENGTH = 33
+
+# Streams
+AEAD_TAG_LENGTH = 16
+STREAM_CHUNK_SIZE_LENGTH = 4
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
@@ -17,8 +17,11 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 
 import inspect
+from contextlib import contextmanager
+from cryptography.hazmat.backends.openssl import backend
 from hexbytes import HexBytes
-from typing import List, Optional, Tuple
+from threading import RLock
+from typing import Iterator, List, Optional, Tuple
 from umbral import pre
 from umbral.keys import UmbralKeyingMaterial, UmbralPrivateKey, UmbralPublicKey
 
@@ -28,6 +31,7 @@ from nucypher.blockchain.eth.signers.software import Web3Signer
 from nucypher.blockchain.eth.signers.base import Signer
 from nucypher.crypto import keypairs
 from nucypher.crypto.keypairs import DecryptingKeypair, SigningKeypair
+from nucypher.utilities.cache import LRUCache
 
 
 class PowerUpError(TypeError):
@@ -267,22 +271,84 @@ class DerivedKeyBasedPower(CryptoPowerUp):
     """
 
 
+class _LabelKey:
+    """
+    A private key derived from a label, and the number of callers currently using it.
+    """
+
+    def __init__(self, private_key: UmbralPrivateKey):
+        self.private_key = private_key
+        self.leases = 0
+        self.evicted = False
+
+    def zeroize(self) -> None:
+        # Overwrite the key's BIGNUM in place (a - a), rather than wait for the garbage collector to free it.
+        bignum = self.private_key.bn_key.bignum
+        backend._lib.BN_sub(bignum, bignum, bignum)
+
+
 class DelegatingPower(DerivedKeyBasedPower):
 
+    DEFAULT_LABEL_KEY_CACHE_SIZE = 64
+
     def __init__(self,
                  keying_material: Optional[bytes] = None,
-                 password: Optional[bytes] = None) -> None:
+                 password: Optional[bytes] = None,
+                 label_key_cache_size: int = DEFAULT_LABEL_KEY_CACHE_SIZE) -> None:
         if keying_material is None:
             self.__umbral_keying_material = UmbralKeyingMaterial()
         else:
             self.__umbral_keying_material = UmbralKeyingMaterial.from_bytes(key_bytes=keying_material,
                                                                             password=password)
+        self.__label_keys_lock = RLock()
+        self.__label_keys = None
+        self.set_label_key_cache_size(label_key_cache_size)
+
+    def set_label_key_cache_size(self, size: int) -> None:
+        """
+        Keeps the private keys of up to `size` recently used labels in memory, instead of deriving them
+        on every use; a size of 0 disables the cache.  Keys are zeroized as soon as they are evicted
+        and no longer in use.
+        """
+        if size < 0:
+            raise ValueError(f"The label key cache size can't be negative, got {size}")
+        with self.__label_keys_lock:
+            if self.__label_keys is not None:
+                self.__label_keys.clear()
+            self.__label_keys = LRUCache(maxsize=size, on_evict=self.__evict_label_key) if size else None
+
+    def __evict_label_key(self, label: bytes, label_key: _LabelKey) -> None:
+        with self.__label_keys_lock:
+            label_key.evicted = True
+            if not label_key.leases:
+                label_key.zeroize()
+
+    @contextmanager
+    def _label_privkey(self, label: bytes) -> Iterator[UmbralPrivateKey]:
+        """Lends out the private key derived from `label` for the duration of the context."""
+        with self.__label_keys_lock:
+            label_key = self.__label_keys.get(label) if self.__label_keys is not None else None
+            if label_key is None:
+                label_key = _LabelKey(self.__umbral_keying_material.derive_privkey_by_label(label))
+                if self.__label_keys is not None:
+                    self.__label_keys[label] = label_key
+                else:
+                    label_key.evicted = True
+            label_key.leases += 1
+        try:
+            yield label_key.private_key
+        finally:
+            with self.__label_keys_lock:
+                label_key.leases -= 1
+                if label_key.evicted and not label_key.leases:
+                    label_key.zeroize()
 
     def _get_privkey_from_label(self, label):
         return self.__umbral_keying_material.derive_privkey_by_label(label)
 
     def get_pubkey_from_label(self, label):
-        return self._get_privkey_from_label(label).get_pubkey()
+        with self._label_privkey(label) as private_key:
+            return private_key.get_pubkey()
 
     def generate_kfrags(self,
                         bob_pubkey_enc,
@@ -301,18 +367,19 @@ class DelegatingPower(DerivedKeyBasedPower):
         :param n: Total number of KFrags to generate
         """
 
-        __private_key = self._get_privkey_from_label(label)
-        kfrags = pre.generate_kfrags(delegating_privkey=__private_key,
-                                     receiving_pubkey=bob_pubkey_enc,
-                                     threshold=m,
-                                     N=n,
-                                     signer=signer,
-                                     sign_delegating_key=False,
-                                     sign_receiving_key=False,
-                                     )
-        return __private_key.get_pubkey(), kfrags
+        with self._label_privkey(label) as __private_key:
+            kfrags = pre.generate_kfrags(delegating_privkey=__private_key,
+                                         receiving_pubkey=bob_pubkey_enc,
+                                         threshold=m,
+                                         N=n,
+                                         signer=signer,
+                                         sign_delegating_key=False,
+                                         sign_receiving_key=False,
+                                         )
+            return __private_key.get_pubkey(), kfrags
 
     def get_decrypting_power_from_label(self, label):
+        # The decrypting power outlives this call, so it gets its own copy of the key rather than a cached one.
         label_privkey = self._get_privkey_from_label(label)
         label_keypair = keypairs.DecryptingKeypair(private_key=label_privkey)
         decrypting_power = DecryptingPower(keypair=label_keypair)
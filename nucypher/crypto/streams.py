@@ -0,0 +1,148 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Encryption of arbitrarily large payloads in constant memory.
+
+A stream starts with a header: the length-prefixed bytes of a message kit carrying the
+stream's chunk size and its symmetric key, encrypted for the policy like any other message.
+The payload follows, cut into chunks of `chunk_size` bytes (the last one possibly shorter,
+and empty only for an empty payload), each encrypted with ChaCha20-Poly1305 under the stream key.
+
+Each chunk's nonce is its position in the stream, plus a flag marking the final chunk, so
+chunks that are reordered, dropped or truncated from the end of the stream fail to decrypt.
+"""
+
+import os
+from bytestring_splitter import VARIABLE_HEADER_LENGTH, VariableLengthBytestring
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from typing import BinaryIO, Iterator, Tuple, Union
+from umbral.dem import DEM_KEYSIZE, DEM_NONCE_SIZE
+
+from nucypher.crypto.constants import AEAD_TAG_LENGTH, STREAM_CHUNK_SIZE_LENGTH
+from nucypher.crypto.kits import UmbralMessageKit
+
+
+class InvalidStream(ValueError):
+    """Raised when a stream is malformed, truncated, or fails to authenticate."""
+
+
+def generate_stream_key(chunk_size: int) -> bytes:
+    """Returns the plaintext of a new stream's header: its chunk size, followed by a random key."""
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, got {chunk_size}")
+    return chunk_size.to_bytes(STREAM_CHUNK_SIZE_LENGTH, 'big') + os.urandom(DEM_KEYSIZE)
+
+
+def split_stream_key(stream_key: bytes) -> Tuple[int, bytes]:
+    if len(stream_key) != STREAM_CHUNK_SIZE_LENGTH + DEM_KEYSIZE:
+        raise InvalidStream(f"Expected a stream key of {STREAM_CHUNK_SIZE_LENGTH + DEM_KEYSIZE} bytes, "
+                            f"got {len(stream_key)}")
+    chunk_size = int.from_bytes(stream_key[:STREAM_CHUNK_SIZE_LENGTH], 'big')
+    return chunk_size, stream_key[STREAM_CHUNK_SIZE_LENGTH:]
+
+
+def write_message_kit(stream: BinaryIO, message_kit: Union[UmbralMessageKit, bytes]) -> None:
+    """Writes a message kit to `stream`, prefixed with its length."""
+    if isinstance(message_kit, UmbralMessageKit):
+        message_kit = message_kit.to_bytes()
+    stream.write(bytes(VariableLengthBytestring(message_kit)))
+
+
+def read_message_kit(stream: BinaryIO) -> UmbralMessageKit:
+    """Reads the next length-prefixed message kit from `stream`."""
+    kit_length = _read_exactly(stream, VARIABLE_HEADER_LENGTH)
+    return UmbralMessageKit.from_bytes(_read_exactly(stream, int.from_bytes(kit_length, 'big')))
+
+
+def read_message_kits(stream: BinaryIO) -> Iterator[UmbralMessageKit]:
+    """Reads length-prefixed message kits from `stream` until it ends."""
+    while True:
+        kit_length = _read_chunk(stream, VARIABLE_HEADER_LENGTH)
+        if not kit_length:
+            return
+        if len(kit_length) != VARIABLE_HEADER_LENGTH:
+            raise InvalidStream("The stream ended early, in the length of a message kit")
+        yield UmbralMessageKit.from_bytes(_read_exactly(stream, int.from_bytes(kit_length, 'big')))
+
+
+write_stream_header = write_message_kit
+read_stream_header = read_message_kit
+
+
+def encrypt_chunks(stream_key: bytes, plaintext: BinaryIO, ciphertext: BinaryIO) -> int:
+    """Encrypts `plaintext` into `ciphertext`, one chunk at a time.  Returns the number of plaintext bytes."""
+    chunk_size, key = split_stream_key(stream_key)
+    cipher = ChaCha20Poly1305(key)
+    total = 0
+    for index, (chunk, last) in enumerate(_chunks(plaintext, chunk_size)):
+        ciphertext.write(cipher.encrypt(_chunk_nonce(index, last), chunk, None))
+        total += len(chunk)
+    return total
+
+
+def decrypt_chunks(stream_key: bytes, ciphertext: BinaryIO, plaintext: BinaryIO) -> int:
+    """Decrypts the chunks of `ciphertext` into `plaintext`.  Returns the number of plaintext bytes."""
+    chunk_size, key = split_stream_key(stream_key)
+    cipher = ChaCha20Poly1305(key)
+    total = 0
+    for index, (chunk, last) in enumerate(_chunks(ciphertext, chunk_size + AEAD_TAG_LENGTH)):
+        try:
+            cleartext = cipher.decrypt(_chunk_nonce(index, last), chunk, None)
+        except InvalidTag:
+            raise InvalidStream(f"Chunk {index} of the stream failed to authenticate")
+        plaintext.write(cleartext)
+        total += len(cleartext)
+    return total
+
+
+def _chunk_nonce(index: int, last: bool) -> bytes:
+    return index.to_bytes(DEM_NONCE_SIZE - 1, 'big') + (b'\x01' if last else b'\x00')
+
+
+def _chunks(stream: BinaryIO, chunk_size: int) -> Iterator[Tuple[bytes, bool]]:
+    """
+    Yields the chunks of `stream`, each along with whether it's the last one.
+    There's always at least one chunk, even if empty, so that the end of the stream is marked.
+    """
+    chunk = _read_chunk(stream, chunk_size)
+    while True:
+        next_chunk = _read_chunk(stream, chunk_size) if len(chunk) == chunk_size else b''
+        last = not next_chunk
+        yield chunk, last
+        if last:
+            return
+        chunk = next_chunk
+
+
+def _read_chunk(stream: BinaryIO, size: int) -> bytes:
+    # File-like objects such as sockets and pipes may return less than asked for before the end of the stream.
+    chunk = stream.read(size)
+    while chunk and len(chunk) < size:
+        more = stream.read(size - len(chunk))
+        if not more:
+            break
+        chunk += more
+    return chunk
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = _read_chunk(stream, size)
+    if len(data) != size:
+        raise InvalidStream(f"The stream ended early: expected {size} bytes, got {len(data)}")
+    return data
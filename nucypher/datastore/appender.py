@@ -0,0 +1,133 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from threading import Event, Lock
+from typing import Any, Dict, Type, Union
+
+from nucypher.datastore.base import DatastoreRecord
+from nucypher.datastore.datastore import Datastore, DatastoreTransactionError
+
+
+class _PendingWrite:
+
+    def __init__(self, record_type: Type['DatastoreRecord'], record_id: Union[int, str], fields: Dict[str, Any]):
+        self.record_type = record_type
+        self.record_id = record_id
+        self.fields = fields
+        self.error = None
+
+    def as_tuple(self):
+        return self.record_type, self.record_id, self.fields
+
+
+class _Batch:
+
+    def __init__(self):
+        self.writes = []
+        self.full = Event()
+        self.committed = Event()
+
+
+class RecordAppender:
+    """
+    Coalesces new records written by concurrent callers into group commits.
+
+    LMDB serializes its writers, and every committed write transaction is
+    synced to disk. Rather than having each caller open its own transaction,
+    the first caller to arrive at an empty batch becomes its leader. The leader
+    waits for the previous batch to finish committing (and, optionally, up to
+    `max_delay` seconds), then commits every record that joined its batch
+    in the meantime - at most `max_batch_size` - in a single transaction.
+    Every caller, leader or not, is only unblocked once the transaction
+    containing its own record has been committed.
+
+    An uncontended caller commits right away, while under load batches grow
+    naturally for as long as the previous commit takes.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 64
+    DEFAULT_MAX_DELAY = 0  # seconds
+
+    def __init__(self,
+                 datastore: Datastore,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {max_batch_size}")
+        self.datastore = datastore
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self._lock = Lock()
+        self._commit_lock = Lock()
+        self._open_batch = None
+
+    def append(self, record_type: Type['DatastoreRecord'], record_id: Union[int, str], **fields) -> None:
+        """
+        Writes a new record with the given `fields` and blocks until it has
+        been committed to the datastore.
+
+        Raises `DatastoreTransactionError` if this record couldn't be written;
+        records from other callers in the same batch are not affected.
+        """
+        pending_write = _PendingWrite(record_type=record_type, record_id=record_id, fields=fields)
+
+        with self._lock:
+            batch = self._open_batch
+            is_leader = batch is None
+            if is_leader:
+                batch = self._open_batch = _Batch()
+            batch.writes.append(pending_write)
+            if len(batch.writes) >= self.max_batch_size:
+                # No more room in this batch; the next caller starts a new one.
+                self._open_batch = None
+                batch.full.set()
+
+        if is_leader:
+            if self.max_delay:
+                batch.full.wait(timeout=self.max_delay)
+            with self._commit_lock:
+                with self._lock:
+                    if self._open_batch is batch:
+                        self._open_batch = None
+                self._commit(batch)
+        else:
+            batch.committed.wait()
+
+        if pending_write.error is not None:
+            raise pending_write.error
+
+    def _commit(self, batch: _Batch) -> None:
+        try:
+            self.datastore.write_records(write.as_tuple() for write in batch.writes)
+        except DatastoreTransactionError:
+            # Some record of the batch is invalid, and the whole transaction was aborted.
+            # Fall back to committing records one by one, so that only the offending callers get the error.
+            for index, write in enumerate(batch.writes):
+                try:
+                    self.datastore.write_records([write.as_tuple()])
+                except DatastoreTransactionError as e:
+                    write.error = e
+                except Exception as e:
+                    # Not this record's fault; the records not committed yet can't be either.
+                    for uncommitted_write in batch.writes[index:]:
+                        uncommitted_write.error = e
+                    break
+        except Exception as e:
+            for write in batch.writes:
+                write.error = e
+        finally:
+            batch.committed.set()
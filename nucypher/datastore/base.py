@@ -15,7 +15,12 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import msgpack
-from typing import Any, Callable, Iterable, NamedTuple, Union
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+
+# Version of the packed record layout, stored as the header of every packed record.
+PACKED_RECORD_VERSION = 1
+PACKED_RECORD_HEADER_LENGTH = 2
 
 
 class DBWriteError(Exception):
@@ -51,11 +56,58 @@ class RecordField(NamedTuple):
     decode: Callable[[bytes], Any] = lambda field: field
 
 
+def pack_record_fields(fields: Dict[str, bytes]) -> bytes:
+    """
+    Serializes the msgpack'd field values of a record into a single packed
+    value, prefixed with a header holding the version of the packed layout.
+    """
+    header = PACKED_RECORD_VERSION.to_bytes(PACKED_RECORD_HEADER_LENGTH, 'big')
+    return header + msgpack.packb(fields)
+
+
+def unpack_record_fields(packed_record: bytes) -> Dict[str, bytes]:
+    """
+    Deserializes a packed value into a dict of the record's field names and
+    their msgpack'd values. The field values themselves are left encoded, so
+    that each of them is only decoded when it's accessed.
+    """
+    header, packed_fields = packed_record[:PACKED_RECORD_HEADER_LENGTH], packed_record[PACKED_RECORD_HEADER_LENGTH:]
+    version = int.from_bytes(header, 'big')
+    if version != PACKED_RECORD_VERSION:
+        raise TypeError(f"Unsupported packed record version {version}; expected {PACKED_RECORD_VERSION}")
+    return msgpack.unpackb(packed_fields)
+
+
 class DatastoreRecord:
+    """
+    A record in the datastore, made of the `RecordField`s defined on the class
+    as `_{field_name}` attributes.
+
+    By default, every field of a record is stored under its own key
+    (`RecordType:field:record_id`). Subclasses can instead declare the packed
+    layout with `class MyRecord(DatastoreRecord, packed=True)`, which stores
+    all of the fields of a record as one packed value under a single key
+    (`RecordType::record_id`). Records of a packed type that are still stored
+    field by field remain readable, and are converted to the packed layout on
+    their next write (see `DatastoreRecord.repack`).
+
+    Writes to the fields of a packed record are buffered on the record, and
+    written under its key at once by `DatastoreRecord.flush`, which the
+    `Datastore` calls when the transaction of the record is over.
+    """
+
+    __packed = False
+
+    def __init_subclass__(cls, packed: Optional[bool] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if packed is not None:
+            cls.__packed = packed
+
     def __new__(cls, *args, **kwargs):
         # Set default class attributes for the new instance
         cls.__writeable = None
         cls.__storagekey = f'{cls.__name__}:{{record_field}}:{{record_id}}'
+        cls.__packedkey = f'{cls.__name__}::{{record_id}}'
         return super().__new__(cls)
 
     def __init__(self,
@@ -64,6 +116,8 @@ class DatastoreRecord:
                  writeable: bool = False) -> None:
         self._record_id = record_id
         self.__db_transaction = db_transaction
+        self.__packed_fields = None
+        self.__packed_fields_changed = False
         self.__writeable = writeable
 
     def __setattr__(self, attr: str, value: Any) -> None:
@@ -137,6 +191,15 @@ class DatastoreRecord:
         Retrieves a raw record, as bytes, from the database given a `record_field`.
         If the record doesn't exist, this method raises an `AttributeError`.
         """
+        if self.__packed:
+            packed_fields = self.__read_packed_fields()
+            if packed_fields is not None:
+                try:
+                    return packed_fields[record_field]
+                except KeyError:
+                    raise AttributeError(f"No {record_field} record found for ID: {self._record_id}.")
+            # Otherwise, this record hasn't been packed yet, so we read it field by field.
+
         key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
         field_value = self.__db_transaction.get(key, default=None)
         if field_value is None:
@@ -149,6 +212,12 @@ class DatastoreRecord:
         and a `value`.
         If the record is unable to be written, this method raises a `DBWriteError`.
         """
+        if self.__packed:
+            packed_fields = self.__read_packed_fields_for_update()
+            packed_fields[record_field] = value
+            self.__dict__['_DatastoreRecord__packed_fields_changed'] = True
+            return
+
         key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
         if not self.__db_transaction.put(key, value, overwrite=True):
             raise DBWriteError(f"Couldn't write the record (key: {key}) to the database.")
@@ -157,11 +226,76 @@ class DatastoreRecord:
         """
         Deletes the record from the datastore.
         """
+        if self.__packed:
+            packed_fields = self.__read_packed_fields_for_update()
+            packed_fields.pop(record_field, None)
+            self.__dict__['_DatastoreRecord__packed_fields_changed'] = True
+            return
+
         key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
+        self.__delete_key(key)
+
+    def __delete_key(self, key: bytes) -> None:
         if not self.__db_transaction.delete(key) and self.__db_transaction.get(key) is not None:
             # We do this check to ensure that the key was actually deleted.
             raise DBWriteError(f"Couldn't delete the record (key: {key}) from the database.")
 
+    def __read_packed_fields(self) -> Optional[Dict[str, bytes]]:
+        """
+        Returns the unpacked fields of a packed record, reading them from the
+        database only once per record instance.
+        If the record isn't stored in the packed layout, this returns `None`.
+        """
+        if self.__packed_fields is None:
+            key = self.__packedkey.format(record_id=self._record_id).encode()
+            packed_record = self.__db_transaction.get(key, default=None)
+            if packed_record is None:
+                return None
+            # Bypass `__setattr__`, which would attempt to write a field.
+            self.__dict__['_DatastoreRecord__packed_fields'] = unpack_record_fields(packed_record)
+        return self.__packed_fields
+
+    def __read_packed_fields_for_update(self) -> Dict[str, bytes]:
+        """
+        Returns the unpacked fields of a packed record, to be modified and
+        written back with `__write_packed_fields`.
+        If the record is still stored field by field, its fields are collected
+        and their keys are deleted, so that the record is converted to the
+        packed layout when it's written back.
+        """
+        packed_fields = self.__read_packed_fields()
+        if packed_fields is None:
+            packed_fields = self.__pop_unpacked_fields(packed_fields=dict())
+            self.__dict__['_DatastoreRecord__packed_fields'] = packed_fields
+        return packed_fields
+
+    def __pop_unpacked_fields(self, packed_fields: Dict[str, bytes]) -> Dict[str, bytes]:
+        """
+        Moves the fields of this record that are stored under their own keys
+        into `packed_fields`, without overwriting the fields already there.
+        """
+        for record_field in self.__record_field_names():
+            key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
+            field_value = self.__db_transaction.get(key, default=None)
+            if field_value is not None:
+                packed_fields.setdefault(record_field, field_value)
+                self.__delete_key(key)
+        return packed_fields
+
+    def __write_packed_fields(self, packed_fields: Dict[str, bytes]) -> None:
+        """
+        Writes the fields of a packed record under its single key, or deletes
+        the key if the record has no fields left.
+        """
+        key = self.__packedkey.format(record_id=self._record_id).encode()
+        if not packed_fields:
+            return self.__delete_key(key)
+        if not self.__db_transaction.put(key, pack_record_fields(packed_fields), overwrite=True):
+            raise DBWriteError(f"Couldn't write the record (key: {key}) to the database.")
+
+    def __record_field_names(self) -> List[str]:
+        return [class_var[1:] for class_var, value in type(self).__dict__.items() if type(value) == RecordField]
+
     def __get_record_field(self, attr: str) -> 'RecordField':
         """
         Uses `getattr` to return the `RecordField` object for a given
@@ -210,3 +344,33 @@ class DatastoreRecord:
         for class_var in type(self).__dict__:
             if type(type(self).__dict__[class_var]) == RecordField:
                 setattr(self, class_var[1:], None)
+
+    def repack(self) -> None:
+        """
+        Converts a record of a packed record type that is still stored field
+        by field into the packed layout.
+        Fields found under their own keys are folded into an existing packed
+        value, unless the packed value already holds them.
+        """
+        if not self.__packed:
+            raise TypeError(f"{type(self).__name__} records aren't stored in the packed layout.")
+        if not self.__writeable:
+            raise TypeError("This datastore record isn't writeable.")
+        packed_fields = self.__read_packed_fields()
+        if packed_fields is None:
+            packed_fields = self.__read_packed_fields_for_update()
+        else:
+            self.__pop_unpacked_fields(packed_fields=packed_fields)
+        self.__dict__['_DatastoreRecord__packed_fields_changed'] = True
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered field writes of a packed record to the datastore,
+        re-packing the record only once however many of its fields were set.
+        This does nothing if none of its fields were set since the last flush.
+        If the record is unable to be written, this raises a `DBWriteError`.
+        """
+        if self.__packed_fields_changed:
+            self.__write_packed_fields(self.__packed_fields)
+            self.__dict__['_DatastoreRecord__packed_fields_changed'] = False
@@ -0,0 +1,139 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import datetime
+import maya
+from eth_utils import to_canonical_address
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+from umbral.cfrags import CapsuleFrag
+from umbral.pre import Capsule
+
+from nucypher.crypto.api import keccak_digest
+from nucypher.datastore.datastore import Datastore, RecordNotFound
+from nucypher.datastore.models import CachedCFrag
+
+
+class CFragCache:
+    """
+    Keeps the CFrags that Bob received from Ursulas in a `Datastore`, so that they
+    outlive the process which requested them.
+
+    A CFrag is cached for a capsule, the Ursula that re-encrypted it, and the arrangement
+    it was re-encrypted under (which identifies the policy), until the expiration of the
+    policy, or for `ttl` if it isn't known.  Once the cache holds more than `max_entries`
+    CFrags, expired ones are pruned, followed by the oldest ones.
+    """
+
+    DEFAULT_MAX_ENTRIES = 10_000
+    DEFAULT_TTL = datetime.timedelta(days=1)
+
+    # When the cache is full, this fraction of it is evicted at once, so that pruning isn't done on every write.
+    _EVICTION_FRACTION = 0.1
+
+    def __init__(self,
+                 datastore: Datastore,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: datetime.timedelta = DEFAULT_TTL):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.datastore = datastore
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = Lock()
+        self._entries: Optional[int] = None  # Counted on first use
+
+    @staticmethod
+    def _record_id(capsule: Capsule, node_id: str, arrangement_id: bytes) -> str:
+        return keccak_digest(bytes(capsule), to_canonical_address(node_id), arrangement_id).hex()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._count()
+            return self._entries
+
+    def _count(self) -> int:
+        with self.datastore.stream_by(CachedCFrag) as records:
+            return sum(1 for _record in records)
+
+    def cfrags(self,
+               capsule: Capsule,
+               destinations: Iterable[Tuple[str, bytes]],
+               now: maya.MayaDT = None
+               ) -> List[CapsuleFrag]:
+        """
+        Returns the unexpired cached CFrags for `capsule` from the `destinations` of a treasure map,
+        given as pairs of node IDs and arrangement IDs.
+        """
+        now = now or maya.now()
+        cfrags = []
+        for node_id, arrangement_id in destinations:
+            try:
+                with self.datastore.describe(CachedCFrag, self._record_id(capsule, node_id, arrangement_id)) as record:
+                    if record.expiration > now:
+                        cfrags.append(record.cfrag)
+            except RecordNotFound:
+                continue
+        return cfrags
+
+    def save_work_order(self, work_order: 'WorkOrder', expiration: maya.MayaDT = None) -> None:
+        """Caches the CFrags of a completed `work_order`, until `expiration`."""
+        now = maya.now()
+        expiration = expiration or now + self.ttl
+        node_id = work_order.ursula.checksum_address
+        records = [(CachedCFrag,
+                    self._record_id(capsule, node_id, work_order.arrangement_id),
+                    dict(cfrag=task.cfrag, expiration=expiration, cached_at=now))
+                   for capsule, task in work_order.tasks.items()]
+
+        with self._lock:
+            self.datastore.write_records(records)
+            if self._entries is None:
+                self._entries = self._count()
+            else:
+                self._entries += len(records)  # Overwritten records are counted again, until the next pruning.
+            if self._entries > self.max_entries:
+                self._prune(now=now, max_entries=int(self.max_entries * (1 - self._EVICTION_FRACTION)))
+
+    def prune(self, now: maya.MayaDT = None) -> int:
+        """Deletes the expired CFrags, and the oldest ones beyond `max_entries`.  Returns the number deleted."""
+        with self._lock:
+            return self._prune(now=now or maya.now(), max_entries=self.max_entries)
+
+    def _prune(self, now: maya.MayaDT, max_entries: int) -> int:
+        try:
+            with self.datastore.query_by(CachedCFrag, writeable=True) as records:
+                unexpired = []
+                for record in records:
+                    if record.expiration <= now:
+                        record.delete()
+                    else:
+                        # MayaDTs only compare to the second, so records are ordered by their datetimes.
+                        unexpired.append((record.cached_at.datetime(), record))
+                pruned = len(records) - len(unexpired)
+
+                unexpired.sort(key=lambda entry: entry[0])
+                evicted = unexpired[:max(0, len(unexpired) - max_entries)]
+                for _cached_at, record in evicted:
+                    record.delete()
+        except RecordNotFound:
+            self._entries = 0
+            return 0
+
+        self._entries = len(unexpired) - len(evicted)
+        return pruned + len(evicted)
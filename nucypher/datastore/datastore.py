@@ -16,9 +16,10 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import lmdb
 import maya
+import weakref
 from contextlib import contextmanager, suppress
 from functools import partial
-from typing import Any, Callable, List, NamedTuple, Optional, Type, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type, Union
 
 from bytestring_splitter import BytestringSplitter
 from nucypher.crypto.signing import Signature
@@ -40,6 +41,16 @@ class DatastoreTransactionError(Exception):
     pass
 
 
+def _seal_record(record: 'DatastoreRecord') -> None:
+    """
+    Ensures that a record can't be used to read from or write to the datastore
+    once its transaction is over.
+    """
+    record.__dict__['_DatastoreRecord__writeable'] = False
+    record.__dict__['_DatastoreRecord__packed_fields'] = None
+    record.__dict__['_DatastoreRecord__packed_fields_changed'] = False
+
+
 class DatastoreKey(NamedTuple):
     """
     Used for managing keys when querying the datastore.
@@ -126,6 +137,7 @@ class Datastore:
             record = record_type(datastore_tx, record_id, writeable=writeable)
             try:
                 yield record
+                record.flush()
             except (AttributeError, TypeError, DBWriteError) as tx_err:
                 # Handle `RecordNotFound` cases when `writeable` is `False`.
                 if not writeable and isinstance(tx_err, AttributeError):
@@ -133,7 +145,101 @@ class Datastore:
                 raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
             finally:
                 # Now we ensure that the record is not writeable
-                record.__dict__['_DatastoreRecord__writeable'] = False
+                _seal_record(record)
+
+    def write_records(self,
+                      records: Iterable[Tuple[Type['DatastoreRecord'], Union[int, str], Dict[str, Any]]]
+                      ) -> None:
+        """
+        Writes several records to the datastore within a single write
+        transaction, so that they are committed (and synced to disk) together.
+
+        Each entry in `records` is a tuple of the `record_type`, the
+        `record_id`, and a dict mapping field names to the values to write.
+
+        The write is atomic: if any of the records can't be written, the
+        transaction is aborted, no data is written, and a
+        `DatastoreTransactionError` is raised.
+        """
+        with self.__db_env.begin(write=True) as datastore_tx:
+            written_records = []
+            try:
+                for record_type, record_id, fields in records:
+                    with suppress(ValueError):
+                        # If the ID can be converted to an int, we do it.
+                        record_id = int(record_id)
+                    record = record_type(datastore_tx, record_id, writeable=True)
+                    written_records.append(record)
+                    for field_name, field_value in fields.items():
+                        setattr(record, field_name, field_value)
+                    record.flush()
+            except (AttributeError, TypeError, DBWriteError) as tx_err:
+                raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
+            finally:
+                for record in written_records:
+                    _seal_record(record)
+
+    def migrate_records(self,
+                        record_type: Type['DatastoreRecord'],
+                        batch_size: int = 100,
+                        max_records: Optional[int] = None
+                        ) -> int:
+        """
+        Converts the records of a packed `record_type` that are still stored
+        field by field into the packed layout, and returns the number of
+        records converted.
+
+        The migration is performed online: the unpacked records are looked for
+        in a read transaction, then converted in batches of `batch_size`, each
+        in its own write transaction, so the datastore remains usable while a
+        migration is under way. Reading and writing
+        records of a packed type work for records in either layout.
+
+        An optional `max_records` bounds the number of records converted by
+        this call, so that a large store can be migrated incrementally.
+        """
+        if not record_type._DatastoreRecord__packed:
+            raise TypeError(f"{record_type.__name__} records aren't stored in the packed layout.")
+
+        type_prefix = f'{record_type.__name__}:'.encode()
+        # Packed keys (`RecordType::record_id`) sort before the per-field keys (`RecordType:field:record_id`),
+        # so the scan for unpacked records starts right after them, and each batch resumes where the last one stopped.
+        resume_key = f'{record_type.__name__}:;'.encode()
+        migrated = 0
+        while max_records is None or migrated < max_records:
+            limit = batch_size if max_records is None else min(batch_size, max_records - migrated)
+            unpacked_record_ids = []
+            with self.__db_env.begin() as datastore_tx:
+                db_cursor = datastore_tx.cursor()
+                if db_cursor.set_range(resume_key):
+                    for db_key in db_cursor.iternext(keys=True, values=False):
+                        if not db_key.startswith(type_prefix):
+                            break
+                        resume_key = db_key
+                        record_id = DatastoreKey.from_bytestring(db_key).record_id
+                        if record_id not in unpacked_record_ids:
+                            unpacked_record_ids.append(record_id)
+                            if len(unpacked_record_ids) == limit:
+                                break
+            if not unpacked_record_ids:
+                break
+
+            # Records written or deleted since the scan are repacked harmlessly.
+            with self.__db_env.begin(write=True) as datastore_tx:
+                for record_id in unpacked_record_ids:
+                    record = record_type(datastore_tx, record_id, writeable=True)
+                    try:
+                        record.repack()
+                    except DBWriteError as tx_err:
+                        raise DatastoreTransactionError(f'An error was encountered during the migration: {tx_err}')
+                    finally:
+                        _seal_record(record)
+
+            migrated += len(unpacked_record_ids)
+            if len(unpacked_record_ids) < limit:
+                break
+
+        return migrated
 
     @contextmanager
     def query_by(self,
@@ -159,77 +265,161 @@ class Datastore:
 
         If records can't be found, this method will raise `RecordNotFound`.
         """
-        valid_records = set()
-        with self.__db_env.begin(write=writeable) as datastore_tx:
-            db_cursor = datastore_tx.cursor()
-
-            # Set the cursor to the closest key (if it exists) by the query params.
-            #
-            # By providing a `filter_field`, the query will immediately be
-            # limited to the subset of keys for the `filter_field`.
-            query_key = f'{record_type.__name__}:{filter_field}'.encode()
-            if not db_cursor.set_range(query_key):
-                # The cursor couldn't identify any records by the key
-                raise RecordNotFound(f"No records exist for the key from the specified query parameters: '{query_key}'")
-
-            # Check if the record at the cursor is valid for the query
-            curr_key = DatastoreKey.from_bytestring(db_cursor.key())
-            if not curr_key.compare_key(query_key):
+        query_key = f'{record_type.__name__}:{filter_field}'
+        with self.stream_by(record_type=record_type,
+                            filter_func=filter_func,
+                            filter_field=filter_field,
+                            writeable=writeable) as records:
+            valid_records = list(records)
+
+            # If we have no records, we raise `RecordNotFound`
+            if len(valid_records) == 0:
                 raise RecordNotFound(f"No records exist for the key from the specified query parameters: '{query_key}'")
 
-            # Everything checks out, let's begin iterating!
-            # We begin by comparing the current key to the query key.
-            # If the key doesn't match the query key, we know that there are
-            # no records for the query because lmdb orders the keys lexicographically.
-            # Ergo, if the current key doesn't match the query key, we know
-            # we have gone beyond the relevant keys and can `break` the loop.
-            # Additionally, if the record is already in the `valid_records`
-            # set (identified by the `record_id`, we call `continue`.
-            for db_key in db_cursor.iternext(keys=True, values=False):
-                curr_key = DatastoreKey.from_bytestring(db_key)
-                if not curr_key.compare_key(query_key):
-                    break
-                elif curr_key.record_id in valid_records:
-                    continue
+            # At last, we yield the queried records
+            yield valid_records
 
-                record = partial(record_type, datastore_tx, curr_key.record_id)
+    @contextmanager
+    def stream_by(self,
+                  record_type: Type['DatastoreRecord'],
+                  filter_func: Optional[Callable[[Union[Any, Type['DatastoreRecord']]], bool]] = None,
+                  filter_field: str = "",
+                  writeable: bool = False,
+                  limit: Optional[int] = None,
+                  offset: int = 0,
+                  ) -> Iterator[Type['DatastoreRecord']]:
+        """
+        Performs a query on the datastore for the record by `record_type`, like
+        `query_by`, but yields a generator of the records instead of a list.
 
-                # We pass the field to the filter_func if `filter_field` and
-                # `filter_func` are both provided. In the event that the
-                # given `filter_field` doesn't exist for the record or the
-                # `filter_func` returns `False`, we call `continue`.
-                if filter_field and filter_func:
-                    try:
-                        field = getattr(record(writeable=False), filter_field)
-                    except (TypeError, AttributeError):
-                        continue
-                    else:
-                        if not filter_func(field):
-                            continue
-
-                # If only a filter_func is given, we pass a readonly record to it.
-                # Likewise to the above, if `filter_func` returns `False`, we
-                # call `continue`.
-                elif filter_func:
-                    if not filter_func(record(writeable=False)):
-                        continue
+        Records are read lazily from a cursor over the keys of `record_type`,
+        so memory use doesn't grow with the number of records, and the query
+        can be terminated early by not exhausting the generator.
+        An optional `offset` skips that many matching records, and an optional
+        `limit` caps the number of records generated.
 
-                # Finally, having a record that satisfies the above conditional
-                # constraints, we can add the record to the set
-                valid_records.add(record(writeable=writeable))
+        Unlike `query_by`, no `RecordNotFound` is raised if no records match:
+        the generator is simply empty.
 
-            # If after the iteration we have no records, we raise `RecordNotFound`
-            if len(valid_records) == 0:
-                raise RecordNotFound(f"No records exist for the key from the specified query parameters: '{query_key}'")
-            # We begin the context manager try/finally block
+        The generator can only be used within the context manager. Records
+        shouldn't be deleted while the generator is being consumed; use
+        `query_by` to delete the records of a query.
+        """
+        # Records generated so far, without holding on to them.
+        generated_records = weakref.WeakSet()
+        with self.__db_env.begin(write=writeable) as datastore_tx:
+            records = self.__generate_records(datastore_tx=datastore_tx,
+                                              record_type=record_type,
+                                              filter_func=filter_func,
+                                              filter_field=filter_field,
+                                              writeable=writeable,
+                                              limit=limit,
+                                              offset=offset,
+                                              generated_records=generated_records)
             try:
-                # At last, we yield the queried records
-                yield list(valid_records)
+                yield records
+                # Records dropped along the way were flushed as the stream moved past them.
+                for record in list(generated_records):
+                    record.flush()
             except (AttributeError, TypeError, DBWriteError) as tx_err:
                 # Handle `RecordNotFound` cases when `writeable` is `False`.
                 if not writeable and isinstance(tx_err, AttributeError):
                     raise RecordNotFound(tx_err)
                 raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
             finally:
-                for record in valid_records:
-                    record.__dict__['_DatastoreRecord__writeable'] = False
+                records.close()
+                for record in generated_records:
+                    _seal_record(record)
+
+    @staticmethod
+    def __generate_records(datastore_tx: 'lmdb.Transaction',
+                           record_type: Type['DatastoreRecord'],
+                           filter_func: Optional[Callable[[Union[Any, Type['DatastoreRecord']]], bool]],
+                           filter_field: str,
+                           writeable: bool,
+                           limit: Optional[int],
+                           offset: int,
+                           generated_records: 'weakref.WeakSet'
+                           ) -> Iterator[Type['DatastoreRecord']]:
+        if limit is not None and limit <= 0:
+            return
+
+        # By providing a `filter_field`, the query will immediately be
+        # limited to the subset of keys for the `filter_field`, where each
+        # record has exactly one key.
+        # Packed records keep all their fields under a single key, so
+        # their queries can't be narrowed down by field this way.
+        packed_layout = record_type._DatastoreRecord__packed
+        narrowed_by_field = bool(filter_field) and not packed_layout
+        if narrowed_by_field:
+            prefix = f'{record_type.__name__}:{filter_field}:'.encode()
+        else:
+            prefix = f'{record_type.__name__}:'.encode()
+        packed_prefix = f'{record_type.__name__}::'.encode()
+
+        # Records stored field by field have several keys, so we keep track
+        # of the ones we've already seen. Packed records have a single key,
+        # and don't need to be tracked.
+        seen_record_ids = set()
+
+        db_cursor = datastore_tx.cursor()
+        # Set the cursor to the closest key (if it exists) by the query params.
+        if not db_cursor.set_range(prefix):
+            return
+
+        skipped = generated = 0
+        # Since lmdb orders the keys lexicographically, once a key doesn't
+        # start with the prefix, we have gone beyond the relevant keys.
+        # The keys are compared as bytes, and only the record ID is decoded.
+        for db_key in db_cursor.iternext(keys=True, values=False):
+            if not db_key.startswith(prefix):
+                break
+
+            record_id = db_key.rpartition(b':')[2].decode()
+            with suppress(ValueError):
+                # If the ID can be an int, we convert it
+                record_id = int(record_id)
+
+            if not narrowed_by_field and not db_key.startswith(packed_prefix):
+                if record_id in seen_record_ids:
+                    continue
+                seen_record_ids.add(record_id)
+
+            record = partial(record_type, datastore_tx, record_id)
+
+            # We pass the field to the filter_func if `filter_field` and
+            # `filter_func` are both provided. In the event that the
+            # given `filter_field` doesn't exist for the record or the
+            # `filter_func` returns `False`, we call `continue`.
+            # For packed records, we always read the `filter_field` to
+            # check that it exists, since the keys can't tell us.
+            if filter_field and (filter_func or packed_layout):
+                try:
+                    field = getattr(record(writeable=False), filter_field)
+                except (TypeError, AttributeError):
+                    continue
+                else:
+                    if filter_func and not filter_func(field):
+                        continue
+
+            # If only a filter_func is given, we pass a readonly record to it.
+            # Likewise to the above, if `filter_func` returns `False`, we
+            # call `continue`.
+            elif filter_func:
+                if not filter_func(record(writeable=False)):
+                    continue
+
+            # Finally, we have a record that satisfies the above conditional constraints.
+            if skipped < offset:
+                skipped += 1
+                continue
+
+            valid_record = record(writeable=writeable)
+            generated_records.add(valid_record)
+            yield valid_record
+            # Write what was buffered on the record, in case it isn't kept until the end of the stream.
+            valid_record.flush()
+
+            generated += 1
+            if limit is not None and generated >= limit:
+                return
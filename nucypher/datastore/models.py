@@ -15,6 +15,7 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 from maya import MayaDT
+from umbral.cfrags import CapsuleFrag
 from umbral.keys import UmbralPublicKey
 from umbral.kfrags import KFrag
 
@@ -22,7 +23,7 @@ from nucypher.crypto.signing import Signature
 from nucypher.datastore.base import DatastoreRecord, RecordField
 
 
-class PolicyArrangement(DatastoreRecord):
+class PolicyArrangement(DatastoreRecord, packed=True):
     _arrangement_id = RecordField(bytes)
     _expiration = RecordField(
             MayaDT,
@@ -38,7 +39,7 @@ class PolicyArrangement(DatastoreRecord):
             decode=UmbralPublicKey.from_bytes)
 
 
-class Workorder(DatastoreRecord):
+class Workorder(DatastoreRecord, packed=True):
     _arrangement_id = RecordField(bytes)
     _bob_verifying_key = RecordField(
             UmbralPublicKey,
@@ -50,7 +51,7 @@ class Workorder(DatastoreRecord):
             decode=Signature.from_bytes)
 
 
-class TreasureMap(DatastoreRecord):
+class TreasureMap(DatastoreRecord, packed=True):
     # Ideally this is a `policy.collections.TreasureMap`, but it causes a huge
     # circular import due to `Bob` and `Character` in `policy.collections`.
     # TODO #2126
@@ -59,3 +60,18 @@ class TreasureMap(DatastoreRecord):
             MayaDT,
             encode=lambda maya_date: maya_date.iso8601().encode(),
             decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
+
+
+class CachedCFrag(DatastoreRecord, packed=True):
+    _cfrag = RecordField(
+            CapsuleFrag,
+            encode=lambda cfrag: cfrag.to_bytes(),
+            decode=CapsuleFrag.from_bytes)
+    _expiration = RecordField(
+            MayaDT,
+            encode=lambda maya_date: maya_date.iso8601().encode(),
+            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
+    _cached_at = RecordField(
+            MayaDT,
+            encode=lambda maya_date: maya_date.iso8601().encode(),
+            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
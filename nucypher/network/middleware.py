@@ -25,6 +25,7 @@ from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFIC
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 
+from nucypher.crypto.api import keccak_digest
 from nucypher.crypto.signing import signature_splitter
 from nucypher.crypto.splitters import cfrag_splitter
 from nucypher.utilities.logging import Logger
@@ -32,6 +33,14 @@ from nucypher.utilities.logging import Logger
 EXEMPT_FROM_VERIFICATION.bool_value(False)
 
 
+def treasure_map_etag(treasure_map_bytes: bytes) -> str:
+    """
+    The entity tag under which a serialized treasure map is served, so that
+    clients already holding the same map can ask for it conditionally.
+    """
+    return keccak_digest(treasure_map_bytes).hex()
+
+
 class NucypherMiddlewareClient:
     library = requests
     timeout = 1.2
@@ -119,7 +128,8 @@ class NucypherMiddlewareClient:
             url = f"https://{host}/{path}"
             response = self.invoke_method(method, url, verify=certificate_filepath, *args, **kwargs)
             cleaned_response = self.response_cleaner(response)
-            if cleaned_response.status_code >= 300:
+            # A 304 (Not Modified) answers a conditional request, and is not an error.
+            if cleaned_response.status_code >= 300 and cleaned_response.status_code != 304:
                 if cleaned_response.status_code == 400:
                     raise RestMiddleware.BadRequest(reason=cleaned_response.json)
                 elif cleaned_response.status_code == 404:
@@ -212,21 +222,28 @@ class RestMiddleware:
         cfrags_and_signatures = splitter.repeat(ursula_rest_response.content)
         return cfrags_and_signatures
 
-    def revoke_arrangement(self, ursula, revocation):
+    def revoke_arrangement(self, ursula, revocation, timeout=None):
         # TODO: Implement revocation confirmations
         response = self.client.delete(
             node_or_sprout=ursula,
             path=f"kFrag/{revocation.arrangement_id.hex()}",
             data=bytes(revocation),
+            timeout=timeout,
         )
         return response
 
     def get_competitive_rate(self):
         return NotImplemented
 
-    def get_treasure_map_from_node(self, node, map_identifier):
+    def get_treasure_map_from_node(self, node, map_identifier, etag=None):
+        """
+        If the `etag` of a treasure map we already have is given, the node
+        responds with a bodiless 304 (Not Modified) if it holds the same map.
+        """
+        headers = {'If-None-Match': f'"{etag}"'} if etag else None
         response = self.client.get(node_or_sprout=node,
                                    path=f"treasure_map/{map_identifier}",
+                                   headers=headers,
                                    timeout=2)
         return response
 
@@ -261,16 +278,12 @@ class RestMiddleware:
                            announce_nodes=None,
                            nodes_i_need=None,
                            fleet_checksum=None):
-        if nodes_i_need:
-            # TODO: This needs to actually do something.  NRN
-            # Include node_ids in the request; if the teacher node doesn't know about the
-            # nodes matching these ids, then it will ask other nodes.
-            pass
-
+        params = {}
         if fleet_checksum:
-            params = {'fleet': fleet_checksum}
-        else:
-            params = {}
+            params['fleet'] = fleet_checksum
+        if nodes_i_need:
+            # Only the nodes matching these checksum addresses are sent back, if the teacher knows of them.
+            params['nodes'] = ','.join(sorted(nodes_i_need))
 
         if announce_nodes:
             payload = bytes().join(bytes(VariableLengthBytestring(n)) for n in announce_nodes)
@@ -19,8 +19,11 @@ import contextlib
 import datetime
 import time
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from functools import partial
 from queue import Queue
+from threading import Lock
 from typing import Iterable, List
 from typing import Set, Tuple, Union
 
@@ -66,6 +69,17 @@ class NodeSprout(PartiallyKwargifiedBytes):
     """
     verified_node = False
 
+    # What's known of a sprout that hasn't been talked to yet, so that it can be shown
+    # (e.g. on the status page) without maturing it.
+    last_seen = NEVER_SEEN("No Connection to Node")
+    fleet_state_checksum = None
+    fleet_state_nickname = UNKNOWN_FLEET_STATE
+    fleet_state_population = UNKNOWN_FLEET_STATE
+
+    # Guards the creation of a sprout's finishing mutex, which is only made once the sprout matures,
+    # as most of the sprouts a node knows of are never matured.
+    _maturation_lock = Lock()
+
     def __init__(self, node_metadata):
         super().__init__(node_metadata)
         self._checksum_address = None
@@ -75,7 +89,7 @@ class NodeSprout(PartiallyKwargifiedBytes):
             self.timestamp)  # Weird for this to be in init. maybe this belongs in the splitter also.
         self._repr = None
         self._is_finishing = False
-        self._finishing_mutex = Queue()
+        self._finishing_mutex = None
 
     def __hash__(self):
         if not self._hash:
@@ -118,12 +132,19 @@ class NodeSprout(PartiallyKwargifiedBytes):
             self._nickname = Nickname.from_seed(self.checksum_address)
         return self._nickname
 
+    def rest_url(self):
+        return "{}:{}".format(self.rest_interface.host, self.rest_interface.port)
+
     def mature(self):
-        if self._is_finishing:
-            return self._finishing_mutex.get()
+        with self._maturation_lock:
+            is_finishing = self._is_finishing
+            if not is_finishing:
+                self._is_finishing = True  # Prevent reentrance.
+                self._finishing_mutex = Queue()
+            _finishing_mutex = self._finishing_mutex
 
-        self._is_finishing = True  # Prevent reentrance.
-        _finishing_mutex = self._finishing_mutex
+        if is_finishing:
+            return _finishing_mutex.get()
 
         mature_node = self.finish()
         self.__class__ = mature_node.__class__
@@ -161,6 +182,10 @@ class Learner:
     _LONG_LEARNING_DELAY = 90
     LEARNING_TIMEOUT = 10
     _ROUNDS_WITHOUT_NODES_AFTER_WHICH_TO_SLOW_DOWN = 10
+    _MIN_TEACHERS_PER_ROUND = 1
+    _MAX_TEACHERS_PER_ROUND = 8
+    _MAX_CONCURRENT_TEACHER_REQUESTS = 32  # Across all learners in this process
+    _TEACHERS_PER_CYCLE = 16
 
     # For Keeps
     __DEFAULT_NODE_STORAGE = ForgetfulNodeStorage
@@ -178,6 +203,9 @@ class Learner:
 
     _DEBUG_MODE = False
 
+    __learning_executor = None
+    __learning_executor_lock = Lock()
+
     class NotEnoughNodes(RuntimeError):
         pass
 
@@ -275,6 +303,8 @@ class Learner:
 
         self._learning_round = 0  # type: int
         self._rounds_without_new_nodes = 0  # type: int
+        self._teachers_per_round = self._MIN_TEACHERS_PER_ROUND  # type: int
+        self._full_exchange_due = False  # type: bool
         self._seed_nodes = seed_nodes or []
         self.unresponsive_seed_nodes = set()
 
@@ -421,8 +451,8 @@ class Learner:
                 return False
 
             except NodeSeemsToBeDown:
+                self.known_nodes.record_unreachable(node.checksum_address)
                 self.log.info("No Response while trying to verify node {}|{}".format(node.rest_interface, node))
-                # TODO: Bucket this node as "ghost" or something: somebody else knows about it, but we can't get to it.  567
                 return False
 
             except node.NotStaking:
@@ -433,6 +463,8 @@ class Learner:
 
             # TODO: What about InvalidNode?  (for that matter, any SuspiciousActivity)  1714, 567 too really
 
+            self.known_nodes.record_verified(node.checksum_address)
+
         listeners = self._learning_listeners.pop(node.checksum_address, tuple())
 
         for listener in listeners:
@@ -506,12 +538,14 @@ class Learner:
         reactor.stop()
 
     def select_teacher_nodes(self):
-        nodes_we_know_about = self.known_nodes.shuffled()
-
-        if not nodes_we_know_about:
+        if not self.known_nodes:
             raise self.NotEnoughTeachers("Need some nodes to start learning from.")
 
-        self.teacher_nodes.extend(nodes_we_know_about)
+        # The next few teachers are drawn favoring those that have been fast and taught us the most,
+        # leaving out those we're backing off from, unless there's no one else.
+        candidates = list(self.known_nodes.available()) or list(self.known_nodes)
+        teachers = self.known_nodes.teacher_scores.sample(candidates, quantity=self._TEACHERS_PER_CYCLE)
+        self.teacher_nodes.extend(reversed(teachers))  # Teachers are popped from the right.
 
     def cycle_teacher_node(self):
         if not self.teacher_nodes:
@@ -741,6 +775,11 @@ class Learner:
         """
         Sends a request to node_url to find out about known nodes.
 
+        Each round asks as many teachers as the learner currently deems worthwhile, concurrently:
+        the current teacher and the next ones in line.  Nodes learned from more than one of them
+        are only remembered once.  The number of teachers doubles after a round that taught us
+        about new nodes, up to _MAX_TEACHERS_PER_ROUND, and halves after a round that didn't.
+
         TODO: Does this (and related methods) belong on FleetSensor for portability?
 
         TODO: A lot of other code can be simplified if this is converted to async def.  That's a project, though.
@@ -766,31 +805,118 @@ class Learner:
         else:
             announce_nodes = None
 
-        unresponsive_nodes = set()
-
         #
         # Request
         #
         if canceller and canceller.stop_now:
             return RELAX
 
+        teachers = [current_teacher, *self._next_teacher_nodes(quantity=self._teachers_per_round - 1)]
+        nodes_i_need = frozenset(self._node_ids_to_learn_about_immediately)
         try:
-            response = self.network_middleware.get_nodes_via_rest(node=current_teacher,
-                                                                  nodes_i_need=self._node_ids_to_learn_about_immediately,
+            if nodes_i_need and not self._full_exchange_due:
+                # Ask only for the nodes we're waiting on.  If the teachers don't know of all of them,
+                # we keep what they sent, and exchange the whole fleet with the teachers of the next round.
+                results = self._ask_teachers(teachers,
+                                             announce_nodes=announce_nodes,
+                                             canceller=canceller,
+                                             nodes_i_need=nodes_i_need)
+                found = {sprout.checksum_address for sprouts in results if isinstance(sprouts, list) for sprout in sprouts}
+                self._full_exchange_due = not nodes_i_need.issubset(found)
+            else:
+                results = self._ask_teachers(teachers, announce_nodes=announce_nodes, canceller=canceller)
+                self._full_exchange_due = False
+        finally:
+            # Is cycling happening in the right order?
+            self.cycle_teacher_node()
+
+        #
+        # Remember
+        #
+        learned_sprouts, new_nodes = [], 0
+        seen_addresses = set()
+        for teacher, sprouts in zip(teachers, results):
+            if not isinstance(sprouts, list):
+                self.known_nodes.teacher_scores.record_new_nodes(teacher.checksum_address, quantity=0)
+                continue  # Nothing was learned from this teacher.
+
+            unseen_sprouts = [sprout for sprout in sprouts if sprout.checksum_address not in seen_addresses]
+            seen_addresses.update(sprout.checksum_address for sprout in unseen_sprouts)
+            learned_sprouts.extend(unseen_sprouts)
+
+            remembered_from_teacher = self._remember_sprouts(unseen_sprouts, teacher=teacher, eager=eager)
+            remembered.extend(remembered_from_teacher)
+            new_nodes += len(remembered_from_teacher)
+            self.known_nodes.teacher_scores.record_new_nodes(teacher.checksum_address,
+                                                             quantity=len(remembered_from_teacher))
+
+            learning_round_log_message = "Learning round {}.  Teacher: {} knew about {} nodes, {} were new."
+            self.log.info(learning_round_log_message.format(self._learning_round,
+                                                            teacher,
+                                                            len(sprouts),
+                                                            len(remembered_from_teacher)))
+
+        self._adjust_teachers_per_round(new_nodes=new_nodes)
+        if remembered:
+            self.known_nodes.record_fleet_state()
+
+        if len(teachers) == 1 or not seen_addresses:
+            return results[0]
+        return learned_sprouts
+
+    def _ask_teachers(self, teachers: list, **kwargs) -> list:
+        learn = partial(self._learn_from_teacher, **kwargs)
+        if len(teachers) == 1:
+            return [learn(teachers[0])]
+        return list(self._get_learning_executor().map(learn, teachers))
+
+    def _next_teacher_nodes(self, quantity: int) -> list:
+        """Takes up to `quantity` teachers after the current one, without starting a new cycle of teachers."""
+        teachers = []
+        while len(teachers) < quantity and self.teacher_nodes:
+            teacher = self.teacher_nodes.pop()
+            if teacher is not self._current_teacher_node:
+                teachers.append(teacher)
+        return teachers
+
+    def _adjust_teachers_per_round(self, new_nodes: int) -> None:
+        if new_nodes:
+            self._teachers_per_round = min(self._teachers_per_round * 2, self._MAX_TEACHERS_PER_ROUND)
+        else:
+            self._teachers_per_round = max(self._teachers_per_round // 2, self._MIN_TEACHERS_PER_ROUND)
+
+    @classmethod
+    def _get_learning_executor(cls) -> ThreadPoolExecutor:
+        with cls.__learning_executor_lock:
+            if cls.__learning_executor is None:
+                cls.__learning_executor = ThreadPoolExecutor(max_workers=cls._MAX_CONCURRENT_TEACHER_REQUESTS,
+                                                             thread_name_prefix='learning')
+            return cls.__learning_executor
+
+    def _learn_from_teacher(self, teacher, announce_nodes=None, canceller=None, nodes_i_need=None):
+        """
+        Asks a single teacher about the nodes it knows, or only about those of `nodes_i_need` if given.
+        Returns the sprouts it taught us about, or the constant (or None) describing why there weren't any.
+        """
+        started = time.monotonic()
+        try:
+            response = self.network_middleware.get_nodes_via_rest(node=teacher,
+                                                                  nodes_i_need=nodes_i_need,
                                                                   announce_nodes=announce_nodes,
                                                                   fleet_checksum=self.known_nodes.checksum)
-        # These except clauses apply to the current_teacher itself, not the learned-about nodes.
+        # These except clauses apply to the teacher itself, not the learned-about nodes.
         except NodeSeemsToBeDown as e:
-            unresponsive_nodes.add(current_teacher)
-            self.log.info(f"Teacher {str(current_teacher)} is perhaps down:{e}.")  # FIXME: This was printing the node bytestring. Is this really necessary?  #1712
+            self.known_nodes.teacher_scores.record_error(teacher.checksum_address)
+            self.known_nodes.record_unreachable(teacher.checksum_address)
+            self.log.info(f"Teacher {str(teacher)} is perhaps down:{e}.")  # FIXME: This was printing the node bytestring. Is this really necessary?  #1712
             return
-        except current_teacher.InvalidNode as e:
+        except teacher.InvalidNode as e:
             # Ugh.  The teacher is invalid.  Rough.
             # TODO: Bucket separately and report.
-            unresponsive_nodes.add(current_teacher)  # This does nothing.
-            self.known_nodes.mark_as(current_teacher.InvalidNode, current_teacher)
-            self.log.warn(f"Teacher {str(current_teacher)} is invalid: {bytes(current_teacher)}:{e}.")
-            self.suspicious_activities_witnessed['vladimirs'].append(current_teacher)
+            self.known_nodes.teacher_scores.record_error(teacher.checksum_address)
+            self.known_nodes.mark_as(teacher.InvalidNode, teacher)
+            self.log.warn(f"Teacher {str(teacher)} is invalid: {bytes(teacher)}:{e}.")
+            self.suspicious_activities_witnessed['vladimirs'].append(teacher)
             return
         except RuntimeError as e:
             if canceller and canceller.stop_now:
@@ -798,14 +924,19 @@ class Learner:
                 # TODO: Sort this out.
                 return RELAX
             else:
-                self.log.warn(f"Unhandled error while learning from {str(current_teacher)}: {bytes(current_teacher)}:{e}.")
+                self.known_nodes.teacher_scores.record_error(teacher.checksum_address)
+                self.log.warn(f"Unhandled error while learning from {str(teacher)}: {bytes(teacher)}:{e}.")
                 raise
         except Exception as e:
-            self.log.warn(f"Unhandled error while learning from {str(current_teacher)}: {bytes(current_teacher)}:{e}.")  # To track down 2345 / 1698
+            self.known_nodes.teacher_scores.record_error(teacher.checksum_address)
+            self.log.warn(f"Unhandled error while learning from {str(teacher)}: {bytes(teacher)}:{e}.")  # To track down 2345 / 1698
             raise
-        finally:
-            # Is cycling happening in the right order?
-            self.cycle_teacher_node()
+
+        if response.status_code in (200, 204):
+            self.known_nodes.record_reachable(teacher.checksum_address)
+            self.known_nodes.teacher_scores.record_response(teacher.checksum_address, rtt=time.monotonic() - started)
+        else:
+            self.known_nodes.teacher_scores.record_error(teacher.checksum_address)
 
         # Before we parse the response, let's handle some edge cases.
         if response.status_code == 204:
@@ -816,11 +947,11 @@ class Learner:
             # It's possible that our fleet states match, and we'll check for that later.
 
         elif response.status_code != 200:
-            self.log.info("Bad response from teacher {}: {} - {}".format(current_teacher, response, response.content))
+            self.log.info("Bad response from teacher {}: {} - {}".format(teacher, response, response.content))
             return
 
-        if self.domain != current_teacher.domain:
-            self.log.debug(f"{current_teacher} is serving '{current_teacher.domain}', "
+        if self.domain != teacher.domain:
+            self.log.debug(f"{teacher} is serving '{teacher.domain}', "
                            f"ignore since we are learning about '{self.domain}'")
             return  # This node is not serving our domain.
 
@@ -830,30 +961,29 @@ class Learner:
         try:
             signature, node_payload = signature_splitter(response.content, return_remainder=True)
         except BytestringSplittingError:
-            self.log.warn("No signature prepended to Teacher {} payload: {}".format(current_teacher, response.content))
+            self.log.warn("No signature prepended to Teacher {} payload: {}".format(teacher, response.content))
             return
 
         try:
-            self.verify_from(current_teacher, node_payload, signature=signature)
+            self.verify_from(teacher, node_payload, signature=signature)
         except Learner.InvalidSignature:  # TODO: Ensure wev've got the right InvalidSignature exception here
             self.suspicious_activities_witnessed['vladimirs'].append(
                 ('Node payload improperly signed', node_payload, signature))
             self.log.warn(
-                f"Invalid signature ({signature}) received from teacher {current_teacher} for payload {node_payload}")
+                f"Invalid signature ({signature}) received from teacher {teacher} for payload {node_payload}")
 
         # End edge case handling.
         payload = FleetSensor.snapshot_splitter(node_payload, return_remainder=True)
         fleet_state_checksum_bytes, fleet_state_updated_bytes, node_payload = payload
 
-        current_teacher.last_seen = maya.now()
+        teacher.last_seen = maya.now()
         # TODO: This is weird - let's get a stranger FleetState going.  NRN
         checksum = fleet_state_checksum_bytes.hex()
 
         if constant_or_bytes(node_payload) is FLEET_STATES_MATCH:
-            current_teacher.update_snapshot(checksum=checksum,
-                                            updated=maya.MayaDT(
-                                                int.from_bytes(fleet_state_updated_bytes, byteorder="big")),
-                                            number_of_known_nodes=self.known_nodes.population())
+            teacher.update_snapshot(checksum=checksum,
+                                    updated=maya.MayaDT(int.from_bytes(fleet_state_updated_bytes, byteorder="big")),
+                                    number_of_known_nodes=self.known_nodes.population())
             return FLEET_STATES_MATCH
 
         # Note: There was previously a version check here, but that required iterating through node bytestrings twice,
@@ -862,6 +992,14 @@ class Learner:
 
         sprouts = self.node_class.batch_from_bytes(node_payload)
 
+        if not nodes_i_need:  # Otherwise, the teacher only sent us some of the nodes it knows.
+            teacher.update_snapshot(checksum=checksum,
+                                    updated=maya.MayaDT(int.from_bytes(fleet_state_updated_bytes, byteorder="big")),
+                                    number_of_known_nodes=len(sprouts))
+        return sprouts
+
+    def _remember_sprouts(self, sprouts, teacher, eager=False) -> list:
+        remembered = []
         for sprout in sprouts:
             fail_fast = True  # TODO  NRN
             try:
@@ -877,6 +1015,7 @@ class Learner:
                 #
 
             except NodeSeemsToBeDown:
+                self.known_nodes.record_unreachable(sprout.checksum_address)
                 self.log.info(f"Verification Failed - "
                               f"Cannot establish connection to {sprout}.")
 
@@ -903,25 +1042,11 @@ class Learner:
             #     self.log.warn(sprout.invalid_metadata_message.format(sprout))
 
             except sprout.SuspiciousActivity:
+                self.known_nodes.record_suspicious(sprout.checksum_address)
                 message = f"Suspicious Activity: Discovered sprout with bad signature: {sprout}." \
-                          f"Propagated by: {current_teacher}"
+                          f"Propagated by: {teacher}"
                 self.log.warn(message)
-
-        # Is cycling happening in the right order?
-        current_teacher.update_snapshot(checksum=checksum,
-                                        updated=maya.MayaDT(int.from_bytes(fleet_state_updated_bytes, byteorder="big")),
-                                        number_of_known_nodes=len(sprouts))
-
-        ###################
-
-        learning_round_log_message = "Learning round {}.  Teacher: {} knew about {} nodes, {} were new."
-        self.log.info(learning_round_log_message.format(self._learning_round,
-                                                        current_teacher,
-                                                        len(sprouts),
-                                                        len(remembered)))
-        if remembered:
-            self.known_nodes.record_fleet_state()
-        return sprouts
+        return remembered
 
 
 class Teacher:
@@ -929,6 +1054,9 @@ class Teacher:
     _interface_info_splitter = (int, 4, {'byteorder': 'big'})
     log = Logger("teacher")
     synchronous_query_timeout = 20  # How long to wait during REST endpoints for blockchain queries to resolve
+    # How long REST endpoints reuse the result of an on-chain policy lookup (about a block).  Within this window,
+    # a treasure map for a policy that was just revoked may still be accepted.  Lookups that find no policy aren't reused.
+    policy_cache_ttl = 15
     __DEFAULT_MIN_SEED_STAKE = 0
 
     def __init__(self,
@@ -1041,9 +1169,17 @@ class Teacher:
         nodes_to_consider = list(self.known_nodes.values()) + [self]
         return sorted(nodes_to_consider, key=lambda n: n.checksum_address)
 
-    def bytestring_of_known_nodes(self):
+    def bytestring_of_known_nodes(self, addresses: Iterable[str] = None):
+        """
+        The snapshot of this node's fleet state, followed by the nodes it knows and itself.
+        If `addresses` are given, only the known nodes among them are included.
+        """
         payload = self.known_nodes.snapshot()
-        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in self.known_nodes)
+        if addresses is None:
+            nodes = self.known_nodes
+        else:
+            nodes = (self.known_nodes[address] for address in addresses if address in self.known_nodes.addresses())
+        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in nodes)
         ursulas_as_bytes = bytes().join(bytes(u) for u in ursulas_as_vbytes)
         ursulas_as_bytes += VariableLengthBytestring(bytes(self))
 
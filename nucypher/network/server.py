@@ -33,17 +33,20 @@ from web3.exceptions import TimeExhausted
 
 import nucypher
 from nucypher.crypto.api import InvalidNodeCertificate
-from nucypher.config.constants import MAX_UPLOAD_CONTENT_LENGTH
+from nucypher.config.constants import MAX_UPLOAD_CONTENT_LENGTH, POLICY_CACHE_SIZE, TREASURE_MAP_CACHE_SIZE
 from nucypher.crypto.keypairs import HostingKeypair
 from nucypher.crypto.kits import UmbralMessageKit
 from nucypher.crypto.powers import KeyPairBasedPower, PowerUpError
 from nucypher.crypto.signing import InvalidSignature
 from nucypher.crypto.utils import canonical_address_from_umbral_key
+from nucypher.datastore.appender import RecordAppender
 from nucypher.datastore.datastore import Datastore, RecordNotFound, DatastoreTransactionError
 from nucypher.datastore.models import PolicyArrangement, TreasureMap, Workorder
 from nucypher.network import LEARNING_LOOP_VERSION
 from nucypher.network.exceptions import NodeSeemsToBeDown
+from nucypher.network.middleware import treasure_map_etag
 from nucypher.network.protocols import InterfaceInfo
+from nucypher.utilities.cache import LRUCache, SingleFlightCache
 from nucypher.utilities.logging import Logger
 
 HERE = BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -111,6 +114,16 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
     rest_app = Flask("ursula-service")
     rest_app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_CONTENT_LENGTH
 
+    # Work orders from concurrent re-encryption requests are group-committed.
+    workorder_appender = RecordAppender(datastore)
+
+    # Serialized treasure maps, with their ETags and expirations, by map identifier.
+    treasure_map_cache = LRUCache(maxsize=TREASURE_MAP_CACHE_SIZE)
+
+    # On-chain policy lookups, shared by all the requests concerning the same policy.
+    policy_cache = SingleFlightCache(maxsize=POLICY_CACHE_SIZE, ttl=this_node.policy_cache_ttl)
+    arrangements_cache = SingleFlightCache(maxsize=POLICY_CACHE_SIZE, ttl=this_node.policy_cache_ttl)
+
     @rest_app.route("/public_information")
     def public_information():
         """REST endpoint for public keys and address."""
@@ -176,7 +189,12 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         if this_node.known_nodes.checksum is NO_KNOWN_NODES:
             return Response(b"", headers=headers, status=204)
 
-        known_nodes_bytestring = this_node.bytestring_of_known_nodes()
+        # A learner may only ask about specific nodes, by their checksum addresses.
+        requested_nodes = request.args.get('nodes')
+        if requested_nodes:
+            known_nodes_bytestring = this_node.bytestring_of_known_nodes(addresses=requested_nodes.split(','))
+        else:
+            known_nodes_bytestring = this_node.bytestring_of_known_nodes()
         signature = this_node.stamp(known_nodes_bytestring)
         return Response(bytes(signature) + known_nodes_bytestring, headers=headers)
 
@@ -242,7 +260,10 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
             try:
                 # Get all of the arrangements and verify that we'll be paid.
                 # TODO: We'd love for this part to be impossible to reduce the risk of collusion.  #1274
-                arranged_addresses = this_node.policy_agent.fetch_arrangement_addresses_from_policy_txid(tx, timeout=this_node.synchronous_query_timeout)
+                arranged_addresses = arrangements_cache.get_or_load(
+                    key=tx,
+                    loader=lambda: this_node.policy_agent.fetch_arrangement_addresses_from_policy_txid(
+                        tx, timeout=this_node.synchronous_query_timeout))
             except TimeExhausted:
                 # Alice didn't pay.  Return response with that weird status code.
                 this_node.suspicious_activities_witnessed['freeriders'].append((alice, f"No transaction matching {tx}."))
@@ -328,25 +349,51 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
 
         # Now, Ursula saves this workorder to her database...
         # Note: we give the work order a random ID to store it under.
-        with datastore.describe(Workorder, str(uuid.uuid4()), writeable=True) as new_workorder:
-            new_workorder.arrangement_id = work_order.arrangement_id
-            new_workorder.bob_verifying_key = work_order.bob.stamp.as_umbral_pubkey()
-            new_workorder.bob_signature = work_order.receipt_signature
+        workorder_appender.append(Workorder, str(uuid.uuid4()),
+                                  arrangement_id=work_order.arrangement_id,
+                                  bob_verifying_key=work_order.bob.stamp.as_umbral_pubkey(),
+                                  bob_signature=work_order.receipt_signature)
 
         headers = {'Content-Type': 'application/octet-stream'}
         return Response(headers=headers, response=response)
 
+    def datastore_pruning_time() -> MayaDT:
+        # Cached treasure maps expire by the clock the datastore is pruned by, so that they go along with stored ones.
+        return MayaDT.from_datetime(datetime.fromtimestamp(this_node._datastore_pruning_task.clock.seconds()))
+
+    def cache_treasure_map(identifier: str, treasure_map_bytes: bytes, expiration: MayaDT) -> Tuple[bytes, str, MayaDT]:
+        cached_treasure_map = (treasure_map_bytes, treasure_map_etag(treasure_map_bytes), expiration)
+        treasure_map_cache[identifier] = cached_treasure_map
+        return cached_treasure_map
+
     @rest_app.route('/treasure_map/<identifier>')
     def provide_treasure_map(identifier):
         headers = {'Content-Type': 'application/octet-stream'}
 
-        try:
-            with datastore.describe(TreasureMap, identifier) as stored_treasure_map:
-                response = Response(stored_treasure_map.treasure_map, headers=headers)
+        cached_treasure_map = treasure_map_cache.get(identifier)
+        if cached_treasure_map and cached_treasure_map[2] <= datastore_pruning_time():
+            # Expired maps are left to the datastore, until they're pruned.
+            treasure_map_cache.pop(identifier)
+            cached_treasure_map = None
+
+        if not cached_treasure_map:
+            try:
+                with datastore.describe(TreasureMap, identifier) as stored_treasure_map:
+                    cached_treasure_map = cache_treasure_map(identifier=identifier,
+                                                             treasure_map_bytes=stored_treasure_map.treasure_map,
+                                                             expiration=stored_treasure_map.expiration)
+            except RecordNotFound:
+                log.info(f"{this_node} doesn't have requested TreasureMap under {identifier}")
+                return Response(f"No Treasure Map with identifier {identifier}", status=404, headers=headers)
+
+        treasure_map_bytes, etag, _expiration = cached_treasure_map
+        if request.if_none_match.contains(etag):
+            log.info(f"{this_node} confirming requester already has TreasureMap {identifier}")
+            response = Response(status=304)
+        else:
             log.info(f"{this_node} providing TreasureMap {identifier}")
-        except RecordNotFound:
-            log.info(f"{this_node} doesn't have requested TreasureMap under {identifier}")
-            response = Response(f"No Treasure Map with identifier {identifier}", status=404, headers=headers)
+            response = Response(treasure_map_bytes, headers=headers)
+        response.set_etag(etag)
         return response
 
     @rest_app.route('/treasure_map/', methods=['POST'])
@@ -382,6 +429,9 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
             expiration_date = MayaDT.from_datetime(datetime.utcnow() + timedelta(days=7))
 
         # Step 2: Check if we already have the treasure map.
+        cached_treasure_map = treasure_map_cache.get(map_identifier)
+        if cached_treasure_map and cached_treasure_map[0] == request.data:
+            return Response("Already have this map.", status=303)
         try:
             with datastore.describe(TreasureMap, map_identifier) as stored_treasure_map:
                 if _MapClass.from_bytes(stored_treasure_map.treasure_map) == received_treasure_map:
@@ -394,9 +444,11 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         # treasure map is valid pursuant to an active policy.
         # We also set the expiration from the data on the blockchain here.
         if not this_node.federated_only:
-            policy_data, alice_checksum_address = this_node.policy_agent.fetch_policy(
-                    received_treasure_map._hrac,
-                    with_owner=True)
+            policy_data, alice_checksum_address = policy_cache.get_or_load(
+                key=received_treasure_map._hrac,
+                loader=lambda: this_node.policy_agent.fetch_policy(received_treasure_map._hrac, with_owner=True),
+                # A policy that doesn't exist yet may only be in a block we haven't seen; look it up again next time.
+                cache_if=lambda policy: bool(policy[0][5]))
             # If the Policy doesn't exist, the policy_data is all zeros.
             if not policy_data[5]:
                 log.info(f"TreasureMap is for non-existent Policy; not storing {map_identifier}")
@@ -415,9 +467,11 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
 
         # Step 4: Finally, we store our treasure map under its identifier!
         log.info(f"{this_node} storing TreasureMap {map_identifier}")
+        treasure_map_bytes = bytes(received_treasure_map)
         with datastore.describe(TreasureMap, map_identifier, writeable=True) as new_treasure_map:
-            new_treasure_map.treasure_map = bytes(received_treasure_map)
+            new_treasure_map.treasure_map = treasure_map_bytes
             new_treasure_map.expiration = expiration_date
+        cache_treasure_map(identifier=map_identifier, treasure_map_bytes=treasure_map_bytes, expiration=expiration_date)
         return Response("Treasure map stored!", status=201)
 
     @rest_app.route('/status/', methods=['GET'])
@@ -429,10 +483,8 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
 
         else:
             headers = {"Content-Type": "text/html", "charset": "utf-8"}
-            previous_states = list(reversed(this_node.known_nodes.states.values()))[:5]
-            # Mature every known node before rendering.
-            for node in this_node.known_nodes:
-                node.mature()
+            previous_states = this_node.known_nodes.states.latest(5)
+            # Known nodes are shown as they are; sprouts aren't matured just to be listed.
 
             try:
                 content = status_template.render(this_node=this_node,
@@ -28,8 +28,9 @@ from constant_sorrow.constants import CFRAG_NOT_RETAINED, NO_DECRYPTION_PERFORME
 from constant_sorrow.constants import NOT_SIGNED
 from cryptography.hazmat.backends.openssl import backend
 from cryptography.hazmat.primitives import hashes
+from eth_typing.evm import ChecksumAddress
 from eth_utils import to_canonical_address, to_checksum_address
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from umbral.config import default_params
 from umbral.curvebn import CurveBN
 from umbral.keys import UmbralPublicKey
@@ -37,6 +38,7 @@ from umbral.pre import Capsule
 
 from nucypher.blockchain.eth.constants import ETH_ADDRESS_BYTE_LENGTH, ETH_HASH_BYTE_LENGTH
 from nucypher.characters.lawful import Bob, Character
+from nucypher.config.constants import VERIFIED_TREASURE_MAP_CACHE_SIZE
 from nucypher.crypto.api import encrypt_and_sign, keccak_digest
 from nucypher.crypto.api import verify_eip_191
 from nucypher.crypto.constants import HRAC_LENGTH
@@ -50,6 +52,7 @@ from nucypher.crypto.utils import (
     get_signature_recovery_value
 )
 from nucypher.network.middleware import RestMiddleware
+from nucypher.utilities.cache import LRUCache
 
 
 class TreasureMap:
@@ -71,6 +74,10 @@ class TreasureMap:
     from nucypher.crypto.signing import \
         InvalidSignature  # Raised when the public signature (typically intended for Ursula) is not valid.
 
+    # Digests of the maps whose signatures were found valid, shared by every character in this process,
+    # so that a map received again (propagated by another node, or fetched again) isn't verified again.
+    _verified_signatures = LRUCache(maxsize=VERIFIED_TREASURE_MAP_CACHE_SIZE)
+
     def __init__(self,
                  m: int = None,
                  destinations=None,
@@ -200,10 +207,15 @@ class TreasureMap:
         return treasure_map
 
     def public_verify(self):
+        digest = keccak_digest(TreasureMap.__bytes__(self))
+        if self._verified_signatures.get(digest):
+            return True
+
         message = bytes(self._verifying_key) + self._hrac
         verified = self._public_signature.verify(message, self._verifying_key)
 
         if verified:
+            self._verified_signatures[digest] = True
             return True
         else:
             raise self.InvalidSignature("This TreasureMap is not properly publicly signed by Alice.")
@@ -267,9 +279,16 @@ class SignedTreasureMap(TreasureMap):
 
     def verify_blockchain_signature(self, checksum_address):
         self._set_payload()
-        return verify_eip_191(message=self._payload,
-                              signature=self._blockchain_signature,
-                              address=checksum_address)
+        digest = keccak_digest(self._blockchain_signature, self._payload, to_canonical_address(checksum_address))
+        if self._verified_signatures.get(digest):
+            return True
+
+        verified = verify_eip_191(message=self._payload,
+                                  signature=self._blockchain_signature,
+                                  address=checksum_address)
+        if verified:
+            self._verified_signatures[digest] = True
+        return verified
 
     def __bytes__(self):
         if self._blockchain_signature is NOT_SIGNED:
@@ -473,10 +492,24 @@ class WorkOrder:
 
 
 class WorkOrderHistory:
+    """
+    The WorkOrders that Bob has completed, indexed both by Ursula and by Capsule, so that
+    the WorkOrders for either are found without walking the others.
 
-    def __init__(self) -> None:
-        self.by_ursula = {}  # type: dict
-        self._latest_replete = {}
+    The history holds the WorkOrders of at most `max_capsules` Capsules; once there are more,
+    those of the least recently saved Capsules are evicted first.
+    """
+
+    DEFAULT_MAX_CAPSULES = 10_000
+
+    def __init__(self, max_capsules: int = DEFAULT_MAX_CAPSULES) -> None:
+        if max_capsules < 1:
+            raise ValueError(f"max_capsules must be positive, got {max_capsules}")
+        self.max_capsules = max_capsules
+        self.by_ursula = {}  # type: Dict[ChecksumAddress, Dict[Capsule, WorkOrder]]
+        self._by_capsule = OrderedDict()  # type: OrderedDict[Capsule, Dict[ChecksumAddress, WorkOrder]]
+        self._latest_replete = {}  # type: Dict[Capsule, Dict[ChecksumAddress, WorkOrder]]
+        self._length = 0
 
     def __contains__(self, item):
         assert False
@@ -488,7 +521,7 @@ class WorkOrderHistory:
         assert False
 
     def __len__(self):
-        return sum(len(work_orders) for work_orders in self.by_ursula.values())
+        return self._length
 
     @property
     def ursulas(self):
@@ -501,24 +534,70 @@ class WorkOrderHistory:
         return self._latest_replete[capsule]
 
     def save_work_order(self, work_order, as_replete=False):
-        for task in work_order.tasks.values():
+        checksum_address = work_order.ursula.checksum_address
+        work_orders_by_capsule = self.by_ursula.setdefault(checksum_address, {})
+        for capsule in work_order.tasks:
             if as_replete:
-                work_orders_for_ursula = self._latest_replete.setdefault(task.capsule, {})
-                work_orders_for_ursula[work_order.ursula.checksum_address] = work_order
+                work_orders_for_ursula = self._latest_replete.setdefault(capsule, {})
+                work_orders_for_ursula[checksum_address] = work_order
 
-            work_orders_for_ursula = self.by_ursula.setdefault(work_order.ursula.checksum_address, {})
-            work_orders_for_ursula[task.capsule] = work_order
+            work_orders_for_capsule = self._by_capsule.setdefault(capsule, {})
+            self._by_capsule.move_to_end(capsule)
+            if checksum_address not in work_orders_for_capsule:
+                self._length += 1
+            work_orders_for_capsule[checksum_address] = work_order
+            work_orders_by_capsule[capsule] = work_order
+
+        while len(self._by_capsule) > self.max_capsules:
+            self._evict(*self._by_capsule.popitem(last=False))
+
+    def discard_work_order(self, work_order) -> None:
+        """
+        Forgets a completed WorkOrder which isn't needed anymore, except for the Capsules
+        that have it as their most recent replete WorkOrder.
+        """
+        checksum_address = work_order.ursula.checksum_address
+        work_orders_by_capsule = self.by_ursula.get(checksum_address, {})
+        for capsule in work_order.tasks:
+            work_orders_for_capsule = self._by_capsule.get(capsule, {})
+            if work_orders_for_capsule.get(checksum_address) is not work_order:
+                continue
+
+            replete_work_order = self._latest_replete.get(capsule, {}).get(checksum_address)
+            if replete_work_order is work_order:
+                continue
+            elif replete_work_order is not None:
+                # An earlier replete WorkOrder from this Ursula is still around; it takes this one's place.
+                work_orders_for_capsule[checksum_address] = replete_work_order
+                work_orders_by_capsule[capsule] = replete_work_order
+                continue
+
+            del work_orders_for_capsule[checksum_address]
+            del work_orders_by_capsule[capsule]
+            self._length -= 1
+            if not work_orders_for_capsule:
+                del self._by_capsule[capsule]
+        if not work_orders_by_capsule:
+            self.by_ursula.pop(checksum_address, None)
+
+    def forget_capsule(self, capsule: Capsule) -> None:
+        """Forgets all the WorkOrders for a Capsule, replete or not."""
+        self._evict(capsule, self._by_capsule.pop(capsule, {}))
+
+    def _evict(self, capsule: Capsule, work_orders: Dict[ChecksumAddress, 'WorkOrder']) -> None:
+        self._latest_replete.pop(capsule, None)
+        for checksum_address in work_orders:
+            work_orders_by_capsule = self.by_ursula[checksum_address]
+            del work_orders_by_capsule[capsule]
+            if not work_orders_by_capsule:
+                del self.by_ursula[checksum_address]
+        self._length -= len(work_orders)
 
     def by_checksum_address(self, checksum_address):
         return self.by_ursula.setdefault(checksum_address, {})
 
     def by_capsule(self, capsule: Capsule):
-        ursulas_by_capsules = {}  # type: dict
-        for ursula, capsules in self.by_ursula.items():
-            for saved_capsule, work_order in capsules.items():
-                if saved_capsule == capsule:
-                    ursulas_by_capsules[ursula] = work_order
-        return ursulas_by_capsules
+        return dict(self._by_capsule.get(capsule, {}))
 
 
 class Revocation:
@@ -571,6 +650,32 @@ class Revocation:
         return True
 
 
+class RevocationReport:
+    """
+    The outcome of revoking a policy: the nodes that confirmed the revocation,
+    and for each node that didn't, its revocation and the error it failed with.
+    """
+
+    def __init__(self, policy_id: bytes):
+        self.policy_id = policy_id
+        self.confirmed = set()
+        self.failed = dict()
+
+    def confirm(self, node_id: str) -> None:
+        self.confirmed.add(node_id)
+
+    def fail(self, node_id: str, revocation: Revocation, error: Exception) -> None:
+        self.failed[node_id] = (revocation, error)
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.policy_id.hex()}, " \
+               f"confirmed={len(self.confirmed)}, failed={len(self.failed)})"
+
+
 # TODO: Change name to EvaluationEvidence
 class IndisputableEvidence:
 
@@ -18,7 +18,9 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import datetime
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, Empty
+from threading import Lock
 from typing import Callable, Tuple, Sequence, Set, Optional, Iterable, List, Dict, Type
 
 import math
@@ -31,7 +33,6 @@ from constant_sorrow.constants import NOT_SIGNED
 from eth_typing.evm import ChecksumAddress
 from hexbytes import HexBytes
 from twisted._threads import AlreadyQuit
-from twisted.internet import reactor
 from twisted.internet.defer import ensureDeferred, Deferred
 from twisted.python.threadpool import ThreadPool
 from umbral.keys import UmbralPublicKey
@@ -92,14 +93,26 @@ class Arrangement:
 
 
 class TreasureMapPublisher:
+    """
+    Publishes a treasure map to the given nodes.
+
+    All publishers run on a single executor, created on first use and kept for the life of the process,
+    so that granting many policies in a row neither creates nor tears down threads for each of them,
+    and the number of concurrent uploads stays bounded.  The timeout of a publisher only starts
+    once its first upload does, rather than while it waits behind the uploads of other policies.
+    """
 
     log = Logger('TreasureMapPublisher')
 
+    MAX_CONCURRENT_UPLOADS = 120
+
+    __executor = None
+    __executor_lock = Lock()
+
     def __init__(self,
                  worker,
                  nodes,
                  percent_to_complete_before_release=5,
-                 threadpool_size=120,
                  timeout=20):
 
         self._total = len(nodes)
@@ -109,7 +122,15 @@ class TreasureMapPublisher:
                                        target_successes=self._block_until_this_many_are_complete,
                                        timeout=timeout,
                                        stagger_timeout=0,
-                                       threadpool_size=threadpool_size)
+                                       executor=self._get_executor())
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls.__executor_lock:
+            if cls.__executor is None:
+                cls.__executor = ThreadPoolExecutor(max_workers=cls.MAX_CONCURRENT_UPLOADS,
+                                                    thread_name_prefix='TreasureMapPublisher')
+            return cls.__executor
 
     @property
     def completed(self):
@@ -118,9 +139,8 @@ class TreasureMapPublisher:
 
     def start(self):
         self.log.info(f"TreasureMapPublisher starting")
+        # On the shared executor, the pool has no threads of its own to join once it's done.
         self._worker_pool.start()
-        if reactor.running:
-            reactor.callInThread(self.block_until_complete)
 
     def block_until_success_is_reasonably_likely(self):
         # Note: `OutOfValues`/`TimedOut` may be raised here, which means we didn't even get to
@@ -187,6 +207,10 @@ class Policy(ABC):
 
     log = Logger("Policy")
 
+    # Whether each Ursula can be given her kfrag as soon as she accepts an arrangement,
+    # instead of once arrangements have been made with all of them.
+    _enact_on_acceptance = True
+
     class NotEnoughUrsulas(Exception):
         """
         Raised when a Policy has been used to generate Arrangements with Ursulas insufficient number
@@ -258,7 +282,12 @@ class Policy(ABC):
         arrangement = Arrangement.from_alice(alice=self.alice, expiration=self.expiration)
 
         self.log.debug(f"Proposing arrangement {arrangement} to {ursula}")
-        negotiation_response = network_middleware.propose_arrangement(ursula, arrangement)
+        try:
+            negotiation_response = network_middleware.propose_arrangement(ursula, arrangement)
+        except NodeSeemsToBeDown:
+            self.alice.known_nodes.record_unreachable(address)
+            raise
+        self.alice.known_nodes.record_reachable(address)
         status = negotiation_response.status_code
 
         if status == 200:
@@ -284,10 +313,16 @@ class Policy(ABC):
                            network_middleware: RestMiddleware,
                            handpicked_ursulas: Optional[Iterable[Ursula]] = None,
                            timeout: int = 10,
+                           enact: bool = False,
                            ) -> Dict[Ursula, Arrangement]:
         """
         Pick some Ursula addresses and send them arrangement proposals.
         Returns a dictionary of Ursulas to Arrangements if it managed to get `n` responses.
+
+        If `enact` is set, each Ursula is sent a kfrag as soon as she accepts, without waiting for the others,
+        and only Ursulas that took their kfrag count as responses.  A kfrag an Ursula fails to take
+        goes to the next one to accept.  If fewer than `n` Ursulas end up taking a kfrag, the arrangements
+        already enacted are revoked before giving up.
         """
 
         if handpicked_ursulas is None:
@@ -297,8 +332,32 @@ class Policy(ABC):
         reservoir = self._make_reservoir(handpicked_addresses)
         value_factory = PrefetchStrategy(reservoir, self.n)
 
+        unassigned_kfrags = Queue()
+        for kfrag in self.kfrags:
+            unassigned_kfrags.put(kfrag)
+        enacted_arrangements = dict()  # Including those that finish enacting after the pool is cancelled
+
         def worker(address):
-            return self._propose_arrangement(address, network_middleware)
+            if address not in handpicked_addresses and not self.alice.known_nodes.is_available(address):
+                # Don't wait on a node that recently failed us; draw another one instead.
+                raise RuntimeError(f"{address} is {self.alice.known_nodes.health(address)}; backing off")
+            ursula, arrangement = self._propose_arrangement(address, network_middleware)
+            if not enact:
+                return ursula, arrangement
+
+            try:
+                kfrag = unassigned_kfrags.get_nowait()
+            except Empty:
+                raise RuntimeError(f"{ursula} accepted, but all the kfrags are already being enacted")
+            try:
+                status = self._enact_arrangement(network_middleware, ursula, arrangement, kfrag)
+                if status != 200:
+                    raise RuntimeError(f"Enacting arrangement with {ursula} failed with {status}")
+            except BaseException:
+                unassigned_kfrags.put(kfrag)
+                raise
+            enacted_arrangements[ursula] = arrangement
+            return ursula, arrangement
 
         self.alice.block_until_number_of_known_nodes_is(self.n, learn_on_this_thread=True, eager=True)
 
@@ -332,12 +391,35 @@ class Policy(ABC):
                 "Could not find enough Ursulas to accept proposals.\n"
                 f"Accepted: {accepted_addresses}\n"
                 f"Rejected:\n{rejected_proposals}")
+            if enact:
+                self._revoke_arrangements(network_middleware, enacted_arrangements, timeout=timeout)
             raise self._not_enough_ursulas_exception()
         else:
             self.log.debug(f"Finished proposing arrangements; accepted: {accepted_addresses}")
 
         return accepted_arrangements
 
+    def _revoke_arrangements(self,
+                             network_middleware: RestMiddleware,
+                             arrangements: Dict[Ursula, Arrangement],
+                             timeout: int = 10,
+                             ) -> None:
+        """
+        Revokes arrangements that were enacted for a policy that couldn't be completed,
+        so that their Ursulas don't keep kfrags for it.  Failures are only logged.
+        """
+        from nucypher.policy.collections import Revocation  # TODO: Circular Import
+        for ursula, arrangement in arrangements.items():
+            revocation = Revocation(arrangement.id, signer=self.alice.stamp)
+            try:
+                response = network_middleware.revoke_arrangement(ursula, revocation, timeout=timeout)
+            except Exception as e:
+                self.log.warn(f"Failed to revoke the partially enacted arrangement with {ursula}: {e}")
+            else:
+                if response.status_code != 200:
+                    self.log.warn(f"Failed to revoke the partially enacted arrangement with {ursula}: "
+                                  f"status {response.status_code}")
+
     def _enact_arrangements(self,
                             network_middleware: RestMiddleware,
                             arrangements: Dict[Ursula, Arrangement],
@@ -352,24 +434,7 @@ class Policy(ABC):
         def worker(ursula_and_kfrag):
             ursula, kfrag = ursula_and_kfrag
             arrangement = arrangements[ursula]
-
-            # TODO: seems like it would be enough to just encrypt this with Ursula's public key,
-            # and not create a whole capsule.
-            # Can't change for now since it's node protocol.
-            payload = self._make_enactment_payload(publication_transaction, kfrag)
-            message_kit, _signature = self.alice.encrypt_for(ursula, payload)
-
-            try:
-                # TODO: Concurrency
-                response = network_middleware.enact_policy(ursula,
-                                                           arrangement.id,
-                                                           message_kit.to_bytes())
-            except network_middleware.UnexpectedResponse as e:
-                status = e.status
-            else:
-                status = response.status_code
-
-            return status
+            return self._enact_arrangement(network_middleware, ursula, arrangement, kfrag, publication_transaction)
 
         value_factory = AllAtOnceFactory(list(zip(arrangements, self.kfrags)))
         worker_pool = WorkerPool(worker=worker,
@@ -405,6 +470,34 @@ class Policy(ABC):
             # otherwise just raise a more generic error
             raise Policy.EnactmentError()
 
+    def _enact_arrangement(self,
+                           network_middleware: RestMiddleware,
+                           ursula: Ursula,
+                           arrangement: Arrangement,
+                           kfrag: KFrag,
+                           publication_transaction: Optional[HexBytes] = None,
+                           ) -> int:
+        """
+        Sends a kfrag to an Ursula that accepted an arrangement; returns the response status.
+        """
+
+        # TODO: seems like it would be enough to just encrypt this with Ursula's public key,
+        # and not create a whole capsule.
+        # Can't change for now since it's node protocol.
+        payload = self._make_enactment_payload(publication_transaction, kfrag)
+        message_kit, _signature = self.alice.encrypt_for(ursula, payload)
+
+        try:
+            response = network_middleware.enact_policy(ursula,
+                                                       arrangement.id,
+                                                       message_kit.to_bytes())
+        except network_middleware.UnexpectedResponse as e:
+            status = e.status
+        else:
+            status = response.status_code
+
+        return status
+
     def _make_treasure_map(self,
                            network_middleware: RestMiddleware,
                            arrangements: Dict[Ursula, Arrangement],
@@ -464,11 +557,13 @@ class Policy(ABC):
         """
 
         arrangements = self._make_arrangements(network_middleware=network_middleware,
-                                               handpicked_ursulas=handpicked_ursulas)
+                                               handpicked_ursulas=handpicked_ursulas,
+                                               enact=self._enact_on_acceptance)
 
-        self._enact_arrangements(network_middleware=network_middleware,
-                                 arrangements=arrangements,
-                                 publish_treasure_map=publish_treasure_map)
+        if not self._enact_on_acceptance:
+            self._enact_arrangements(network_middleware=network_middleware,
+                                     arrangements=arrangements,
+                                     publish_treasure_map=publish_treasure_map)
 
         treasure_map = self._make_treasure_map(network_middleware=network_middleware,
                                                arrangements=arrangements)
@@ -515,7 +610,7 @@ class FederatedPolicy(Policy):
 
     def _make_reservoir(self, handpicked_addresses):
         addresses = {
-            ursula.checksum_address: 1 for ursula in self.alice.known_nodes
+            ursula.checksum_address: 1 for ursula in self.alice.known_nodes.available()
             if ursula.checksum_address not in handpicked_addresses}
 
         return MergedReservoir(handpicked_addresses, StakersReservoir(addresses))
@@ -538,19 +633,28 @@ class BlockchainPolicy(Policy):
     class NotEnoughBlockchainUrsulas(Policy.NotEnoughUrsulas):
         pass
 
+    # Ursulas check their kfrag comes with the transaction publishing the policy, which lists all of them.
+    _enact_on_acceptance = False
+
     def __init__(self,
                  value: int,
                  rate: int,
                  duration_periods: int,
+                 stakers_map: Optional[Dict[ChecksumAddress, int]] = None,
                  *args,
                  **kwargs,
                  ):
+        """
+        :param stakers_map: Active stakers (and their stakes) to sample Ursulas from;
+                            if not given, they're fetched from the StakingEscrow.
+        """
 
         super().__init__(*args, **kwargs)
 
         self.duration_periods = duration_periods
         self.value = value
         self.rate = rate
+        self.stakers_map = stakers_map
 
         self._validate_fee_value()
 
@@ -599,6 +703,11 @@ class BlockchainPolicy(Policy):
         return params
 
     def _make_reservoir(self, handpicked_addresses):
+        if self.stakers_map is not None:
+            stakers_map = {address: stake for address, stake in self.stakers_map.items()
+                           if address not in handpicked_addresses}
+            return MergedReservoir(handpicked_addresses, StakersReservoir(stakers_map))
+
         try:
             reservoir = self.alice.get_stakers_reservoir(duration=self.duration_periods,
                                                          without=handpicked_addresses)
@@ -613,13 +722,15 @@ class BlockchainPolicy(Policy):
         addresses = [ursula.checksum_address for ursula in ursulas]
 
         # Transact  # TODO: Move this logic to BlockchainPolicyActor
-        receipt = self.alice.policy_agent.create_policy(
-            policy_id=self.hrac,  # bytes16 _policyID
-            author_address=self.alice.checksum_address,
-            value=self.value,
-            end_timestamp=self.expiration.epoch,  # uint16 _numberOfPeriods
-            node_addresses=addresses  # address[] memory _nodes
-        )
+        # Concurrent grants (see Alice.bulk_grant) would otherwise send transactions with the same nonce.
+        with self.alice._policy_publication_lock:
+            receipt = self.alice.policy_agent.create_policy(
+                policy_id=self.hrac,  # bytes16 _policyID
+                author_address=self.alice.checksum_address,
+                value=self.value,
+                end_timestamp=self.expiration.epoch,  # uint16 _numberOfPeriods
+                node_addresses=addresses  # address[] memory _nodes
+            )
 
         # Capture Response
         return receipt['transactionHash']
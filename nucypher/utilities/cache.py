@@ -0,0 +1,150 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    A thread-safe mapping holding at most `maxsize` entries; once full, adding
+    an entry evicts the least recently used one.
+
+    If given, `on_evict` is called with the key and value of every entry the cache drops by itself,
+    whether evicted, replaced or cleared (but not those handed back by `pop`).
+    """
+
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        evicted = list()
+        with self._lock:
+            replaced = self._entries.get(key)
+            if replaced is not None and replaced is not value:
+                evicted.append((key, replaced))
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False))
+        self._evict(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._entries.items())
+            self._entries.clear()
+        self._evict(evicted)
+
+    def _evict(self, entries: List[Tuple[Hashable, Any]]) -> None:
+        if self._on_evict:
+            for key, value in entries:
+                self._on_evict(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlightCache:
+    """
+    Caches the results of an expensive lookup for `ttl` seconds, in an LRU cache of `maxsize` entries.
+
+    Concurrent lookups of the same key are collapsed into a single call to the loader (a "single flight"):
+    the first caller runs it, and the rest wait for its result.  Errors raised by the loader reach
+    all the waiting callers, but are not cached, and neither are results rejected by `cache_if`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        self.ttl = ttl
+        self._clock = clock
+        self._results = LRUCache(maxsize=maxsize)
+        self._in_flight: Dict[Hashable, Future] = dict()
+        self._lock = Lock()
+
+    def get_or_load(self,
+                    key: Hashable,
+                    loader: Callable[[], Any],
+                    cache_if: Optional[Callable[[Any], bool]] = None
+                    ) -> Any:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                value, expires_at = cached
+                if self._clock() < expires_at:
+                    return value
+                self._results.pop(key)
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+
+        if not leader:
+            return flight.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            if cache_if is None or cache_if(value):
+                self._results[key] = (value, self._clock() + self.ttl)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Forgets the cached result for `key`, or all of them if no key is given."""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key)
@@ -16,6 +16,7 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import time
+from concurrent.futures import Executor
 from queue import Queue, Empty
 from threading import Thread, Event, Lock, Timer, get_ident
 from typing import Callable, List, Any, Optional, Dict
@@ -67,6 +68,9 @@ class SetOnce:
             self._set_event.clear()
             return value
 
+    def wait(self, timeout: float = None) -> bool:
+        return self._set_event.wait(timeout)
+
     def get(self):
         self._set_event.wait()
         return self._value
@@ -78,6 +82,13 @@ class WorkerPool:
     drawn from the given value factory object,
     and wait for their completion and a given number of successes
     (a worker returning something without throwing an exception).
+
+    Instead of a thread pool of its own, the workers can be run on a shared `executor`,
+    which the pool neither starts nor shuts down.  The pool then has no service threads either:
+    the values are produced in a task of the executor (which sleeps there between batches,
+    if `stagger_timeout` is set), the results are processed by the workers as they finish,
+    and the timeout only starts once the first worker starts running, so that the time spent
+    queued behind the tasks of other pools doesn't count against it.
     """
 
     class TimedOut(Exception):
@@ -92,7 +103,8 @@ class WorkerPool:
                  target_successes,
                  timeout: float,
                  stagger_timeout: float = 0,
-                 threadpool_size: int = None):
+                 threadpool_size: int = None,
+                 executor: Executor = None):
 
         # TODO: make stagger_timeout a part of the value factory?
 
@@ -102,32 +114,46 @@ class WorkerPool:
         self._stagger_timeout = stagger_timeout
         self._target_successes = target_successes
 
-        thread_pool_kwargs = {}
-        if threadpool_size is not None:
-            thread_pool_kwargs['minthreads'] = threadpool_size
-            thread_pool_kwargs['maxthreads'] = threadpool_size
-        self._threadpool = ThreadPool(**thread_pool_kwargs)
-
-        # These three tasks must be run in separate threads
-        # to avoid being blocked by workers in the thread pool.
-        self._bail_on_timeout_thread = Thread(target=self._bail_on_timeout)
-        self._produce_values_thread = Thread(target=self._produce_values)
-        self._process_results_thread = Thread(target=self._process_results)
+        self._executor = executor
+        if executor is not None:
+            if threadpool_size is not None:
+                raise ValueError("The thread pool size can't be set when using a shared executor.")
+            self._threadpool = None
+            self._deadline = None  # Set once the first worker starts running
+            self._finished = Event()
+        else:
+            thread_pool_kwargs = {}
+            if threadpool_size is not None:
+                thread_pool_kwargs['minthreads'] = threadpool_size
+                thread_pool_kwargs['maxthreads'] = threadpool_size
+            self._threadpool = ThreadPool(**thread_pool_kwargs)
+
+            # These three tasks must be run in separate threads
+            # to avoid being blocked by workers in the thread pool.
+            self._bail_on_timeout_thread = Thread(target=self._bail_on_timeout)
+            self._produce_values_thread = Thread(target=self._produce_values)
+            self._process_results_thread = Thread(target=self._process_results)
 
         self._successes = {}
         self._failures = {}
         self._started_tasks = 0
         self._finished_tasks = 0
+        self._producer_stopped = False
+        self._success_event_reached = False
 
         self._cancel_event = Event()
         self._result_queue = Queue()
         self._target_value = SetOnce()
         self._unexpected_error = SetOnce()
         self._results_lock = Lock()
+        self._processing_lock = Lock()
         self._stopped = False
 
     def start(self):
         # TODO: check if already started?
+        if self._executor is not None:
+            self._executor.submit(self._produce_values)
+            return
         self._threadpool.start()
         self._produce_values_thread.start()
         self._process_results_thread.start()
@@ -148,15 +174,18 @@ class WorkerPool:
         if self._stopped:
             return # or raise AlreadyStopped?
 
-        self._produce_values_thread.join()
-        self._process_results_thread.join()
-        self._bail_on_timeout_thread.join()
+        if self._executor is not None:
+            self._finished.wait()
+        else:
+            self._produce_values_thread.join()
+            self._process_results_thread.join()
+            self._bail_on_timeout_thread.join()
 
-        # protect from a possible race
-        try:
-            self._threadpool.stop()
-        except AlreadyQuit:
-            pass
+            # protect from a possible race
+            try:
+                self._threadpool.stop()
+            except AlreadyQuit:
+                pass
         self._stopped = True
 
         if self._unexpected_error.is_set():
@@ -181,6 +210,8 @@ class WorkerPool:
             e = self._unexpected_error.get_and_clear()
             raise RuntimeError(f"Unexpected error in the producer thread: {e}")
 
+        if self._executor is not None:
+            self._wait_for_deadline()
         result = self._target_value.get()
         if result == TIMEOUT_TRIGGERED:
             raise self.TimedOut()
@@ -210,53 +241,100 @@ class WorkerPool:
             self._target_value.set(TIMEOUT_TRIGGERED)
         self._cancel_event.set()
 
+    def _check_deadline(self):
+        """
+        Starts the timeout if it hasn't started yet, and cancels the pool if it has run out.
+        Used instead of the timeout thread when running on a shared executor.
+        """
+        with self._results_lock:
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self._timeout
+            deadline = self._deadline
+        if time.monotonic() >= deadline:
+            self._target_value.set(TIMEOUT_TRIGGERED)
+            self.cancel()
+
+    def _wait_for_deadline(self):
+        """
+        Waits for the target value to be set, setting it on timeout
+        even if the workers that are still running don't finish.
+        """
+        while not self._cancel_event.is_set():
+            deadline = self._deadline
+            timeout = self._timeout if deadline is None else deadline - time.monotonic()
+            if self._target_value.wait(timeout=max(timeout, 0)):
+                break
+            if deadline is not None:
+                self._check_deadline()
+
+    def _report(self, result):
+        """
+        Sends a result to the processing thread or, on a shared executor, processes it right away.
+        """
+        if self._executor is None:
+            self._result_queue.put(result)
+            return
+        with self._processing_lock:
+            finished = self._process_result(result)
+        if finished:
+            self._finished.set()
+
     def _worker_wrapper(self, value):
         """
         A wrapper that catches exceptions thrown by the worker
         and sends the results to the processing thread.
         """
         try:
+            if self._executor is not None:
+                self._check_deadline()
+
             # If we're in the cancelled state, interrupt early
             self._sleep(0)
 
             result = self._worker(value)
-            self._result_queue.put(Success(value, result))
+            if self._executor is not None:
+                self._check_deadline()
+            self._report(Success(value, result))
         except Cancelled as e:
-            self._result_queue.put(e)
+            self._report(e)
         except BaseException as e:
-            self._result_queue.put(Failure(value, str(e)))
+            self._report(Failure(value, str(e)))
 
     def _process_results(self):
         """
         A service thread that processes worker results
         and waits for the target number of successes to be reached.
         """
-        producer_stopped = False
-        success_event_reached = False
-        while True:
-            result = self._result_queue.get()
-
-            if result == PRODUCER_STOPPED:
-                producer_stopped = True
-            else:
-                self._finished_tasks += 1
-                if isinstance(result, Success):
-                    with self._results_lock:
-                        self._successes[result.value] = result.result
-                        len_successes = len(self._successes)
-                    if not success_event_reached and len_successes == self._target_successes:
-                        # A protection for the case of repeating values.
-                        # Only trigger the target value once.
-                        success_event_reached = True
-                        self._target_value.set(self.get_successes())
-                if isinstance(result, Failure):
-                    with self._results_lock:
-                        self._failures[result.value] = result.exception
-
-            if producer_stopped and self._finished_tasks == self._started_tasks:
-                self.cancel() # to cancel the timeout thread
-                self._target_value.set(PRODUCER_STOPPED)
-                break
+        while not self._process_result(self._result_queue.get()):
+            pass
+
+    def _process_result(self, result) -> bool:
+        """
+        Records a worker result, or the end of the producer.
+        Returns whether the producer has stopped and all of the tasks it started have finished.
+        """
+        if result == PRODUCER_STOPPED:
+            self._producer_stopped = True
+        else:
+            self._finished_tasks += 1
+            if isinstance(result, Success):
+                with self._results_lock:
+                    self._successes[result.value] = result.result
+                    len_successes = len(self._successes)
+                if not self._success_event_reached and len_successes == self._target_successes:
+                    # A protection for the case of repeating values.
+                    # Only trigger the target value once.
+                    self._success_event_reached = True
+                    self._target_value.set(self.get_successes())
+            if isinstance(result, Failure):
+                with self._results_lock:
+                    self._failures[result.value] = result.exception
+
+        if self._producer_stopped and self._finished_tasks == self._started_tasks:
+            self.cancel() # to cancel the timeout thread
+            self._target_value.set(PRODUCER_STOPPED)
+            return True
+        return False
 
     def _produce_values(self):
         while True:
@@ -267,12 +345,16 @@ class WorkerPool:
                 if not batch:
                     break
 
-                self._started_tasks += len(batch)
+                with self._processing_lock:
+                    self._started_tasks += len(batch)
                 for value in batch:
                     # There is a possible race between `callInThread()` and `stop()`,
                     # But we never execute them at the same time,
                     # because `join()` checks that the producer thread is stopped.
-                    self._threadpool.callInThread(self._worker_wrapper, value)
+                    if self._executor is not None:
+                        self._executor.submit(self._worker_wrapper, value)
+                    else:
+                        self._threadpool.callInThread(self._worker_wrapper, value)
 
                 self._sleep(self._stagger_timeout)
 
@@ -284,7 +366,7 @@ class WorkerPool:
                 self.cancel()
                 break
 
-        self._result_queue.put(PRODUCER_STOPPED)
+        self._report(PRODUCER_STOPPED)
 
 
 class AllAtOnceFactory:
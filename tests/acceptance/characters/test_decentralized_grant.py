@@ -58,6 +58,24 @@ def test_decentralized_grant(blockchain_alice, blockchain_bob, blockchain_ursula
             assert bool(retrieved_kfrag) # TODO: try to assemble them back?
 
 
+def test_decentralized_bulk_grant(blockchain_alice, blockchain_bob, blockchain_ursulas, agency):
+    labels = [f"bulk_grant_{index}".encode() for index in range(4)]
+    results = list(blockchain_alice.bulk_grant(grants=[(blockchain_bob, label) for label in labels],
+                                               max_concurrent_grants=4,
+                                               m=2,
+                                               n=3,
+                                               rate=int(1e18),  # one ether
+                                               expiration=maya.now() + datetime.timedelta(days=5)))
+
+    # The policy transactions are sent one at a time, so none of them replaces another.
+    assert sorted(label for _bob, label, _policy in results) == labels
+    for _bob, label, policy in results:
+        assert not isinstance(policy, Exception), f"Granting {label} failed: {policy}"
+        assert len(policy.treasure_map.destinations) == 3
+        _record, owner = blockchain_alice.policy_agent.fetch_policy(policy_id=policy.hrac, with_owner=True)
+        assert owner == blockchain_alice.checksum_address
+
+
 def test_alice_sets_treasure_map_decentralized(enacted_blockchain_policy, blockchain_alice, blockchain_bob):
     """
     Same as test_alice_sets_treasure_map except with a blockchain policy.
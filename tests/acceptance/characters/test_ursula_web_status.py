@@ -19,6 +19,9 @@ import os
 import pytest
 import tempfile
 
+from nucypher.characters.lawful import Ursula
+from nucypher.network.nodes import NodeSprout
+
 
 @pytest.fixture(scope='module')
 def ursula(blockchain_ursulas):
@@ -46,6 +49,23 @@ def test_ursula_html_renders(ursula, client):
     assert str(ursula.nickname).encode() in response.data
 
 
+def test_ursula_html_shows_sprouts_without_maturing_them(ursula, client, blockchain_ursulas):
+    stranger = list(blockchain_ursulas)[0]
+    known_stranger = ursula.known_nodes[stranger.checksum_address] \
+        if stranger.checksum_address in ursula.known_nodes else None
+    sprout = Ursula.from_bytes(bytes(stranger))
+    ursula.known_nodes[sprout.checksum_address] = sprout
+    try:
+        response = client.get('/status/')
+        assert response.status_code == 200
+        assert str(sprout.nickname).encode() in response.data
+        assert sprout.rest_url().encode() in response.data
+        assert isinstance(sprout, NodeSprout)
+    finally:
+        if known_stranger is not None:
+            ursula.known_nodes[stranger.checksum_address] = known_stranger
+
+
 def test_decentralized_json_status_endpoint(ursula, client):
     response = client.get('/status/?json=true')
     assert response.status_code == 200
@@ -16,7 +16,9 @@
 """
 
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, Tuple, List, Callable
 
 import pytest
@@ -255,6 +257,70 @@ def test_batched_value_generation(join_worker_pool):
     assert all(value in successes_copy for value in successes)
 
 
+def test_shared_executor():
+    """
+    Tests that pools can run their workers on a shared executor, which outlives them.
+    """
+
+    outcomes, worker = generate_workers(
+        [(WorkerRule(timeout_min=0.1, timeout_max=0.2), 20)],
+        seed=123)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        for _ in range(3):
+            factory = AllAtOnceFactory(list(outcomes))
+            pool = WorkerPool(worker, factory, target_successes=10, timeout=10, executor=executor)
+            pool.start()
+            successes = pool.block_until_target_successes()
+            pool.join()
+            assert len(successes) >= 10
+            assert len(pool.get_successes()) == 20
+
+        # The executor is still usable once the pools are done with it.
+        assert executor.submit(lambda: 'still here').result() == 'still here'
+
+        with pytest.raises(ValueError):
+            WorkerPool(worker, factory, target_successes=10, timeout=10, threadpool_size=10, executor=executor)
+
+
+def test_shared_executor_timeout_starts_with_the_workers():
+    """
+    Tests that on a shared executor, the pool starts no threads of its own,
+    and the time spent queued behind other tasks doesn't count against its timeout.
+    """
+
+    outcomes, worker = generate_workers(
+        [(WorkerRule(timeout_min=0.1, timeout_max=0.1), 5),
+         (WorkerRule(timeout_min=5, timeout_max=5), 5)],
+        seed=123)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        # Keep the executor busy for longer than the pool's timeout.
+        busy = [executor.submit(time.sleep, 1.5) for _ in range(10)]
+        threads_before = threading.active_count()
+
+        pool = WorkerPool(worker, AllAtOnceFactory(list(outcomes)), target_successes=5, timeout=1, executor=executor)
+        pool.start()
+        assert threading.active_count() == threads_before
+        t_start = time.monotonic()
+        successes = pool.block_until_target_successes()
+        assert time.monotonic() - t_start > 1.5
+        assert len(successes) == 5
+
+        # The slow workers still time out.
+        pool = WorkerPool(worker, AllAtOnceFactory(list(outcomes)), target_successes=10, timeout=1, executor=executor)
+        pool.start()
+        t_start = time.monotonic()
+        with pytest.raises(WorkerPool.TimedOut):
+            pool.block_until_target_successes()
+        assert time.monotonic() - t_start < 2
+        pool.cancel()
+        pool.join()
+
+        for future in busy:
+            future.result()
+
+
 def test_cancel_waiting_workers(join_worker_pool):
     """
     If we have a small pool and many workers, it is possible for workers to be enqueued
@@ -107,6 +107,39 @@ def test_alice_web_character_control_grant(alice_web_controller_test_client, gra
     assert b'non-hexadecimal number found in fromhex' in response.data
 
 
+def test_alice_web_character_control_bulk_grant(alice_web_controller_test_client, federated_bob):
+    labels = ['bulk-grant-1', 'bulk-grant-2', 'bulk-grant-3']
+    grantee = {
+        'bob_encrypting_key': bytes(federated_bob.public_keys(DecryptingPower)).hex(),
+        'bob_verifying_key': bytes(federated_bob.stamp).hex(),
+    }
+    request_data = {
+        'grants': [dict(grantee, label=label) for label in labels],
+        'm': 2,
+        'n': 3,
+        'expiration': (maya.now() + datetime.timedelta(days=3)).iso8601(),
+    }
+
+    response = alice_web_controller_test_client.put('/bulk_grant', data=json.dumps(request_data))
+    assert response.status_code == 200
+
+    response_data = json.loads(response.data)
+    assert 'alice_verifying_key' in response_data['result']
+    grants = response_data['result']['grants']
+    assert sorted(grant['label'] for grant in grants) == labels
+    for grant in grants:
+        assert 'error' not in grant
+        assert grant['bob_verifying_key'] == grantee['bob_verifying_key']
+        assert 'policy_encrypting_key' in grant
+        encrypted_map = TreasureMap.from_bytes(b64decode(grant['treasure_map']))
+        assert encrypted_map._hrac is not None
+
+    # Each grant needs its own label
+    del(request_data['grants'][0]['label'])
+    response = alice_web_controller_test_client.put('/bulk_grant', data=json.dumps(request_data))
+    assert response.status_code == 400
+
+
 def test_alice_character_control_revoke(alice_web_controller_test_client, federated_bob):
     bob_pubkey_enc = federated_bob.public_keys(DecryptingPower)
 
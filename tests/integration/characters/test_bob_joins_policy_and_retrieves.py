@@ -20,10 +20,12 @@ import maya
 import os
 import pytest
 import time
+from io import BytesIO
 from constant_sorrow.constants import NO_DECRYPTION_PERFORMED
 from twisted.internet.task import Clock
 
 from nucypher.characters.lawful import Bob, Enrico, Ursula
+from nucypher.crypto.api import UndecryptableMessageKit
 from nucypher.policy.collections import TreasureMap
 from tests.constants import (MOCK_POLICY_DEFAULT_M, NUMBER_OF_URSULAS_IN_DEVELOPMENT_NETWORK)
 from nucypher.config.constants import TEMPORARY_DOMAIN
@@ -228,6 +230,83 @@ def test_bob_retrieves_with_treasure_map(
     assert text1[0] == text2[0] == b'Welcome to flippering number 2.'
 
 
+def test_bob_retrieves_a_stream(federated_bob, federated_ursulas, enacted_federated_policy, capsule_side_channel):
+    enrico = capsule_side_channel.enrico
+    payload = os.urandom(5 * 1024 + 7)
+
+    ciphertext = BytesIO()
+    enrico.encrypt_stream(plaintext=BytesIO(payload), ciphertext=ciphertext, chunk_size=1024)
+    ciphertext.seek(0)
+
+    plaintext = BytesIO()
+    decrypted_bytes = federated_bob.retrieve_stream(ciphertext=ciphertext,
+                                                    plaintext=plaintext,
+                                                    enrico=enrico,
+                                                    alice_verifying_key=enacted_federated_policy.alice_verifying_key,
+                                                    label=enacted_federated_policy.label,
+                                                    treasure_map=enacted_federated_policy.treasure_map)
+    assert decrypted_bytes == len(payload)
+    assert plaintext.getvalue() == payload
+
+
+def test_bob_retrieves_a_batch(federated_bob, federated_ursulas, enacted_federated_policy, capsule_side_channel):
+    enrico = capsule_side_channel.enrico
+    plaintexts = [b'first', b'second', b'third', b'fourth']
+    message_kits = [enrico.encrypt_message(plaintext)[0] for plaintext in plaintexts]
+
+    # This one claims to come from Enrico, but doesn't.
+    impostor = Enrico(policy_encrypting_key=enacted_federated_policy.public_key)
+    forged_message_kit, _signature = impostor.encrypt_message(b'forged')
+    forged_message_kit.sender_verifying_key = enrico.stamp.as_umbral_pubkey()
+    message_kits.insert(2, forged_message_kit)
+
+    results = federated_bob.retrieve_batch(*message_kits,
+                                           enrico=enrico,
+                                           alice_verifying_key=enacted_federated_policy.alice_verifying_key,
+                                           label=enacted_federated_policy.label,
+                                           treasure_map=enacted_federated_policy.treasure_map,
+                                           processes=2,
+                                           batch_size=2)
+
+    assert isinstance(results.pop(2), UndecryptableMessageKit)
+    assert results == plaintexts
+    assert all(len(message_kit.capsule) == 0 for message_kit in message_kits)
+
+
+def test_bob_retrieves_from_cfrag_cache(federated_alice, federated_ursulas, tmpdir):
+    cache_parameters = dict(federated_only=True,
+                            domain=TEMPORARY_DOMAIN,
+                            known_nodes=federated_ursulas,
+                            cfrag_cache_filepath=str(tmpdir),
+                            cfrag_cache_size=100)
+    bob = Bob(network_middleware=MockRestMiddleware(), **cache_parameters)
+
+    label = b'label://' + os.urandom(32)
+    expiration = maya.now() + datetime.timedelta(days=5)
+    policy = federated_alice.grant(bob=bob, label=label, m=2, n=3, expiration=expiration)
+
+    enrico = Enrico(policy_encrypting_key=policy.public_key)
+    plaintexts = [b'Tell me', b'again']
+    message_kits = [enrico.encrypt_message(plaintext)[0] for plaintext in plaintexts]
+    retrieval_parameters = dict(enrico=enrico,
+                                alice_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                                label=label,
+                                treasure_map=bytes(policy.treasure_map),
+                                policy_expiration=expiration)
+
+    assert bob.retrieve(*message_kits, **retrieval_parameters) == plaintexts
+    assert len(bob._cfrag_cache) == len(message_kits) * policy.treasure_map.m
+
+    # A new Bob with the same identity, as after a restart, retrieves the messages without asking any Ursula.
+    restarted_bob = Bob(crypto_power=bob._crypto_power, network_middleware=MockRestMiddleware(), **cache_parameters)
+    restarted_bob.network_middleware.reencrypt = None
+    restarted_bob.follow_treasure_map = None
+    assert restarted_bob.retrieve(*message_kits, **retrieval_parameters) == plaintexts
+
+    bob.disenchant()
+    restarted_bob.disenchant()
+
+
 def test_bob_retrieves_too_late(federated_bob, federated_ursulas,
                                 enacted_federated_policy, capsule_side_channel):
 
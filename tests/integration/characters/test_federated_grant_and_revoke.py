@@ -126,3 +126,27 @@ def test_revocation(federated_alice, federated_bob):
     # Try to revoke the already revoked policy
     already_revoked = federated_alice.revoke(policy)
     assert len(already_revoked) == 3
+    for _revocation, error in already_revoked.values():
+        assert isinstance(error, federated_alice.network_middleware.NotFound)
+
+
+def test_federated_revoke_many_policies(federated_alice, federated_bob, federated_ursulas):
+    m, n = 2, 3
+    policy_end_datetime = maya.now() + datetime.timedelta(days=5)
+    labels = [b"revoke-many-" + bytes([i]) for i in range(4)]
+    policies = [federated_alice.grant(federated_bob, label, m=m, n=n, expiration=policy_end_datetime)
+                for label in labels]
+
+    reports = federated_alice.revoke_policies(policies, max_concurrent_revocations=2)
+    assert set(reports) == {policy.id for policy in policies}
+    for policy in policies:
+        report = reports[policy.id]
+        assert report.succeeded
+        assert report.confirmed == policy.revocation_kit.revokable_addresses
+
+    # Revoking them again reaches every node, but none of them has anything left to revoke.
+    reports = federated_alice.revoke_policies(policies)
+    for policy in policies:
+        report = reports[policy.id]
+        assert not report.confirmed
+        assert set(report.failed) == policy.revocation_kit.revokable_addresses
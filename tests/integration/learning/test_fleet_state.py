@@ -15,7 +15,9 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import os
 from constant_sorrow.constants import FLEET_STATES_MATCH, NO_KNOWN_NODES
+from eth_utils import to_checksum_address
 from functools import partial
 from hendrix.experience import crosstown_traffic
 from hendrix.utils.test_utils import crosstownTaskListDecoratorFactory
@@ -105,6 +107,61 @@ def test_state_is_recorded_after_learning(federated_ursulas, lonely_ursula_maker
     assert len(states[1].nodes) == len(federated_ursulas) + 1  # When we ran learn_from_teacher_node, we also loaded the rest of the fleet.
 
 
+def test_learner_asks_several_teachers_per_round(federated_ursulas, lonely_ursula_maker):
+    _lonely_ursula_maker = partial(lonely_ursula_maker, quantity=1)
+    lonely_learner = _lonely_ursula_maker().pop()
+    for teacher in list(federated_ursulas)[:3]:
+        lonely_learner.remember_node(teacher)
+    lonely_learner._teachers_per_round = 3
+
+    sprouts = lonely_learner.learn_from_teacher_node()
+
+    # All three teachers know the whole fleet, but each node is only learned about once.
+    addresses = [sprout.checksum_address for sprout in sprouts]
+    assert len(addresses) == len(set(addresses))
+    assert len(lonely_learner.known_nodes) == len(federated_ursulas)
+
+    # That round taught us about new nodes, so the next one asks more teachers...
+    assert lonely_learner._teachers_per_round == 6
+
+    # ...but there's nothing new left to learn, so the one after asks fewer again.
+    lonely_learner.learn_from_teacher_node()
+    assert lonely_learner._teachers_per_round == 3
+
+
+def test_learner_asks_teachers_only_for_the_nodes_it_needs(federated_ursulas, lonely_ursula_maker):
+    _lonely_ursula_maker = partial(lonely_ursula_maker, quantity=1)
+    lonely_learner = _lonely_ursula_maker().pop()
+    teacher, needed_ursula = list(federated_ursulas)[:2]
+    lonely_learner.remember_node(teacher)
+
+    lonely_learner._node_ids_to_learn_about_immediately.add(needed_ursula.checksum_address)
+    sprouts = lonely_learner.learn_from_teacher_node()
+
+    # The teacher only sent the node we needed, along with itself.
+    assert {sprout.checksum_address for sprout in sprouts} == {needed_ursula.checksum_address,
+                                                                teacher.checksum_address}
+    assert needed_ursula.checksum_address in lonely_learner.known_nodes
+    assert not lonely_learner._node_ids_to_learn_about_immediately
+
+
+def test_learner_exchanges_the_fleet_the_round_after_a_partial_answer(federated_ursulas, lonely_ursula_maker):
+    _lonely_ursula_maker = partial(lonely_ursula_maker, quantity=1)
+    lonely_learner = _lonely_ursula_maker().pop()
+    teacher = list(federated_ursulas)[0]
+    lonely_learner.remember_node(teacher)
+
+    # No one knows of this node, so the teacher can only send itself.
+    lonely_learner._node_ids_to_learn_about_immediately.add(to_checksum_address(os.urandom(20)))
+    sprouts = lonely_learner.learn_from_teacher_node()
+    assert {sprout.checksum_address for sprout in sprouts} == {teacher.checksum_address}
+
+    # The whole fleet is only exchanged in the next round.
+    sprouts = lonely_learner.learn_from_teacher_node()
+    assert len(sprouts) > 1
+    assert not lonely_learner._full_exchange_due
+
+
 def test_teacher_records_new_fleet_state_upon_hearing_about_new_node(federated_ursulas, lonely_ursula_maker):
     _lonely_ursula_maker = partial(lonely_ursula_maker, quantity=1)
     lonely_learner = _lonely_ursula_maker().pop()
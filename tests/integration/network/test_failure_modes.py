@@ -27,7 +27,7 @@ from twisted.internet import threads
 
 from nucypher.policy.collections import TreasureMap
 from nucypher.policy.policies import Policy
-from tests.utils.middleware import EvilMiddleWare, NodeIsDownMiddleware
+from tests.utils.middleware import EvilMiddleWare, NodeIsDownMiddleware, SomeNodesRefuseKFragsMiddleware
 from tests.utils.ursula import make_federated_ursulas
 
 
@@ -91,6 +91,28 @@ def test_alice_can_grant_even_when_the_first_nodes_she_tries_are_down(federated_
     assert len(policy.treasure_map.destinations) == n
 
 
+def test_partially_enacted_policies_are_revoked(federated_alice, federated_bob, federated_ursulas):
+    m, n = 2, 3
+    policy_end_datetime = maya.now() + datetime.timedelta(days=5)
+    label = b"this_is_the_path_to_which_partial_access_was_granted"
+    federated_alice.known_nodes._nodes = {}
+    federated_alice.network_middleware = SomeNodesRefuseKFragsMiddleware()
+
+    # All of the nodes accept arrangements, but only two of them take their kfrags.
+    for node in federated_ursulas:
+        federated_alice.remember_node(node)
+    for node in list(federated_ursulas)[2:]:
+        federated_alice.network_middleware.node_refuses_kfrags(node)
+
+    with pytest.raises(Policy.NotEnoughUrsulas):
+        federated_alice.grant(federated_bob, label, m=m, n=n, expiration=policy_end_datetime, timeout=1)
+
+    # The kfrags that were handed out are taken back before giving up.
+    middleware = federated_alice.network_middleware
+    assert 0 < len(middleware.enacted_arrangement_ids) < n
+    assert middleware.revoked_arrangement_ids == middleware.enacted_arrangement_ids
+
+
 def test_node_has_changed_cert(federated_alice, federated_ursulas):
     federated_alice.known_nodes._nodes = {}
     federated_alice.network_middleware = NodeIsDownMiddleware()
@@ -16,10 +16,12 @@
 """
 
 import pytest
+import time
 
 from nucypher.characters.lawful import Ursula
 from nucypher.crypto.api import keccak_digest
 from nucypher.datastore.models import TreasureMap as DatastoreTreasureMap
+from nucypher.network.middleware import treasure_map_etag
 from nucypher.policy.collections import TreasureMap as FederatedTreasureMap
 from tests.utils.middleware import MockRestMiddleware
 
@@ -96,6 +98,46 @@ def test_bob_can_retrieve_the_treasure_map_and_decrypt_it(federated_alice, feder
     assert enacted_federated_policy.treasure_map == treasure_map_from_wire
 
 
+def test_bob_conditionally_refetches_the_treasure_map(federated_alice, federated_bob, enacted_federated_policy):
+    """
+    Once Bob has the TreasureMap, Ursulas holding the same one don't send it to him again.
+    """
+    map_identifier = federated_bob.construct_map_id(federated_alice.stamp, enacted_federated_policy.label)
+    known_treasure_map = federated_bob.treasure_maps[map_identifier]
+    etag = treasure_map_etag(bytes(known_treasure_map))
+
+    an_ursula = federated_bob.matching_nodes_among(federated_alice.known_nodes)[0]
+    response = federated_bob.network_middleware.get_treasure_map_from_node(an_ursula, map_identifier)
+    assert response.status_code == 200
+    assert response.content == bytes(known_treasure_map)
+
+    response = federated_bob.network_middleware.get_treasure_map_from_node(an_ursula, map_identifier, etag=etag)
+    assert response.status_code == 304
+    assert not response.content
+
+    # Bob keeps the map he already has, already oriented.
+    assert federated_bob.get_treasure_map(federated_alice.stamp, enacted_federated_policy.label) is known_treasure_map
+
+
+def test_bob_finds_the_treasure_map_around_slow_nodes(federated_alice, federated_bob, enacted_federated_policy):
+    """
+    Bob asks a few nodes at a time for the TreasureMap, so nodes that are slow to answer don't hold up his lookup.
+    """
+    map_identifier = federated_bob.construct_map_id(federated_alice.stamp, enacted_federated_policy.label)
+    fast_node = federated_bob.matching_nodes_among(federated_alice.known_nodes)[0]
+
+    class SlowNodesMiddleware(MockRestMiddleware):
+        def get_treasure_map_from_node(self, node, *args, **kwargs):
+            if node != fast_node:
+                time.sleep(5)
+            return super().get_treasure_map_from_node(node, *args, **kwargs)
+
+    started = time.monotonic()
+    treasure_map = federated_bob.get_treasure_map_from_known_ursulas(SlowNodesMiddleware(), map_identifier, timeout=10)
+    assert time.monotonic() - started < 4
+    assert treasure_map == enacted_federated_policy.treasure_map
+
+
 def test_treasure_map_is_legit(federated_bob, enacted_federated_policy):
     """
     Sure, the TreasureMap can get to Bob, but we also need to know that each Ursula in the TreasureMap is on the network.
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the throughput of granting many policies against a local federated fleet,
+comparing one `Alice.grant` call per policy against `Alice.bulk_grant`,
+for several numbers of concurrent grants.
+"""
+
+
+import datetime
+import lmdb
+import maya
+import os
+import tabulate
+import time
+from typing import Callable, List
+
+import nucypher.characters.lawful
+from nucypher.characters.lawful import Alice, Bob
+from tests.mock.datastore import mock_lmdb_open
+from tests.utils.config import (
+    make_alice_test_configuration,
+    make_bob_test_configuration,
+    make_ursula_test_configuration
+)
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT, make_federated_ursulas
+
+# Tuning
+FLEET_SIZE: int = 10
+CONCURRENT_GRANTS: List[int] = [1, 8, 32]
+TOTAL_GRANTS: int = 64
+
+# Policy Parameters
+M: int = 2
+N: int = 3
+DURATION: datetime.timedelta = datetime.timedelta(days=1)
+
+
+def make_fleet():
+    # Ursulas keep their datastores in memory, as in the test suite.
+    lmdb.open = mock_lmdb_open
+
+    # The local fleet doesn't care about the mainnet probationary period.
+    nucypher.characters.lawful.END_OF_POLICIES_PROBATIONARY_PERIOD = maya.now() + 2 * DURATION
+
+    ursula_config = make_ursula_test_configuration(federated=True, rest_port=MOCK_URSULA_STARTING_PORT)
+    ursulas = make_federated_ursulas(ursula_config=ursula_config, quantity=FLEET_SIZE)
+    alice = make_alice_test_configuration(federated=True, known_nodes=ursulas).produce()
+    bob = make_bob_test_configuration(federated=True, known_nodes=ursulas).produce()
+    return alice, bob
+
+
+def grant_sequentially(alice: Alice, bob: Bob, labels: List[bytes]) -> None:
+    for label in labels:
+        alice.grant(bob, label, m=M, n=N, expiration=maya.now() + DURATION)
+
+
+def grant_in_bulk(alice: Alice, bob: Bob, labels: List[bytes], concurrent_grants: int) -> None:
+    results = alice.bulk_grant(grants=[(bob, label) for label in labels],
+                               max_concurrent_grants=concurrent_grants,
+                               m=M, n=N, expiration=maya.now() + DURATION)
+    for _bob, label, result in results:
+        if isinstance(result, Exception):
+            raise RuntimeError(f"Failed to grant {label}") from result
+
+
+def measure(grant: Callable[[List[bytes]], None]) -> float:
+    """Returns the throughput, in policies per second, of granting TOTAL_GRANTS policies."""
+    labels = [os.urandom(16) for _ in range(TOTAL_GRANTS)]
+    start = time.perf_counter()
+    grant(labels)
+    elapsed = time.perf_counter() - start
+    return TOTAL_GRANTS / elapsed
+
+
+def benchmark() -> None:
+    alice, bob = make_fleet()
+
+    throughput = measure(lambda labels: grant_sequentially(alice, bob, labels))
+    rows = [['sequential', f"{throughput:,.1f}"]]
+    for concurrent_grants in CONCURRENT_GRANTS:
+        throughput = measure(lambda labels: grant_in_bulk(alice, bob, labels, concurrent_grants))
+        rows.append([f'bulk ({concurrent_grants} concurrent)', f"{throughput:,.1f}"])
+
+    headers = ['Strategy', 'Throughput (policies/s)']
+    print(tabulate.tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+if __name__ == '__main__':
+    benchmark()
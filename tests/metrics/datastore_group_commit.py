@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the throughput of persisting Workorder records, comparing one write
+transaction per record (`Datastore.describe`) against group commits
+(`RecordAppender.append`), for several numbers of concurrent writers.
+"""
+
+
+import os
+import shutil
+import tabulate
+import tempfile
+import time
+import uuid
+from threading import Thread
+from typing import Callable, List
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signer
+
+from nucypher.datastore.appender import RecordAppender
+from nucypher.datastore.datastore import Datastore
+from nucypher.datastore.models import Workorder
+
+# Tuning
+CONCURRENT_WRITERS: List[int] = [1, 8, 64]
+WRITES_PER_WRITER: int = 2_000 // 64
+TOTAL_WRITES: int = WRITES_PER_WRITER * 64
+
+
+def make_workorder_fields() -> dict:
+    bob_signing_key = UmbralPrivateKey.gen_key()
+    return dict(arrangement_id=os.urandom(32),
+                bob_verifying_key=bob_signing_key.pubkey,
+                bob_signature=Signer(bob_signing_key)(b'work order receipt'))
+
+
+def write_per_transaction(datastore: Datastore, fields: dict) -> Callable[[], None]:
+    def write():
+        with datastore.describe(Workorder, str(uuid.uuid4()), writeable=True) as new_workorder:
+            for field_name, value in fields.items():
+                setattr(new_workorder, field_name, value)
+    return write
+
+
+def write_group_commit(appender: RecordAppender, fields: dict) -> Callable[[], None]:
+    def write():
+        appender.append(Workorder, str(uuid.uuid4()), **fields)
+    return write
+
+
+def measure(write: Callable[[], None], writers: int) -> float:
+    """Returns the throughput, in records per second, of `writers` threads sharing TOTAL_WRITES writes."""
+    writes_per_thread = TOTAL_WRITES // writers
+
+    def writer():
+        for _ in range(writes_per_thread):
+            write()
+
+    threads = [Thread(target=writer) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return (writes_per_thread * writers) / elapsed
+
+
+def benchmark() -> None:
+    fields = make_workorder_fields()
+    rows = []
+    for writers in CONCURRENT_WRITERS:
+        row = [writers]
+        for strategy in ('per-transaction', 'group-commit'):
+            db_path = tempfile.mkdtemp()
+            try:
+                datastore = Datastore(db_path)
+                if strategy == 'per-transaction':
+                    write = write_per_transaction(datastore, fields)
+                else:
+                    write = write_group_commit(RecordAppender(datastore), fields)
+                row.append(f"{measure(write, writers):,.0f}")
+            finally:
+                shutil.rmtree(db_path, ignore_errors=True)
+        rows.append(row)
+
+    headers = ['Writers', 'Per-transaction (records/s)', 'Group commit (records/s)']
+    print(tabulate.tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures the memory a node spends on each of the strangers it knows of: held as the
+`NodeSprout` it was learned as, and once matured into a full `Ursula` character.
+"""
+
+
+import gc
+import lmdb
+import tabulate
+import tracemalloc
+from typing import List
+
+from nucypher.characters.lawful import Ursula
+from tests.mock.datastore import mock_lmdb_open
+from tests.utils.config import make_ursula_test_configuration
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT, make_federated_ursulas
+
+# Tuning
+KNOWN_NODES: List[int] = [1000, 10_000]
+MATURED_NODES: int = 1000  # Maturing is slow; the memory of mature nodes is extrapolated from this many.
+
+
+def traced_memory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def benchmark() -> None:
+    lmdb.open = mock_lmdb_open
+    ursula_config = make_ursula_test_configuration(federated=True, rest_port=MOCK_URSULA_STARTING_PORT)
+    payloads = [bytes(ursula) for ursula in make_federated_ursulas(ursula_config=ursula_config, quantity=10)]
+
+    tracemalloc.start()
+    rows = []
+    for quantity in KNOWN_NODES:
+        before = traced_memory()
+        sprouts = [Ursula.from_bytes(payloads[index % len(payloads)]) for index in range(quantity)]
+        as_sprouts = traced_memory() - before
+
+        for sprout in sprouts[:MATURED_NODES]:
+            sprout.mature()
+        per_mature_node = (traced_memory() - before - as_sprouts * (1 - MATURED_NODES / quantity)) / MATURED_NODES
+
+        rows.append([quantity,
+                     f"{as_sprouts / quantity:,.0f}",
+                     f"{as_sprouts / 2 ** 20:,.1f}",
+                     f"{per_mature_node:,.0f}",
+                     f"{per_mature_node * quantity / 2 ** 20:,.1f}"])
+        del sprouts
+
+    headers = ['Known nodes', 'Sprout (B/node)', 'Sprouts (MiB)', 'Matured (B/node)', 'All matured (MiB)']
+    print(tabulate.tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+if __name__ == '__main__':
+    benchmark()
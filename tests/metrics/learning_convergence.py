@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures how long a freshly booted learner takes to converge on the high-performance mock fleet,
+when each Ursula only knows a few of its peers and every teacher takes a while to answer,
+asking a single teacher per learning round versus several teachers concurrently.
+"""
+
+
+import random
+import tabulate
+import time
+from typing import List, Tuple
+from unittest.mock import patch
+
+from nucypher.characters.lawful import Alice
+from nucypher.config.characters import AliceConfiguration
+from nucypher.config.constants import TEMPORARY_DOMAIN
+from nucypher.utilities.logging import GlobalLoggerSettings
+from tests.mock.performance_mocks import (
+    mock_cert_generation,
+    mock_cert_loading,
+    mock_cert_storage,
+    mock_keep_learning,
+    mock_message_verification,
+    mock_metadata_validation,
+    mock_pubkey_from_bytes,
+    mock_record_fleet_state,
+    mock_remember_node,
+    mock_rest_app_creation,
+    mock_secret_source,
+    mock_verify_node
+)
+from tests.utils.config import make_ursula_test_configuration
+from tests.utils.middleware import MockRestMiddlewareForLargeFleetTests
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT, make_federated_ursulas
+
+# Tuning
+FLEET_SIZE: int = 5000
+PEERS_PER_URSULA: int = 50
+TEACHER_LATENCY: float = 0.05  # Seconds
+CONVERGED: float = 0.9  # Share of the fleet to know about
+MAX_TEACHERS_PER_ROUND: List[int] = [1, 2, 4, 8]
+
+
+class SlowTeachersMiddleware(MockRestMiddlewareForLargeFleetTests):
+
+    def get_nodes_via_rest(self, *args, **kwargs):
+        time.sleep(TEACHER_LATENCY)
+        return super().get_nodes_via_rest(*args, **kwargs)
+
+
+def make_fleet() -> list:
+    ursula_config = make_ursula_test_configuration(federated=True, rest_port=MOCK_URSULA_STARTING_PORT)
+    with mock_secret_source():
+        with mock_cert_storage, mock_cert_loading, mock_rest_app_creation, mock_cert_generation, \
+                mock_remember_node, mock_message_verification:
+            ursulas = make_federated_ursulas(ursula_config=ursula_config, quantity=FLEET_SIZE, know_each_other=False)
+
+    for ursula in ursulas:
+        peers = random.sample(ursulas, PEERS_PER_URSULA)
+        ursula.known_nodes._nodes = {peer.checksum_address: peer for peer in peers}
+        ursula.known_nodes.checksum = b"This is a fleet state checksum..".hex()
+
+        # The bytes of each teacher's known nodes are made once, as in tests/integration/learning/test_discovery_phases.py.
+        known_nodes_bytestring = ursula.bytestring_of_known_nodes()
+        ursula.bytestring_of_known_nodes = lambda *args, _bytestring=known_nodes_bytestring, **kwargs: _bytestring
+    return ursulas
+
+
+def converge(ursulas: list, max_teachers_per_round: int) -> Tuple[float, int]:
+    config = AliceConfiguration(dev_mode=True,
+                                domain=TEMPORARY_DOMAIN,
+                                network_middleware=SlowTeachersMiddleware(),
+                                federated_only=True,
+                                abort_on_learning_error=True,
+                                save_metadata=False,
+                                reload_metadata=False)
+    with mock_cert_storage, mock_verify_node, mock_record_fleet_state, mock_message_verification, mock_keep_learning:
+        alice = config.produce(known_nodes=ursulas[:1])
+
+    with patch.object(Alice, '_MAX_TEACHERS_PER_ROUND', max_teachers_per_round):
+        with mock_cert_storage, mock_cert_loading, mock_verify_node, mock_message_verification, \
+                mock_metadata_validation, mock_record_fleet_state, mock_pubkey_from_bytes():
+            start = time.perf_counter()
+            alice.block_until_number_of_known_nodes_is(int(FLEET_SIZE * CONVERGED), learn_on_this_thread=True,
+                                                       timeout=600)
+            elapsed = time.perf_counter() - start
+    return elapsed, alice._learning_round
+
+
+def benchmark() -> None:
+    with GlobalLoggerSettings.pause_all_logging_while():
+        ursulas = make_fleet()
+        rows = []
+        for max_teachers_per_round in MAX_TEACHERS_PER_ROUND:
+            elapsed, rounds = converge(ursulas, max_teachers_per_round=max_teachers_per_round)
+            rows.append([max_teachers_per_round, rounds, f"{elapsed:,.2f}"])
+
+    headers = ['Max teachers per round', 'Rounds', f'Time to know {CONVERGED:.0%} of the fleet (s)']
+    print(tabulate.tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures the bookkeeping cost of retrieving thousands of capsules in one Bob session:
+saving the completed WorkOrders of each capsule in a `WorkOrderHistory` and looking
+them up again, using the capsule index, and walking every Ursula's WorkOrders instead,
+as `WorkOrderHistory.by_capsule` used to.
+"""
+
+
+import os
+import tabulate
+import time
+from eth_utils import to_checksum_address
+from types import SimpleNamespace
+from typing import Callable, List
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+from umbral.pre import Capsule
+
+from nucypher.policy.collections import WorkOrderHistory
+
+# Tuning
+CAPSULES: List[int] = [500, 1000, 2000, 4000]
+URSULAS: int = 10
+M: int = 3
+
+
+def walk_by_capsule(history: WorkOrderHistory, capsule: Capsule) -> dict:
+    ursulas_by_capsules = {}
+    for ursula, capsules in history.by_ursula.items():
+        for saved_capsule, work_order in capsules.items():
+            if saved_capsule == capsule:
+                ursulas_by_capsules[ursula] = work_order
+    return ursulas_by_capsules
+
+
+def retrieve(capsules: List[Capsule],
+             ursulas: List[str],
+             by_capsule: Callable[[WorkOrderHistory, Capsule], dict]
+             ) -> float:
+    """Returns the bookkeeping time, in microseconds per capsule, of retrieving `capsules` one at a time."""
+    history = WorkOrderHistory(max_capsules=len(capsules))
+    start = time.perf_counter()
+    for index, capsule in enumerate(capsules):
+        for ursula in (ursulas[(index + offset) % len(ursulas)] for offset in range(M)):
+            work_order = SimpleNamespace(ursula=SimpleNamespace(checksum_address=ursula),
+                                         tasks={capsule: SimpleNamespace(capsule=capsule)})
+            history.save_work_order(work_order, as_replete=True)
+        assert len(by_capsule(history, capsule)) == M
+        assert len(history.most_recent_replete(capsule)) == M
+    elapsed = time.perf_counter() - start
+    return elapsed / len(capsules) * 1_000_000
+
+
+def benchmark() -> None:
+    delegating_pubkey = UmbralPrivateKey.gen_key().pubkey
+    all_capsules = [pre.encrypt(delegating_pubkey, b'data')[1] for _ in range(max(CAPSULES))]
+    ursulas = [to_checksum_address(os.urandom(20)) for _ in range(URSULAS)]
+
+    rows = []
+    for capsules in CAPSULES:
+        indexed = retrieve(all_capsules[:capsules], ursulas, WorkOrderHistory.by_capsule)
+        walked = retrieve(all_capsules[:capsules], ursulas, walk_by_capsule)
+        rows.append([capsules, f"{indexed:,.1f}", f"{walked:,.1f}"])
+
+    headers = ['Capsules', 'Indexed (µs/capsule)', 'Walked (µs/capsule)']
+    print(tabulate.tabulate(rows, headers=headers, tablefmt="simple"))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -15,7 +15,11 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from bytestring_splitter import VariableLengthBytestring
+from cryptography.hazmat.primitives.serialization import Encoding
+
 from nucypher.characters.lawful import Ursula
+from nucypher.crypto.powers import DecryptingPower, SigningPower
 
 
 def test_serialize_ursula(federated_ursulas):
@@ -24,3 +28,37 @@ def test_serialize_ursula(federated_ursulas):
     ursula_object = Ursula.from_bytes(ursula_as_bytes)
     assert ursula == ursula_object
     ursula.stop()
+
+
+def _serialize_from_scratch(ursula):
+    return bytes().join((ursula.TEACHER_VERSION.to_bytes(2, "big"),
+                         ursula.canonical_public_address,
+                         bytes(VariableLengthBytestring(ursula.domain.encode('utf-8'))),
+                         ursula.timestamp_bytes(),
+                         bytes(ursula._interface_signature),
+                         bytes(VariableLengthBytestring(ursula.decentralized_identity_evidence)),
+                         bytes(ursula.public_keys(SigningPower)),
+                         bytes(ursula.public_keys(DecryptingPower)),
+                         bytes(VariableLengthBytestring(ursula.rest_server_certificate().public_bytes(Encoding.PEM))),
+                         bytes(VariableLengthBytestring(bytes(ursula.rest_interface)))))
+
+
+def test_cached_ursula_serialization(federated_ursulas):
+    ursula = list(federated_ursulas)[0]
+
+    ursula_as_bytes = bytes(ursula)
+    assert ursula_as_bytes == _serialize_from_scratch(ursula)
+    assert bytes(ursula) is ursula_as_bytes  # Not serialized again
+
+    # Signing the interface again changes the node's timestamp and interface signature.
+    timestamp, interface_signature = ursula._timestamp, ursula._interface_signature
+    ursula._sign_and_date_interface_info()
+    try:
+        resigned_as_bytes = bytes(ursula)
+        assert resigned_as_bytes != ursula_as_bytes
+        assert resigned_as_bytes == _serialize_from_scratch(ursula)
+        assert Ursula.from_bytes(resigned_as_bytes).timestamp == ursula.timestamp
+    finally:
+        ursula._timestamp, ursula._Teacher__interface_signature = timestamp, interface_signature
+
+    assert bytes(ursula) == ursula_as_bytes
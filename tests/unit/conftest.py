@@ -16,6 +16,8 @@
 """
 
 import pytest
+from types import SimpleNamespace
+from umbral import pre
 
 from tests.mock.interfaces import MockEthereumClient
 
@@ -25,3 +27,19 @@ def mock_ethereum_client(mocker):
     web3_mock = mocker.Mock()
     mock_client = MockEthereumClient(w3=web3_mock)
     return mock_client
+
+
+@pytest.fixture(scope='module')
+def make_work_order():
+    """
+    Makes a stand-in for a completed WorkOrder: one task per capsule,
+    each with the CFrag re-encrypted with `kfrag`, if given.
+    """
+    def _make_work_order(checksum_address, capsules, arrangement_id=None, kfrag=None):
+        tasks = {capsule: SimpleNamespace(capsule=capsule, cfrag=pre.reencrypt(kfrag, capsule) if kfrag else None)
+                 for capsule in capsules}
+        return SimpleNamespace(ursula=SimpleNamespace(checksum_address=checksum_address),
+                               arrangement_id=arrangement_id,
+                               tasks=tasks)
+
+    return _make_work_order
@@ -0,0 +1,111 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from io import BytesIO
+
+from constant_sorrow.constants import SIGNATURE_TO_FOLLOW
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signature, Signer
+
+from nucypher.characters.lawful import Enrico
+from nucypher.crypto.api import IncorrectCFrags, UndecryptableMessageKit, decrypt_and_verify_batch
+from nucypher.crypto.streams import read_message_kits
+
+
+def open_message_kit(message_kit, policy_private_key, verifying_key) -> bytes:
+    cleartext = pre.decrypt(message_kit.ciphertext, message_kit.capsule, policy_private_key)
+    header_length = len(bytes(SIGNATURE_TO_FOLLOW))
+    header, cleartext = cleartext[:header_length], cleartext[header_length:]
+    assert header == SIGNATURE_TO_FOLLOW
+    signature = Signature.from_bytes(cleartext[:Signature.expected_bytes_length()])
+    message = cleartext[Signature.expected_bytes_length():]
+    assert signature.verify(message, verifying_key)
+    return message
+
+
+def test_enrico_encrypts_messages_in_batches():
+    policy_private_key = UmbralPrivateKey.gen_key()
+    enrico = Enrico(policy_encrypting_key=policy_private_key.get_pubkey())
+    verifying_key = enrico.stamp.as_umbral_pubkey()
+    plaintexts = [b'message number %d' % i for i in range(25)]
+
+    # Batches smaller than the number of messages, so that several are in flight and must be put back in order.
+    message_kits = list(enrico.encrypt_messages(plaintexts, processes=2, batch_size=4))
+    assert len(message_kits) == len(plaintexts)
+    for message_kit, plaintext in zip(message_kits, plaintexts):
+        assert message_kit.sender_verifying_key == verifying_key
+        assert message_kit.policy_pubkey == policy_private_key.get_pubkey()
+        assert open_message_kit(message_kit, policy_private_key, verifying_key) == plaintext
+
+    stream = BytesIO()
+    assert enrico.encrypt_messages_to_stream(plaintexts, stream=stream, processes=2, batch_size=4) == len(plaintexts)
+    stream.seek(0)
+    streamed_plaintexts = [open_message_kit(message_kit, policy_private_key, verifying_key)
+                           for message_kit in read_message_kits(stream)]
+    assert streamed_plaintexts == plaintexts
+
+
+def test_bob_decrypts_message_kits_in_batches():
+    policy_private_key = UmbralPrivateKey.gen_key()
+    alice_signing_key = UmbralPrivateKey.gen_key()
+    bob_decrypting_key = UmbralPrivateKey.gen_key()
+    kfrags = pre.generate_kfrags(delegating_privkey=policy_private_key,
+                                 receiving_pubkey=bob_decrypting_key.get_pubkey(),
+                                 threshold=2,
+                                 N=3,
+                                 signer=Signer(alice_signing_key))
+
+    enrico = Enrico(policy_encrypting_key=policy_private_key.get_pubkey())
+    plaintexts = [b'message number %d' % i for i in range(10)]
+    message_kits = list(enrico.encrypt_messages(plaintexts, processes=1))
+
+    def reencrypt(capsule):
+        capsule.set_correctness_keys(delegating=policy_private_key.get_pubkey(),
+                                     receiving=bob_decrypting_key.get_pubkey(),
+                                     verifying=alice_signing_key.get_pubkey())
+        return [pre.reencrypt(kfrag, capsule).to_bytes() for kfrag in kfrags[:2]]
+
+    batch = [[bytes(message_kit.capsule),
+              message_kit.ciphertext,
+              bytes(enrico.stamp),
+              bytes(policy_private_key.get_pubkey()),
+              reencrypt(message_kit.capsule)]
+             for message_kit in message_kits]
+
+    # A kit that claims to come from someone else, one with the CFrags of another capsule,
+    # and one with a single CFrag of another capsule.
+    batch[3][2] = bytes(UmbralPrivateKey.gen_key().get_pubkey())
+    batch[6][4] = batch[7][4]
+    batch[8][4] = [batch[8][4][0], batch[9][4][1]]
+
+    results = list(decrypt_and_verify_batch(decrypting_key=bob_decrypting_key,
+                                            alice_verifying_key=alice_signing_key.get_pubkey(),
+                                            message_kits=batch,
+                                            processes=2,
+                                            batch_size=3))
+    assert len(results) == len(plaintexts)
+    for index, (result, plaintext) in enumerate(zip(results, plaintexts)):
+        if index in (3, 6, 8):
+            assert isinstance(result, UndecryptableMessageKit)
+        else:
+            assert result == plaintext
+
+    # The incorrect CFrags are pointed out, so that Bob can tell which Ursulas sent them.
+    assert not isinstance(results[3], IncorrectCFrags)
+    assert results[6].indices == [0, 1]
+    assert results[8].indices == [1]
@@ -0,0 +1,75 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signer
+
+from nucypher.crypto.powers import DelegatingPower
+
+
+def test_label_keys_are_derived_once():
+    power = DelegatingPower(label_key_cache_size=2)
+
+    with power._label_privkey(b'hot') as private_key:
+        pass
+    with power._label_privkey(b'hot') as same_private_key:
+        assert same_private_key is private_key
+        assert int(private_key.bn_key)
+
+    # The cached key is the one derived from the label
+    assert power.get_pubkey_from_label(b'hot') == power._get_privkey_from_label(b'hot').get_pubkey()
+
+
+def test_evicted_label_keys_are_zeroized():
+    power = DelegatingPower(label_key_cache_size=1)
+
+    with power._label_privkey(b'first') as first_key:
+        pass
+    with power._label_privkey(b'second') as second_key:
+        pass
+
+    assert not int(first_key.bn_key)
+    assert int(second_key.bn_key)
+
+    # Keys being used when evicted are zeroized once they are no longer in use
+    with power._label_privkey(b'third') as third_key:
+        power.set_label_key_cache_size(1)
+        assert int(third_key.bn_key)
+    assert not int(third_key.bn_key)
+    assert not int(second_key.bn_key)
+
+
+def test_label_key_cache_can_be_disabled():
+    power = DelegatingPower(label_key_cache_size=0)
+
+    with power._label_privkey(b'cold') as private_key:
+        assert int(private_key.bn_key)
+    assert not int(private_key.bn_key)
+
+    bob_key = UmbralPrivateKey.gen_key()
+    signing_key = UmbralPrivateKey.gen_key()
+    public_key, kfrags = power.generate_kfrags(bob_pubkey_enc=bob_key.get_pubkey(),
+                                               signer=Signer(signing_key),
+                                               label=b'cold',
+                                               m=2,
+                                               n=3)
+    assert public_key == power.get_pubkey_from_label(b'cold')
+    assert len(kfrags) == 3
+
+    with pytest.raises(ValueError):
+        power.set_label_key_cache_size(-1)
@@ -0,0 +1,91 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from io import BytesIO
+
+import pytest
+
+from nucypher.crypto.constants import AEAD_TAG_LENGTH
+from nucypher.crypto.streams import (
+    InvalidStream,
+    decrypt_chunks,
+    encrypt_chunks,
+    generate_stream_key,
+    split_stream_key
+)
+
+CHUNK_SIZE = 16
+
+
+def encrypt(stream_key: bytes, payload: bytes) -> bytes:
+    ciphertext = BytesIO()
+    assert encrypt_chunks(stream_key, plaintext=BytesIO(payload), ciphertext=ciphertext) == len(payload)
+    return ciphertext.getvalue()
+
+
+def decrypt(stream_key: bytes, ciphertext: bytes) -> bytes:
+    plaintext = BytesIO()
+    decrypt_chunks(stream_key, ciphertext=BytesIO(ciphertext), plaintext=plaintext)
+    return plaintext.getvalue()
+
+
+@pytest.mark.parametrize('payload_size', [0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, 3 * CHUNK_SIZE, 3 * CHUNK_SIZE + 5])
+def test_stream_roundtrip(payload_size):
+    stream_key = generate_stream_key(chunk_size=CHUNK_SIZE)
+    assert split_stream_key(stream_key)[0] == CHUNK_SIZE
+
+    payload = os.urandom(payload_size)
+    ciphertext = encrypt(stream_key, payload)
+
+    # Every chunk carries its own tag; even an empty payload takes one (empty) chunk.
+    chunks = max(1, -(-payload_size // CHUNK_SIZE))
+    assert len(ciphertext) == payload_size + chunks * AEAD_TAG_LENGTH
+    assert decrypt(stream_key, ciphertext) == payload
+
+
+def test_tampered_streams_fail_to_decrypt():
+    stream_key = generate_stream_key(chunk_size=CHUNK_SIZE)
+    payload = os.urandom(3 * CHUNK_SIZE + 5)
+    ciphertext = encrypt(stream_key, payload)
+    sealed_chunk_size = CHUNK_SIZE + AEAD_TAG_LENGTH
+
+    # Truncated at a chunk boundary
+    with pytest.raises(InvalidStream):
+        decrypt(stream_key, ciphertext[:2 * sealed_chunk_size])
+
+    # Reordered chunks
+    first, second = ciphertext[:sealed_chunk_size], ciphertext[sealed_chunk_size:2 * sealed_chunk_size]
+    with pytest.raises(InvalidStream):
+        decrypt(stream_key, second + first + ciphertext[2 * sealed_chunk_size:])
+
+    # Flipped bit
+    tampered = bytearray(ciphertext)
+    tampered[-1] ^= 1
+    with pytest.raises(InvalidStream):
+        decrypt(stream_key, bytes(tampered))
+
+    # Someone else's key
+    with pytest.raises(InvalidStream):
+        decrypt(generate_stream_key(chunk_size=CHUNK_SIZE), ciphertext)
+
+
+def test_invalid_stream_keys():
+    with pytest.raises(ValueError):
+        generate_stream_key(chunk_size=0)
+    with pytest.raises(InvalidStream):
+        split_stream_key(b'too short')
@@ -0,0 +1,125 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+from threading import Thread
+
+from nucypher.datastore import datastore
+from nucypher.datastore.appender import RecordAppender, _Batch, _PendingWrite
+from nucypher.datastore.base import DatastoreRecord, RecordField
+
+
+class AppendedRecord(DatastoreRecord):
+    _foo = RecordField(bytes)
+    _bar = RecordField(bytes)
+
+
+def test_appender_single_writer(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    appender = RecordAppender(storage)
+
+    appender.append(AppendedRecord, 'single', foo=b'foo', bar=b'bar')
+
+    # The record is committed by the time `append` returns
+    with storage.describe(AppendedRecord, 'single') as record:
+        assert record.foo == b'foo'
+        assert record.bar == b'bar'
+
+    # Invalid writes are reported to the caller and are not persisted
+    with pytest.raises(datastore.DatastoreTransactionError):
+        appender.append(AppendedRecord, 'invalid', foo=1234)
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe(AppendedRecord, 'invalid') as record:
+            _foo = record.foo
+
+
+def test_appender_concurrent_writers(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    appender = RecordAppender(storage, max_batch_size=8, max_delay=0.05)
+
+    errors = {}
+
+    def writer(record_id):
+        try:
+            if record_id % 10 == 0:
+                # A bad record, which must not spoil its batch
+                appender.append(AppendedRecord, record_id, foo='not bytes')
+            else:
+                appender.append(AppendedRecord, record_id, foo=str(record_id).encode())
+        except datastore.DatastoreTransactionError as e:
+            errors[record_id] = e
+
+    threads = [Thread(target=writer, args=(record_id,)) for record_id in range(1, 65)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(errors) == list(range(10, 65, 10))
+
+    with storage.query_by(AppendedRecord) as records:
+        assert len(records) == 64 - len(errors)
+        for record in records:
+            assert record.foo == str(record._record_id).encode()
+
+
+def test_datastore_write_records(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    storage.write_records([(AppendedRecord, 1, dict(foo=b'one')),
+                           (AppendedRecord, '2', dict(foo=b'two', bar=b'deux'))])
+    with storage.describe(AppendedRecord, 1) as record:
+        assert record.foo == b'one'
+    with storage.describe(AppendedRecord, 2) as record:
+        assert record.foo == b'two'
+        assert record.bar == b'deux'
+
+    # The batch is atomic: one bad record aborts the whole transaction
+    with pytest.raises(datastore.DatastoreTransactionError):
+        storage.write_records([(AppendedRecord, 3, dict(foo=b'three')),
+                               (AppendedRecord, 4, dict(nonexistent=b'four'))])
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe(AppendedRecord, 3) as record:
+            _foo = record.foo
+
+
+def test_appender_reports_unexpected_errors_to_uncommitted_writers(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    appender = RecordAppender(storage)
+
+    class FailingDatastore:
+        """Aborts the batch for a bad record, then breaks down while committing it record by record."""
+        def __init__(self):
+            self.calls = 0
+
+        def write_records(self, records):
+            self.calls += 1
+            if self.calls == 1:
+                raise datastore.DatastoreTransactionError('bad record')
+            if self.calls == 3:
+                raise RuntimeError('out of space')
+            storage.write_records(records)
+
+    appender.datastore = FailingDatastore()
+    batch = _Batch()
+    batch.writes = [_PendingWrite(AppendedRecord, record_id, dict(foo=b'foo')) for record_id in range(4)]
+    appender._commit(batch)
+
+    assert batch.committed.is_set()
+    assert batch.writes[0].error is None
+    assert all(isinstance(write.error, RuntimeError) for write in batch.writes[1:])
+    with storage.describe(AppendedRecord, 0) as record:
+        assert record.foo == b'foo'
@@ -0,0 +1,117 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import datetime
+import maya
+import os
+import pytest
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signer
+
+from nucypher.datastore.cfrags import CFragCache
+
+
+@pytest.fixture(scope='module')
+def reencryption():
+    delegating_privkey = UmbralPrivateKey.gen_key()
+    receiving_privkey = UmbralPrivateKey.gen_key()
+    signing_privkey = UmbralPrivateKey.gen_key()
+    kfrags = pre.generate_kfrags(delegating_privkey=delegating_privkey,
+                                 receiving_pubkey=receiving_privkey.pubkey,
+                                 threshold=2,
+                                 N=3,
+                                 signer=Signer(signing_privkey))
+
+    def make_capsule():
+        _ciphertext, capsule = pre.encrypt(delegating_privkey.pubkey, b'sneaky')
+        capsule.set_correctness_keys(delegating=delegating_privkey.pubkey,
+                                     receiving=receiving_privkey.pubkey,
+                                     verifying=signing_privkey.pubkey)
+        return capsule
+
+    return make_capsule, kfrags
+
+
+def test_cfrag_cache_saves_and_finds_cfrags(mock_or_real_datastore, reencryption, get_random_checksum_address, make_work_order):
+    make_capsule, kfrags = reencryption
+    cache = CFragCache(mock_or_real_datastore)
+
+    capsule, other_capsule = make_capsule(), make_capsule()
+    destinations = [(get_random_checksum_address(), os.urandom(32)) for _kfrag in kfrags]
+    for (node_id, arrangement_id), kfrag in zip(destinations[:2], kfrags):
+        cache.save_work_order(make_work_order(node_id, [capsule], arrangement_id, kfrag))
+    assert len(cache) == 2
+
+    cfrags = cache.cfrags(capsule, destinations)
+    assert len(cfrags) == 2
+    for cfrag in cfrags:
+        capsule.attach_cfrag(cfrag)  # They're still correct
+
+    # Nothing is cached for another capsule, or under another arrangement with the same Ursulas.
+    assert cache.cfrags(other_capsule, destinations) == []
+    assert cache.cfrags(capsule, [(node_id, os.urandom(32)) for node_id, _arrangement_id in destinations]) == []
+
+    # A new cache over the same datastore, as after a restart, finds the same CFrags.
+    assert len(CFragCache(mock_or_real_datastore).cfrags(capsule, destinations)) == 2
+
+
+def test_cfrag_cache_expiration(mock_or_real_datastore, reencryption, get_random_checksum_address, make_work_order):
+    make_capsule, kfrags = reencryption
+    cache = CFragCache(mock_or_real_datastore, ttl=datetime.timedelta(hours=1))
+
+    capsule = make_capsule()
+    policy_expiration = maya.now() + datetime.timedelta(days=2)
+    short_lived = (get_random_checksum_address(), os.urandom(32))
+    long_lived = (get_random_checksum_address(), os.urandom(32))
+    cache.save_work_order(make_work_order(short_lived[0], [capsule], short_lived[1], kfrags[0]))
+    cache.save_work_order(make_work_order(long_lived[0], [capsule], long_lived[1], kfrags[1]),
+                          expiration=policy_expiration)
+
+    destinations = [short_lived, long_lived]
+    assert len(cache.cfrags(capsule, destinations)) == 2
+
+    # Without the policy expiration, CFrags are only kept for the cache's TTL.
+    tomorrow = maya.now() + datetime.timedelta(days=1)
+    assert len(cache.cfrags(capsule, destinations, now=tomorrow)) == 1
+
+    assert cache.prune(now=tomorrow) == 1
+    assert len(cache) == 1
+    assert len(cache.cfrags(capsule, destinations)) == 1
+
+    assert cache.prune(now=policy_expiration) == 1
+    assert len(cache) == 0
+    assert cache.prune() == 0
+
+
+def test_cfrag_cache_size_cap(mock_or_real_datastore, reencryption, get_random_checksum_address, make_work_order):
+    make_capsule, kfrags = reencryption
+    cache = CFragCache(mock_or_real_datastore, max_entries=10)
+
+    node_id, arrangement_id = get_random_checksum_address(), os.urandom(32)
+    capsules = [make_capsule() for _ in range(15)]
+    for capsule in capsules:
+        cache.save_work_order(make_work_order(node_id, [capsule], arrangement_id, kfrags[0]))
+        assert len(cache) <= 10
+
+    # The oldest CFrags were evicted first.
+    destinations = [(node_id, arrangement_id)]
+    assert cache.cfrags(capsules[0], destinations) == []
+    assert len(cache.cfrags(capsules[-1], destinations)) == 1
+
+    with pytest.raises(ValueError):
+        CFragCache(mock_or_real_datastore, max_entries=0)
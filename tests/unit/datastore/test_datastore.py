@@ -19,8 +19,15 @@ import msgpack
 import pytest
 import tempfile
 from datetime import datetime
+from typing import Iterator
 from nucypher.datastore import datastore
-from nucypher.datastore.base import DatastoreRecord, RecordField
+from nucypher.datastore.base import (
+    DatastoreRecord,
+    PACKED_RECORD_HEADER_LENGTH,
+    PACKED_RECORD_VERSION,
+    RecordField,
+    unpack_record_fields
+)
 
 
 class TestRecord(DatastoreRecord):
@@ -258,6 +265,69 @@ def test_datastore_query_by(mock_or_real_datastore):
             assert len(records) == 'this never gets executed'
 
 
+def test_datastore_stream_by(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    class FooRecord(DatastoreRecord):
+        _foo = RecordField(bytes)
+        _bar = RecordField(bytes)
+
+    class PackedFooRecord(DatastoreRecord, packed=True):
+        _foo = RecordField(bytes)
+        _bar = RecordField(bytes)
+
+    for record_type in (FooRecord, PackedFooRecord):
+        for record_id in range(10):
+            with storage.describe(record_type, record_id, writeable=True) as rec:
+                rec.foo = b'even' if record_id % 2 == 0 else b'odd'
+                if record_id < 5:
+                    rec.bar = b'bar'
+
+    for record_type in (FooRecord, PackedFooRecord):
+        # Records are generated lazily, in key order, each one only once
+        with storage.stream_by(record_type) as records:
+            assert isinstance(records, Iterator)
+            assert [record._record_id for record in records] == list(range(10))
+
+        # Filtering by field and function
+        with storage.stream_by(record_type, filter_field='bar') as records:
+            assert [record._record_id for record in records] == list(range(5))
+        with storage.stream_by(record_type, filter_field='foo', filter_func=lambda foo: foo == b'odd') as records:
+            assert [record._record_id for record in records] == [1, 3, 5, 7, 9]
+
+        # Limit and offset apply to the matching records
+        with storage.stream_by(record_type, filter_field='foo', filter_func=lambda foo: foo == b'odd',
+                               offset=1, limit=2) as records:
+            assert [record._record_id for record in records] == [3, 5]
+        with storage.stream_by(record_type, limit=0) as records:
+            assert list(records) == []
+
+        # Early termination
+        with storage.stream_by(record_type) as records:
+            first_record = next(records)
+            assert first_record.foo == b'even'
+
+        # Records can't be used outside of the context manager
+        with pytest.raises(TypeError):
+            first_record.foo = b'this will error'
+
+        # Streams of writeable records can write
+        with storage.stream_by(record_type, filter_field='bar', writeable=True) as records:
+            for record in records:
+                record.bar = b'written'
+        with storage.stream_by(record_type, filter_field='bar', filter_func=lambda bar: bar == b'written') as records:
+            assert len(list(records)) == 5
+
+    # An empty stream doesn't raise
+    with storage.stream_by(TestRecord) as records:
+        assert list(records) == []
+
+    # Read-only streams can't write
+    with pytest.raises(datastore.DatastoreTransactionError):
+        with storage.stream_by(FooRecord) as records:
+            next(records).foo = b'this should error'
+
+
 def test_datastore_record_read(mock_or_real_lmdb_env):
     db_env = mock_or_real_lmdb_env
     with db_env.begin() as db_tx:
@@ -356,3 +426,121 @@ def test_key_tuple():
     int_id_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:test_field:1')
     assert int_id_key.record_id == 1
     assert type(int_id_key.record_id) == int
+
+
+class PackedRecord(DatastoreRecord, packed=True):
+    _foo = RecordField(bytes)
+    _bar = RecordField(bytes)
+
+
+def test_datastore_packed_record(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    with storage.describe(PackedRecord, 'packed', writeable=True) as record:
+        record.foo = b'foo'
+        record.bar = b'bar'
+        assert record.foo == b'foo'
+
+    # All of the fields are stored under a single key, prefixed by the layout version
+    with storage._Datastore__db_env.begin() as db_tx:
+        assert db_tx.get(b'PackedRecord:foo:packed') is None
+        packed_record = db_tx.get(b'PackedRecord::packed')
+    assert packed_record[:PACKED_RECORD_HEADER_LENGTH] == PACKED_RECORD_VERSION.to_bytes(PACKED_RECORD_HEADER_LENGTH, 'big')
+    assert unpack_record_fields(packed_record) == {'foo': msgpack.packb(b'foo'), 'bar': msgpack.packb(b'bar')}
+
+    with storage.describe(PackedRecord, 'packed') as record:
+        assert record.foo == b'foo'
+        assert record.bar == b'bar'
+
+    # Nor can you read outside the context manager
+    with pytest.raises(lmdb.Error):
+        should_error = record.foo
+
+    # Deleting a field keeps the others
+    with storage.describe(PackedRecord, 'packed', writeable=True) as record:
+        record.bar = None
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe(PackedRecord, 'packed') as record:
+            should_error = record.bar
+
+    # Packed records can be queried, by field too
+    with storage.describe(PackedRecord, 2, writeable=True) as record:
+        record.bar = b'bar'
+    with storage.query_by(PackedRecord) as records:
+        assert len(records) == 2
+    with storage.query_by(PackedRecord, filter_field='bar') as records:
+        assert len(records) == 1
+        assert records[0].bar == b'bar'
+    with storage.query_by(PackedRecord, filter_field='foo', filter_func=lambda foo: foo == b'foo') as records:
+        assert len(records) == 1
+        assert records[0]._record_id == 'packed'
+
+    # Deleting the whole record deletes its key
+    with storage.describe(PackedRecord, 'packed', writeable=True) as record:
+        record.delete()
+    with storage._Datastore__db_env.begin() as db_tx:
+        assert db_tx.get(b'PackedRecord::packed') is None
+
+    # Field writes are buffered on the record, and packed once when its transaction is over
+    with storage.describe(PackedRecord, 'buffered', writeable=True) as record:
+        record.foo = b'foo'
+        record.bar = b'bar'
+        assert record.bar == b'bar'
+        assert record._DatastoreRecord__db_transaction.get(b'PackedRecord::buffered') is None
+    with storage.describe(PackedRecord, 'buffered') as record:
+        assert record.foo == b'foo'
+        assert record.bar == b'bar'
+    storage.write_records([(PackedRecord, 'buffered', {'foo': b'new foo', 'bar': None})])
+    with storage._Datastore__db_env.begin() as db_tx:
+        assert unpack_record_fields(db_tx.get(b'PackedRecord::buffered')) == {'foo': msgpack.packb(b'new foo')}
+
+    # Unknown layout versions are rejected
+    with pytest.raises(TypeError):
+        unpack_record_fields(b'\xff\xff' + msgpack.packb({}))
+
+
+def test_datastore_packed_record_migration(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    # Write records in the per-field layout, as a previous version would have
+    with storage._Datastore__db_env.begin(write=True) as db_tx:
+        for record_id in range(5):
+            db_tx.put(f'PackedRecord:foo:{record_id}'.encode(), msgpack.packb(f'foo {record_id}'.encode()))
+            db_tx.put(f'PackedRecord:bar:{record_id}'.encode(), msgpack.packb(f'bar {record_id}'.encode()))
+
+    # Records not migrated yet can still be read and queried
+    with storage.describe(PackedRecord, 0) as record:
+        assert record.foo == b'foo 0'
+    with storage.query_by(PackedRecord) as records:
+        assert len(records) == 5
+
+    # Writing to a record migrates it
+    with storage.describe(PackedRecord, 0, writeable=True) as record:
+        record.foo = b'new foo 0'
+    with storage._Datastore__db_env.begin() as db_tx:
+        assert db_tx.get(b'PackedRecord:foo:0') is None
+        assert db_tx.get(b'PackedRecord:bar:0') is None
+    with storage.describe(PackedRecord, 0) as record:
+        assert record.foo == b'new foo 0'
+        assert record.bar == b'bar 0'
+
+    # The rest are migrated incrementally
+    assert storage.migrate_records(PackedRecord, batch_size=1, max_records=2) == 2
+    with storage.query_by(PackedRecord) as records:
+        assert len(records) == 5
+    assert storage.migrate_records(PackedRecord, batch_size=1) == 2
+    assert storage.migrate_records(PackedRecord) == 0
+
+    with storage._Datastore__db_env.begin() as db_tx:
+        db_cursor = db_tx.cursor()
+        assert db_cursor.set_range(b'PackedRecord:')
+        assert list(db_cursor.iternext(keys=True, values=False)) == [f'PackedRecord::{record_id}'.encode()
+                                                                    for record_id in range(5)]
+    for record_id in range(1, 5):
+        with storage.describe(PackedRecord, record_id) as record:
+            assert record.foo == f'foo {record_id}'.encode()
+            assert record.bar == f'bar {record_id}'.encode()
+
+    # Only packed record types can be migrated
+    with pytest.raises(TypeError):
+        storage.migrate_records(TestRecord)
@@ -0,0 +1,146 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+
+import pytest
+
+from nucypher.utilities.cache import LRUCache, SingleFlightCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+
+    # Reading 'a' makes 'b' the least recently used entry...
+    assert cache['a'] == 1
+
+    # ...so it's the one evicted to make room.
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+    with pytest.raises(KeyError):
+        _ = cache['b']
+
+    assert cache.pop('a') == 1
+    assert cache.pop('a', 'gone') == 'gone'
+
+    cache.clear()
+    assert not len(cache)
+
+
+def test_lru_cache_reports_dropped_entries():
+    evicted = list()
+    cache = LRUCache(maxsize=2, on_evict=lambda key, value: evicted.append((key, value)))
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['c'] = 3
+    assert evicted == [('a', 1)]
+
+    cache['b'] = 20
+    assert evicted == [('a', 1), ('b', 2)]
+
+    # Popped entries go back to the caller instead
+    assert cache.pop('c') == 3
+    cache.clear()
+    assert evicted == [('a', 1), ('b', 2), ('b', 20)]
+
+
+def test_lru_cache_requires_a_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_single_flight_cache_expires_results():
+    now = 0
+    cache = SingleFlightCache(maxsize=10, ttl=15, clock=lambda: now)
+    lookups = []
+
+    def lookup():
+        lookups.append(now)
+        return len(lookups)
+
+    assert cache.get_or_load('policy', lookup) == 1
+    now = 14
+    assert cache.get_or_load('policy', lookup) == 1
+    now = 15
+    assert cache.get_or_load('policy', lookup) == 2
+    assert lookups == [0, 15]
+
+    cache.invalidate('policy')
+    assert cache.get_or_load('policy', lookup) == 3
+
+
+def test_single_flight_cache_does_not_cache_errors():
+    cache = SingleFlightCache(maxsize=10, ttl=15)
+
+    def failing_lookup():
+        raise TimeoutError
+
+    with pytest.raises(TimeoutError):
+        cache.get_or_load('policy', failing_lookup)
+    assert cache.get_or_load('policy', lambda: 'found') == 'found'
+
+
+def test_single_flight_cache_only_caches_accepted_results():
+    cache = SingleFlightCache(maxsize=10, ttl=15)
+    results = iter([None, None, 'found', 'found again'])
+
+    def lookup():
+        return next(results)
+
+    def found(result):
+        return result is not None
+
+    assert cache.get_or_load('policy', lookup, cache_if=found) is None
+    assert cache.get_or_load('policy', lookup, cache_if=found) is None
+    assert cache.get_or_load('policy', lookup, cache_if=found) == 'found'
+    assert cache.get_or_load('policy', lookup, cache_if=found) == 'found'
+
+
+def test_single_flight_cache_collapses_concurrent_lookups():
+    cache = SingleFlightCache(maxsize=10, ttl=15)
+    lookup_started = threading.Event()
+    release_lookup = threading.Event()
+    lookups = []
+
+    def slow_lookup():
+        lookups.append(1)
+        lookup_started.set()
+        release_lookup.wait(timeout=5)
+        return 'policy data'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load('policy', slow_lookup)))
+    leader.start()
+    assert lookup_started.wait(timeout=5)
+
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_load('policy', slow_lookup)))
+                 for _ in range(8)]
+    for follower in followers:
+        follower.start()
+    release_lookup.set()
+    for thread in (leader, *followers):
+        thread.join(timeout=5)
+
+    assert results == ['policy data'] * 9
+    assert len(lookups) == 1
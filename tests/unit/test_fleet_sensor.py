@@ -0,0 +1,202 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from bisect import bisect_left
+
+import maya
+import pytest
+
+from eth_utils import to_checksum_address
+
+from nucypher.acumen.perception import FleetSensor, FleetStateHistory, NodeHealth, index_addresses_by_character
+
+
+class _Node:
+    domain = 'sensorland'
+
+    def __init__(self):
+        self.checksum_address = to_checksum_address(os.urandom(20))
+
+
+def _nodes_with_character_within(index, width):
+    return {address for _position, address in index[:bisect_left(index, (width,))]}
+
+
+def test_address_index_matches_a_scan_of_the_fleet():
+    sensor = FleetSensor(domain='sensorland')
+    for _ in range(50):
+        node = _Node()
+        sensor[node.checksum_address] = node
+
+    for character in '0123456789abcdef':
+        index = sensor.addresses_by_position_of(character)
+        assert [position for position, _address in index] == sorted(position for position, _address in index)
+        for width in range(2, 42, 2):
+            scanned = {node.checksum_address for node in sensor if character in node.checksum_address[2:2 + width]}
+            assert _nodes_with_character_within(index, width) == scanned
+
+
+def test_address_index_follows_the_fleet():
+    sensor = FleetSensor(domain='sensorland')
+    for _ in range(10):
+        node = _Node()
+        sensor[node.checksum_address] = node
+    index = sensor.addresses_by_position_of('a')
+
+    # Nodes added afterwards are indexed as they come.
+    for _ in range(10):
+        node = _Node()
+        sensor[node.checksum_address] = node
+    assert sensor.addresses_by_position_of('a') is index
+    assert index == index_addresses_by_character(sensor.addresses(), 'a')
+
+    # Direct changes to the nodes are noticed, and the index is rebuilt.
+    node = _Node()
+    sensor._nodes[node.checksum_address] = node
+    assert sensor.addresses_by_position_of('a') == index_addresses_by_character(sensor.addresses(), 'a')
+
+    sensor._nodes = {}
+    assert sensor.addresses_by_position_of('a') == []
+
+
+def _record_state(history, nodes, updated, number):
+    state = FleetSensor.FleetState(nickname=None,
+                                   icon=None,
+                                   nodes=sorted(nodes.values(), key=lambda n: n.checksum_address),
+                                   updated=updated,
+                                   checksum=f'{number:064x}')
+    history.record(state)
+    return state
+
+
+def test_fleet_state_history_rebuilds_retained_states():
+    history = FleetStateHistory(max_states=10, keyframe_interval=3)
+    nodes, recorded = dict(), dict()
+    for number in range(25):
+        node = _Node()
+        nodes[node.checksum_address] = node
+        if number % 4 == 3:
+            del nodes[next(iter(nodes))]
+        state = _record_state(history, nodes, updated=maya.now(), number=number)
+        recorded[state.checksum] = state
+
+    # Only the ten most recent states are retained, and each of them is rebuilt as it was recorded.
+    assert len(history) == 10
+    assert list(history) == list(recorded)[-10:]
+    assert list(recorded)[0] not in history
+    for checksum, state in history.items():
+        assert state == recorded[checksum]
+        assert history[checksum] == recorded[checksum]
+
+    # Only the keyframes hold every node of their state.
+    assert sum(record.keyframe is not None for record in history._records) < len(history)
+
+    # The newest states are rebuilt on their own, whether or not they start at a keyframe.
+    newest_first = list(reversed(list(recorded.values())))
+    for n in range(12):
+        assert history.latest(n) == newest_first[:min(n, 10)]
+
+
+def test_fleet_state_history_forgets_old_states():
+    history = FleetStateHistory(max_age=60)
+    nodes = dict()
+    start = maya.now()
+    for number, seconds in enumerate((0, 30, 70, 100)):
+        node = _Node()
+        nodes[node.checksum_address] = node
+        _record_state(history, nodes, updated=start.add(seconds=seconds), number=number)
+
+    assert list(history) == [f'{number:064x}' for number in (2, 3)]
+    assert [len(state.nodes) for state in history.values()] == [3, 4]
+
+
+def test_fleet_state_history_bounds():
+    with pytest.raises(ValueError):
+        FleetStateHistory(max_states=0)
+    with pytest.raises(ValueError):
+        FleetStateHistory(keyframe_interval=0)
+
+
+def test_unreachable_nodes_are_backed_off_from():
+    sensor = FleetSensor(domain='sensorland')
+    node, other_node = _Node(), _Node()
+    sensor[node.checksum_address] = node
+    sensor[other_node.checksum_address] = other_node
+    address = node.checksum_address
+    first_delay, maximum_delay = NodeHealth.BACKOFF[NodeHealth.UNREACHABLE]
+
+    assert sensor.health(address) == NodeHealth.UNVERIFIED
+    sensor.record_unreachable(address, now=0)
+    assert sensor.health(address) == NodeHealth.UNREACHABLE
+    assert not sensor.is_available(address, now=0)
+    assert sensor.is_available(address, now=first_delay)
+    assert list(sensor.available(now=0)) == [other_node]
+    assert list(sensor.in_buckets(NodeHealth.UNREACHABLE)) == [node]
+
+    # Each consecutive failure doubles the delay, with jitter, up to a maximum.
+    sensor.record_unreachable(address, now=0)
+    assert not sensor.is_available(address, now=first_delay - 1)
+    assert sensor.is_available(address, now=2 * first_delay)
+    for _ in range(20):
+        sensor.record_unreachable(address, now=0)
+    assert sensor.is_available(address, now=maximum_delay)
+
+    # Once it answers again, it's back in its bucket from before.
+    node.verified_node = True
+    sensor.record_reachable(address)
+    assert sensor.health(address) == NodeHealth.VERIFIED
+    assert sensor.is_available(address, now=0)
+
+
+def test_suspicious_and_invalid_nodes():
+    sensor = FleetSensor(domain='sensorland')
+    suspect, invalid = _Node(), _Node()
+    sensor[suspect.checksum_address] = suspect
+    sensor[invalid.checksum_address] = invalid
+
+    sensor.record_suspicious(suspect.checksum_address, now=0)
+    sensor.record_reachable(suspect.checksum_address)  # Answering doesn't clear suspicions...
+    sensor.record_verified(suspect.checksum_address)  # ...nor does being verified again...
+    assert sensor.health(suspect.checksum_address) == NodeHealth.SUSPICIOUS
+    assert not sensor.is_available(suspect.checksum_address, now=0)
+    suspicious_delay = NodeHealth.BACKOFF[NodeHealth.SUSPICIOUS][0]
+    assert sensor.is_available(suspect.checksum_address, now=suspicious_delay)  # ...but they're retried eventually.
+
+    sensor.mark_as(ValueError, invalid)
+    sensor.record_verified(invalid.checksum_address)
+    assert sensor.health(invalid.checksum_address) == NodeHealth.INVALID
+    assert not sensor.is_available(invalid.checksum_address, now=10 ** 10)
+
+
+def test_teacher_scores_are_only_kept_for_known_nodes():
+    sensor = FleetSensor(domain='sensorland')
+    replaced, invalid, kept = _Node(), _Node(), _Node()
+    for node in (replaced, invalid, kept):
+        sensor[node.checksum_address] = node
+        sensor.teacher_scores.record_response(node.checksum_address, rtt=0.1)
+
+    # Remembering the same node again keeps its score; a newer version of it starts afresh.
+    sensor[kept.checksum_address] = kept
+    newer = _Node()
+    newer.checksum_address = replaced.checksum_address
+    sensor[replaced.checksum_address] = newer
+    sensor.mark_as(ValueError, invalid)
+
+    assert kept.checksum_address in sensor.teacher_scores
+    assert replaced.checksum_address not in sensor.teacher_scores
+    assert invalid.checksum_address not in sensor.teacher_scores
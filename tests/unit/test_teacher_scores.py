@@ -0,0 +1,58 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections import Counter
+from types import SimpleNamespace
+
+from nucypher.acumen.perception import TeacherScores
+
+
+def test_teacher_scores_weigh_speed_reliability_and_productivity(get_random_checksum_address):
+    scores = TeacherScores()
+    fast, slow, failing, productive, unscored = (get_random_checksum_address() for _ in range(5))
+    for _ in range(10):
+        scores.record_response(fast, rtt=0.1)
+        scores.record_response(slow, rtt=5)
+        scores.record_error(failing)
+        scores.record_response(productive, rtt=0.1)
+        scores.record_new_nodes(productive, quantity=20)
+        for teacher in (fast, slow, failing):
+            scores.record_new_nodes(teacher, quantity=0)
+
+    assert len(scores) == 4
+    assert unscored not in scores
+    assert scores.weight(productive) > scores.weight(unscored) > scores.weight(fast) > scores.weight(slow)
+
+    # Teachers that keep failing are still asked once in a while.
+    assert scores.weight(failing) == TeacherScores.MINIMUM_WEIGHT
+
+
+def test_teacher_scores_sample_favors_better_teachers(get_random_checksum_address):
+    scores = TeacherScores()
+    good, bad = (SimpleNamespace(checksum_address=get_random_checksum_address()) for _ in range(2))
+    scores.record_new_nodes(good.checksum_address, quantity=10)
+    scores.record_error(bad.checksum_address)
+    others = [SimpleNamespace(checksum_address=get_random_checksum_address()) for _ in range(8)]
+
+    first_drawn = Counter()
+    for _ in range(1000):
+        sample = scores.sample([good, bad, *others], quantity=5)
+        assert len(set(map(id, sample))) == 5  # Without replacement.
+        first_drawn[sample[0].checksum_address] += 1
+
+    assert first_drawn[good.checksum_address] > first_drawn[bad.checksum_address]
+    assert first_drawn[good.checksum_address] < 1000  # Others still get to be tried first.
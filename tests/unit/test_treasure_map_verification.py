@@ -0,0 +1,66 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+
+import pytest
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signature, Signer
+
+from nucypher.crypto.signing import SignatureStamp
+from nucypher.policy.collections import TreasureMap
+
+
+@pytest.fixture(scope="function")
+def treasure_map(get_random_checksum_address):
+    alice_privkey = UmbralPrivateKey.gen_key()
+    alice_stamp = SignatureStamp(verifying_key=alice_privkey.pubkey, signer=Signer(alice_privkey))
+    bob_privkey = UmbralPrivateKey.gen_key()
+
+    destinations = {get_random_checksum_address(): os.urandom(32) for _ in range(3)}
+    treasure_map = TreasureMap(m=2, destinations=destinations)
+    treasure_map.prepare_for_publication(bob_encrypting_key=bob_privkey.pubkey,
+                                         bob_verifying_key=bob_privkey.pubkey,
+                                         alice_stamp=alice_stamp,
+                                         label=os.urandom(16))
+    return treasure_map
+
+
+def test_treasure_map_signature_is_verified_once(treasure_map, mocker):
+    verify = mocker.spy(Signature, 'verify')
+
+    first = TreasureMap.from_bytes(bytes(treasure_map))
+    assert verify.call_count == 1
+
+    # The same bytes, received again, aren't verified again.
+    second = TreasureMap.from_bytes(bytes(treasure_map))
+    assert verify.call_count == 1
+    assert first == second == treasure_map
+
+
+def test_tampered_treasure_map_is_not_verified_from_cache(treasure_map):
+    TreasureMap.from_bytes(bytes(treasure_map))
+
+    # A map whose HRAC was changed is a different map, whose signature doesn't match.
+    tampered = bytearray(bytes(treasure_map))
+    hrac_position = len(bytes(treasure_map._public_signature))
+    tampered[hrac_position] ^= 0xff
+    with pytest.raises(TreasureMap.InvalidSignature):
+        TreasureMap.from_bytes(bytes(tampered))
+
+    # Failures aren't remembered.
+    with pytest.raises(TreasureMap.InvalidSignature):
+        TreasureMap.from_bytes(bytes(tampered))
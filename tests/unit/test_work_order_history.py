@@ -0,0 +1,102 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+
+from nucypher.policy.collections import WorkOrderHistory
+
+
+@pytest.fixture(scope='module')
+def capsules():
+    delegating_pubkey = UmbralPrivateKey.gen_key().pubkey
+    return [pre.encrypt(delegating_pubkey, b'data')[1] for _ in range(5)]
+
+
+def test_work_order_history_indexes(capsules, get_random_checksum_address, make_work_order):
+    history = WorkOrderHistory()
+    ursula, other_ursula = get_random_checksum_address(), get_random_checksum_address()
+    first, second, third = capsules[:3]
+
+    work_order = make_work_order(ursula, [first, second])
+    other_work_order = make_work_order(other_ursula, [first])
+    history.save_work_order(work_order)
+    history.save_work_order(other_work_order, as_replete=True)
+    assert len(history) == 3
+
+    assert history.by_capsule(first) == {ursula: work_order, other_ursula: other_work_order}
+    assert history.by_capsule(second) == {ursula: work_order}
+    assert history.by_capsule(third) == {}
+    assert history.by_checksum_address(ursula) == {first: work_order, second: work_order}
+    assert history.most_recent_replete(first) == {other_ursula: other_work_order}
+    with pytest.raises(KeyError):
+        history.most_recent_replete(second)
+
+    # Saving a WorkOrder for the same Ursula and Capsule again replaces the previous one.
+    new_work_order = make_work_order(ursula, [first])
+    history.save_work_order(new_work_order)
+    assert len(history) == 3
+    assert history.by_capsule(first)[ursula] is new_work_order
+
+    history.forget_capsule(first)
+    assert len(history) == 1
+    assert history.by_capsule(first) == {}
+    assert other_ursula not in history.ursulas
+    with pytest.raises(KeyError):
+        history.most_recent_replete(first)
+
+
+def test_work_order_history_discards_work_orders(capsules, get_random_checksum_address, make_work_order):
+    history = WorkOrderHistory()
+    ursula = get_random_checksum_address()
+    first, second = capsules[:2]
+
+    replete_work_order = make_work_order(ursula, [first])
+    history.save_work_order(replete_work_order, as_replete=True)
+    work_order = make_work_order(ursula, [first, second])
+    history.save_work_order(work_order)
+    assert len(history) == 2
+
+    # The replete WorkOrder takes the place of the discarded one for its Capsule.
+    history.discard_work_order(work_order)
+    assert len(history) == 1
+    assert history.by_capsule(first) == {ursula: replete_work_order}
+    assert history.by_capsule(second) == {}
+
+    # Replete WorkOrders aren't discarded.
+    history.discard_work_order(replete_work_order)
+    assert history.by_capsule(first) == {ursula: replete_work_order}
+
+
+def test_work_order_history_is_bounded(capsules, get_random_checksum_address, make_work_order):
+    history = WorkOrderHistory(max_capsules=3)
+    ursula = get_random_checksum_address()
+
+    for capsule in capsules:
+        history.save_work_order(make_work_order(ursula, [capsule]), as_replete=True)
+
+    # Only the three most recently saved capsules are left.
+    assert len(history) == 3
+    assert set(history.by_checksum_address(ursula)) == set(capsules[-3:])
+    for capsule in capsules[:2]:
+        assert history.by_capsule(capsule) == {}
+        with pytest.raises(KeyError):
+            history.most_recent_replete(capsule)
+
+    with pytest.raises(ValueError):
+        WorkOrderHistory(max_capsules=0)
@@ -122,7 +122,7 @@ class MockRestMiddlewareForLargeFleetTests(MockRestMiddleware):
                            announce_nodes=None,
                            nodes_i_need=None,
                            fleet_checksum=None):
-        known_nodes_bytestring = node.bytestring_of_known_nodes()
+        known_nodes_bytestring = node.bytestring_of_known_nodes(addresses=nodes_i_need or None)
         signature = node.stamp(known_nodes_bytestring)
         r = Response(bytes(signature) + known_nodes_bytestring)
         r.content = r.data
@@ -187,6 +187,35 @@ class NodeIsDownMiddleware(MockRestMiddleware):
         self.client.ports_that_are_down = set(MOCK_KNOWN_URSULAS_CACHE)
 
 
+class SomeNodesRefuseKFragsMiddleware(MockRestMiddleware):
+    """
+    Modified middleware to emulate some nodes accepting arrangements, but then refusing their kfrags.
+    Keeps track of the arrangements that were enacted, and of those that were revoked.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refusing_addresses = set()
+        self.enacted_arrangement_ids = set()
+        self.revoked_arrangement_ids = set()
+
+    def node_refuses_kfrags(self, node):
+        self.refusing_addresses.add(node.checksum_address)
+
+    def enact_policy(self, ursula, kfrag_id, payload):
+        if ursula.checksum_address in self.refusing_addresses:
+            raise self.UnexpectedResponse("Not taking any kfrags", status=403)
+        response = super().enact_policy(ursula, kfrag_id, payload)
+        self.enacted_arrangement_ids.add(kfrag_id)
+        return response
+
+    def revoke_arrangement(self, ursula, revocation, timeout=None):
+        response = super().revoke_arrangement(ursula, revocation, timeout=timeout)
+        if response.status_code == 200:
+            self.revoked_arrangement_ids.add(revocation.arrangement_id)
+        return response
+
+
 class EvilMiddleWare(MockRestMiddleware):
     """
     Middleware for assholes.